@@ -0,0 +1,84 @@
+"""Presupuesto de tiempo de importación de la app, medido con ``python -X importtime``.
+
+Toma los imports de nivel de módulo de ``streamlit_app.py``, los ejecuta en un
+proceso nuevo después de ``import streamlit`` (que el servidor ya tiene
+cargado cuando corre el script) y suma el tiempo acumulado de cada import de
+primer nivel. Se queda con la mejor de varias corridas. Falla si el total
+supera ``--presupuesto-ms`` o si algún import arrastra un módulo pesado que
+solo hace falta más adelante (pandas, pyarrow).
+
+Uso:
+    python benchmarks/bench_arranque.py [--presupuesto-ms 150] [--repeticiones 5]
+"""
+import argparse
+import ast
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(RAIZ, 'streamlit_app.py')
+
+# Módulos que no deben cargarse antes de la primera tabla
+DIFERIDOS = ('pandas', 'pyarrow')
+
+
+def imports_de_la_app(ruta=APP):
+    """Sentencias import de nivel de módulo de la app, sin la de streamlit"""
+    with open(ruta, 'r', encoding='utf-8') as f:
+        arbol = ast.parse(f.read(), ruta)
+    return [
+        ast.unparse(nodo) for nodo in arbol.body
+        if isinstance(nodo, (ast.Import, ast.ImportFrom))
+        and not (isinstance(nodo, ast.Import) and nodo.names[0].name == 'streamlit')
+    ]
+
+
+def medir(sentencias):
+    """{módulo de primer nivel: µs acumulados} y todos los módulos cargados por los imports de la app"""
+    codigo = "import streamlit\n" + "\n".join(sentencias)
+    salida = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', codigo],
+        cwd=RAIZ, check=True, capture_output=True, text=True,
+    ).stderr
+
+    primer_nivel = {}
+    cargados = []
+    despues_de_streamlit = False
+    for linea in salida.splitlines():
+        if not linea.startswith('import time:') or 'self [us]' in linea:
+            continue
+        _, acumulado, nombre = linea[len('import time:'):].split('|')
+        modulo = nombre.strip()
+        if despues_de_streamlit:
+            cargados.append(modulo)
+            if not nombre.startswith('  '):
+                primer_nivel[modulo] = int(acumulado)
+        elif modulo == 'streamlit' and not nombre.startswith('  '):
+            despues_de_streamlit = True
+    return primer_nivel, cargados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--presupuesto-ms', type=float, default=150)
+    parser.add_argument('--repeticiones', type=int, default=5)
+    args = parser.parse_args()
+
+    sentencias = imports_de_la_app()
+    corridas = [medir(sentencias) for _ in range(args.repeticiones)]
+    primer_nivel, cargados = min(corridas, key=lambda corrida: sum(corrida[0].values()))
+    total_ms = sum(primer_nivel.values()) / 1000
+
+    print(f"Imports de streamlit_app.py (después de streamlit): {total_ms:.1f} ms"
+          f" (mejor de {args.repeticiones}, presupuesto {args.presupuesto_ms:.0f} ms)")
+    for modulo, microsegundos in sorted(primer_nivel.items(), key=lambda x: -x[1])[:8]:
+        print(f"  {modulo:<20} {microsegundos / 1000:8.1f} ms")
+
+    pesados = sorted({modulo for modulo in cargados if modulo.split('.')[0] in DIFERIDOS})
+    assert not pesados, f"se importan al arrancar: {', '.join(pesados[:5])}"
+    assert total_ms <= args.presupuesto_ms, f"imports en {total_ms:.1f} ms > {args.presupuesto_ms:.0f} ms"
+
+
+if __name__ == '__main__':
+    main()
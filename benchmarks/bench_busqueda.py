@@ -0,0 +1,84 @@
+"""Benchmark del buscador de equipos: índice de trigramas contra recorrer todos los grupos.
+
+Arma el índice sobre el JSON incluido y sobre datos sintéticos (ver
+``datos_sinteticos.py``) y mide consultas típicas mientras se tipea contra la
+versión ingenua, que recorre cada grupo de cada categoría normalizando los
+nombres. Verifica que ambas encuentren los mismos equipos.
+
+Uso:
+    python benchmarks/bench_busqueda.py [--escalas 10 100] [--repeticiones 200]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from busqueda import IndiceBusqueda, normalizar  # noqa: E402
+from clasificacion import AlmacenClasificacion  # noqa: E402
+from datos_sinteticos import generar_datos  # noqa: E402
+
+RUTA_DATOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'basketball_complete_data.json')
+
+CONSULTAS = ("q", "qui", "quilmes a", "Quilmes A.C.", "porteño", "ferro oeste", "club norte 1", "zzz")
+
+
+def recorrido(data, consulta):
+    """Búsqueda sin índice: normalizar y comparar el nombre de cada equipo de cada grupo"""
+    palabras = normalizar(consulta).split()
+    encontrados = set()
+    for categoria in data['datos']:
+        for grupo in categoria['grupos']:
+            for equipo in grupo['clasificacion']:
+                clave = normalizar(equipo['equipo'])
+                palabras_clave = clave.split()
+                if all(
+                    palabra in clave if len(palabra) >= 3 else any(p.startswith(palabra) for p in palabras_clave)
+                    for palabra in palabras
+                ):
+                    encontrados.add(clave)
+    return encontrados
+
+
+def medir(repeticiones, funcion):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--escalas', type=int, nargs='+', default=[10, 100])
+    parser.add_argument('--repeticiones', type=int, default=200)
+    args = parser.parse_args()
+
+    import json
+    with open(RUTA_DATOS, 'r', encoding='utf-8') as f:
+        datasets = [('JSON incluido', json.load(f))]
+    datasets += [(f"sintéticos x{escala}", generar_datos(escala)) for escala in args.escalas]
+
+    for descripcion, data in datasets:
+        almacen = AlmacenClasificacion(data)
+        inicio = time.perf_counter()
+        indice = IndiceBusqueda(almacen)
+        armado = time.perf_counter() - inicio
+        print(f"{descripcion}: {len(almacen)} equipos, {len(indice.claves)} nombres distintos"
+              f" • índice armado en {armado * 1000:.0f} ms")
+
+        for consulta in CONSULTAS:
+            # Mismos equipos que el recorrido (el índice devuelve los mejores; sin límite, todos)
+            esperado = recorrido(data, consulta)
+            obtenido = {indice.claves[i] for i in indice.buscar(consulta, limite=len(indice.claves))}
+            assert obtenido == esperado, consulta
+
+            ms_indice = medir(args.repeticiones, lambda: indice.buscar(consulta))
+            ms_recorrido = medir(max(1, args.repeticiones // 100), lambda: recorrido(data, consulta))
+            print(f"  {consulta!r:<16} {len(esperado):4d} equipos • índice {ms_indice:7.3f} ms"
+                  f" • recorrido {ms_recorrido:9.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Benchmark del feed de cambios y del recálculo limitado a las zonas afectadas.
+
+Parte de datos sintéticos (ver ``datos_sinteticos.py``), simula una fecha en
+la que solo se juegan partidos en unos pocos grupos y compara, para la
+versión nueva, armar el cubo de todas las categorías desde cero contra
+detectar las zonas cambiadas, reutilizar el resto del cubo anterior y armar
+el feed de cambios. Verifica que el cubo incremental sea idéntico al completo
+y que cada equipo que jugó aparezca en el feed con su resultado.
+
+Uso:
+    python benchmarks/bench_cambios.py [--escalas 1 10 100] [--grupos 6]
+"""
+import argparse
+import copy
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cambios import comparar, zonas_cambiadas  # noqa: E402
+from clasificacion import AlmacenClasificacion  # noqa: E402
+from cubo import construir_cubo  # noqa: E402
+from datos_sinteticos import generar_datos  # noqa: E402
+
+
+def jugar_fecha(data, grupos, semilla=0):
+    """Copia de ``data`` con un partido jugado en ``grupos`` grupos al azar. Devuelve (copia, equipos que jugaron)"""
+    rng = random.Random(semilla)
+    nuevo = copy.deepcopy(data)
+    # Si una categoría aparece en varias fases la app usa la primera: los partidos se juegan ahí
+    primeras = {}
+    for categoria in nuevo['datos']:
+        primeras.setdefault(categoria['categoria'], categoria)
+    todos = [(nombre, grupo) for nombre, categoria in primeras.items() for grupo in categoria['grupos']]
+    jugaron = set()
+    for nombre, grupo in rng.sample(todos, grupos):
+        local, visitante = rng.sample(grupo['clasificacion'], 2)
+        tantos = rng.randint(60, 90), rng.randint(40, 59)
+        for equipo, favor, contra, gano in ((local, tantos[0], tantos[1], True), (visitante, tantos[1], tantos[0], False)):
+            equipo['partidos_jugados'] += 1
+            equipo['partidos_ganados' if gano else 'partidos_perdidos'] += 1
+            equipo['puntos_favor'] += favor
+            equipo['puntos_contra'] += contra
+            equipo['puntos_totales'] += 2 if gano else 1
+            jugaron.add((nombre, grupo['nombre'], equipo['equipo']))
+        grupo['clasificacion'].sort(key=lambda e: (-e['puntos_totales'], e['puntos_contra'] - e['puntos_favor'], -e['puntos_favor']))
+        for posicion, equipo in enumerate(grupo['clasificacion'], 1):
+            equipo['posicion'] = posicion
+    return nuevo, jugaron
+
+
+def cubos_completos(almacen):
+    return {nombre: construir_cubo(almacen.categoria(nombre)) for nombre in dict.fromkeys(almacen.categorias)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--escalas', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--grupos', type=int, default=6, help="grupos que juegan en la fecha")
+    args = parser.parse_args()
+
+    for escala in args.escalas:
+        data = generar_datos(escala)
+        data_nuevo, jugaron = jugar_fecha(data, args.grupos, semilla=escala)
+        anterior, nuevo = AlmacenClasificacion(data), AlmacenClasificacion(data_nuevo)
+        cubos_anteriores = cubos_completos(anterior)
+
+        inicio = time.perf_counter()
+        completos = cubos_completos(nuevo)
+        ms_completo = (time.perf_counter() - inicio) * 1000
+
+        inicio = time.perf_counter()
+        cambiadas = zonas_cambiadas(anterior, nuevo)
+        ms_huellas = (time.perf_counter() - inicio) * 1000
+        incrementales = {
+            nombre: construir_cubo(nuevo.categoria(nombre), cubos_anteriores.get(nombre), cambiadas)
+            for nombre in dict.fromkeys(nuevo.categorias)
+        }
+        feed = comparar(
+            anterior, nuevo, cambiadas,
+            lambda nombre, zona: cubos_anteriores[nombre]['zonas'][zona],
+            lambda nombre, zona: incrementales[nombre]['zonas'][zona],
+        )
+        ms_incremental = (time.perf_counter() - inicio) * 1000
+
+        assert incrementales == completos, escala
+        resultados = {(e['categoria'], e['grupo'], e['equipo']) for e in feed if e['tipo'] == 'resultado'}
+        assert resultados == jugaron, escala
+        assert len(cambiadas) <= args.grupos
+        assert not len(comparar(nuevo, nuevo))
+
+        zonas = sum(len(cubo['zonas']) for cubo in completos.values())
+        conteo = ", ".join(f"{cantidad} {tipo}" for tipo, cantidad in feed.conteo().items())
+        print(f"x{escala}: {len(nuevo)} equipos, {len(cambiadas)}/{zonas} zonas cambiadas • cubo completo "
+              f"{ms_completo:.0f} ms • incremental {ms_incremental:.1f} ms (huellas {ms_huellas:.1f} ms) "
+              f"• {len(feed)} eventos ({conteo})")
+
+
+if __name__ == '__main__':
+    main()
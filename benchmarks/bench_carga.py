@@ -0,0 +1,97 @@
+"""Benchmark de carga por rerun con sesiones simuladas.
+
+Compara el comportamiento de ``st.cache_data`` (cada llamada deserializa una
+copia completa de los datos) con el almacén compartido de solo lectura que
+devuelve ``st.cache_resource``. Mide el costo de ``load_data`` por rerun y el
+RSS del proceso con N sesiones que mantienen sus datos vivos a la vez.
+
+Uso:
+    python benchmarks/bench_carga.py [--sesiones 50] [--reruns 20]
+"""
+import argparse
+import gc
+import json
+import os
+import pickle
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clasificacion import AlmacenClasificacion, get_clasificados_por_zona  # noqa: E402
+
+RUTA_DATOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'basketball_complete_data.json')
+
+
+def rss_mb():
+    """RSS actual del proceso en MB"""
+    try:
+        with open('/proc/self/status') as f:
+            for linea in f:
+                if linea.startswith('VmRSS:'):
+                    return int(linea.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def medir(nombre, obtener_datos, sesiones, reruns):
+    """Simula ``sesiones`` reruns concurrentes y luego ``reruns`` reruns por sesión"""
+    gc.collect()
+    rss_inicial = rss_mb()
+
+    # Todas las sesiones con un rerun en curso: cada una retiene lo que devolvió load_data
+    vivas = [obtener_datos() for _ in range(sesiones)]
+    rss_sesiones = rss_mb()
+
+    inicio = time.perf_counter()
+    for _ in range(reruns):
+        for i in range(sesiones):
+            vivas[i] = obtener_datos()
+    por_rerun = (time.perf_counter() - inicio) / (reruns * sesiones)
+
+    del vivas
+    gc.collect()
+    return {
+        'modo': nombre,
+        'ms_por_rerun': por_rerun * 1000,
+        'rss_delta_mb': rss_sesiones - rss_inicial,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sesiones', type=int, default=50)
+    parser.add_argument('--reruns', type=int, default=20)
+    args = parser.parse_args()
+
+    with open(RUTA_DATOS, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    # Antes: st.cache_data guarda el valor serializado y lo deserializa en cada llamada
+    serializado = pickle.dumps(data)
+    antes = medir('cache_data (copia por rerun)', lambda: pickle.loads(serializado),
+                  args.sesiones, args.reruns)
+
+    # Después: st.cache_resource devuelve siempre el mismo almacén de solo lectura
+    almacen = AlmacenClasificacion(data)
+    despues = medir('cache_resource (compartido)', lambda: almacen, args.sesiones, args.reruns)
+
+    # El almacén compartido no cambia aunque todas las sesiones lo consulten
+    firma = almacen.columnas['puntos_totales'].tobytes()
+    for categoria in almacen.categorias:
+        vista = almacen.categoria(categoria)
+        for zona in vista.zonas:
+            for equipo in get_clasificados_por_zona(vista, zona):
+                equipo['puntos_totales'] = -1
+    assert almacen.columnas['puntos_totales'].tobytes() == firma
+
+    print(f"{args.sesiones} sesiones, {args.reruns} reruns por sesión")
+    for resultado in (antes, despues):
+        print(f"  {resultado['modo']:<30} {resultado['ms_por_rerun']:8.3f} ms/rerun"
+              f"  RSS +{resultado['rss_delta_mb']:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
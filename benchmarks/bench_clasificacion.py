@@ -0,0 +1,191 @@
+"""Benchmark de los caminos calientes de clasificación y playoffs a distintas escalas.
+
+Genera datos sintéticos con la forma del JSON del scraper (ver
+``datos_sinteticos.py``) a 1×, 10×, 100× y 1000× el dataset real y mide, por
+llamada, las funciones que recorre cada página:
+
+- ``get_zona_from_group_name`` sobre todos los nombres de grupo
+- ``get_clasificados_por_zona``, ``classify_teams_by_region`` y
+  ``generate_playoff_matchups`` por zona
+- las agregaciones del resumen general (``resumen_region`` por zona y
+  ``equipos_destacados`` por categoría)
+- el HTML de las tablas de primeros, segundos y terceros (``tabla_equipos``)
+
+Las zonas se toman de una muestra repartida entre todas las categorías. Cada
+medición es el mínimo de varias repeticiones. Los resultados se guardan en
+JSON (por defecto en ``benchmarks/resultados/clasificacion-<commit>.json``)
+y ``--comparar`` muestra la variación contra otra corrida.
+
+Uso:
+    python benchmarks/bench_clasificacion.py [--escalas 1 10 100 1000] [--repeticiones 5]
+        [--muestra 200] [--salida resultados.json] [--comparar anterior.json]
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clasificacion import (  # noqa: E402
+    AlmacenClasificacion,
+    classify_teams_by_region,
+    equipos_destacados,
+    generate_playoff_matchups,
+    get_clasificados_por_zona,
+    get_zona_from_group_name,
+    resumen_region,
+    terceros_que_clasifican,
+)
+from datos_sinteticos import dimensiones, generar_datos  # noqa: E402
+from tablas import tabla_equipos  # noqa: E402
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIRECTORIO_RESULTADOS = os.path.join(RAIZ, 'benchmarks', 'resultados')
+
+
+def commit_actual():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=RAIZ, check=True, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'sin-git'
+
+
+def muestra_pareja(elementos, cantidad):
+    """Hasta ``cantidad`` elementos repartidos en forma pareja a lo largo de la lista"""
+    if len(elementos) <= cantidad:
+        return list(elementos)
+    paso = len(elementos) / cantidad
+    return [elementos[int(i * paso)] for i in range(cantidad)]
+
+
+def por_llamada(repeticiones, funcion, argumentos):
+    """Microsegundos por llamada: mínimo de varias pasadas sobre todos los argumentos"""
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        for args in argumentos:
+            funcion(*args)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return {'us_por_llamada': mejor / len(argumentos) * 1e6, 'llamadas': len(argumentos)}
+
+
+def tablas_de_zona(categoria, zona):
+    primeros, segundos, terceros = classify_teams_by_region(categoria, zona)
+    return primeros, segundos, terceros, terceros_que_clasifican(zona)
+
+
+def renderizar_tablas(primeros, segundos, terceros, cupos):
+    tabla_equipos(primeros)
+    tabla_equipos(segundos)
+    tabla_equipos(terceros, cupos)
+
+
+def resumen_general(categoria):
+    """Las agregaciones que muestra el resumen general de una categoría"""
+    for zona in categoria.zonas:
+        resumen_region(categoria, zona)
+    equipos_destacados(categoria)
+
+
+def medir_escala(escala, repeticiones, muestra):
+    data = generar_datos(escala)
+    equipos = sum(len(grupo['clasificacion']) for categoria in data['datos'] for grupo in categoria['grupos'])
+    nombres_grupos = [(grupo['nombre'],) for categoria in data['datos'] for grupo in categoria['grupos']]
+
+    gc.collect()
+    inicio = time.perf_counter()
+    almacen = AlmacenClasificacion(data)
+    carga = time.perf_counter() - inicio
+    del data
+
+    categorias = [almacen.categoria(nombre) for nombre in dict.fromkeys(almacen.categorias)]
+    zonas = muestra_pareja([(categoria, zona) for categoria in categorias for zona in categoria.zonas], muestra)
+    clasificados = [(get_clasificados_por_zona(categoria, zona),) for categoria, zona in zonas]
+    tablas = [tablas_de_zona(categoria, zona) for categoria, zona in zonas]
+    categorias_muestra = [(categoria,) for categoria in dict.fromkeys(categoria for categoria, _ in zonas)]
+
+    operaciones = {
+        'get_zona_from_group_name': por_llamada(repeticiones, get_zona_from_group_name, nombres_grupos),
+        'get_clasificados_por_zona': por_llamada(repeticiones, get_clasificados_por_zona, zonas),
+        'classify_teams_by_region': por_llamada(repeticiones, classify_teams_by_region, zonas),
+        'generate_playoff_matchups': por_llamada(repeticiones, generate_playoff_matchups, clasificados),
+        'resumen_general': por_llamada(repeticiones, resumen_general, categorias_muestra),
+        'tabla_equipos': por_llamada(repeticiones, renderizar_tablas, tablas),
+    }
+
+    cantidad_categorias, fases, regiones = dimensiones(escala)
+    return {
+        'categorias': cantidad_categorias,
+        'fases': fases,
+        'regiones': regiones,
+        'grupos': len(almacen.grupo_nombre),
+        'equipos': equipos,
+        'carga_ms': carga * 1000,
+        'operaciones': operaciones,
+    }
+
+
+def comparar(resultados, anterior):
+    """Imprime la variación de cada operación contra una corrida anterior"""
+    print(f"\nComparación contra {anterior.get('commit', '?')}:")
+    for escala, actual in resultados['escalas'].items():
+        previa = anterior.get('escalas', {}).get(escala)
+        if previa is None:
+            continue
+        for nombre, medicion in actual['operaciones'].items():
+            base = previa['operaciones'].get(nombre)
+            if base:
+                variacion = (medicion['us_por_llamada'] / base['us_por_llamada'] - 1) * 100
+                print(f"  x{escala:<5} {nombre:<27} {base['us_por_llamada']:10.2f} → "
+                      f"{medicion['us_por_llamada']:10.2f} µs ({variacion:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--escalas', type=int, nargs='+', default=[1, 10, 100, 1000])
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--muestra', type=int, default=200, help="Zonas medidas por escala")
+    parser.add_argument('--salida')
+    parser.add_argument('--comparar')
+    args = parser.parse_args()
+
+    resultados = {
+        'commit': commit_actual(),
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'repeticiones': args.repeticiones,
+        'muestra': args.muestra,
+        'escalas': {},
+    }
+
+    for escala in args.escalas:
+        medicion = medir_escala(escala, args.repeticiones, args.muestra)
+        resultados['escalas'][str(escala)] = medicion
+        print(f"x{escala}: {medicion['grupos']} grupos, {medicion['equipos']} equipos "
+              f"({medicion['categorias']} categorías × {medicion['fases']} fases, {medicion['regiones']} regiones) "
+              f"• almacén en {medicion['carga_ms']:.0f} ms")
+        for nombre, operacion in medicion['operaciones'].items():
+            print(f"  {nombre:<27} {operacion['us_por_llamada']:10.2f} µs/llamada ({operacion['llamadas']} llamadas)")
+
+    salida = args.salida or os.path.join(DIRECTORIO_RESULTADOS, f"clasificacion-{resultados['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(salida)), exist_ok=True)
+    with open(salida, 'w', encoding='utf-8') as f:
+        json.dump(resultados, f, ensure_ascii=False, indent=2)
+    print(f"\nResultados en {salida}")
+
+    if args.comparar:
+        with open(args.comparar, 'r', encoding='utf-8') as f:
+            comparar(resultados, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
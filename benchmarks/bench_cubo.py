@@ -0,0 +1,74 @@
+"""Benchmark del cubo precalculado de clasificaciones con sesiones simuladas.
+
+Cada sesión recorre todas las páginas (resumen general y detalle de cada zona
+de cada categoría). Antes, cada página recalculaba clasificación, siembra,
+cruces y resúmenes; ahora las páginas leen del cubo compartido, que se arma
+una vez por categoría y versión. Los contadores del cache de derivados
+verifican que ninguna sesión vuelve a calcular.
+
+Uso:
+    python benchmarks/bench_cubo.py [--sesiones 50]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clasificacion import AlmacenClasificacion, equipos_destacados  # noqa: E402
+from cubo import construir_cubo, construir_zona  # noqa: E402
+from recarga import CacheDerivados  # noqa: E402
+
+RUTA_DATOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'basketball_complete_data.json')
+
+
+def sesion_sin_cubo(almacen):
+    """Lo que calculaba cada sesión al recorrer las páginas"""
+    for nombre in dict.fromkeys(almacen.categorias):
+        categoria = almacen.categoria(nombre)
+        equipos_destacados(categoria)
+        for zona in categoria.zonas:
+            construir_zona(categoria, zona)
+
+
+def sesion_con_cubo(almacen, derivados):
+    """Cada página busca su cubo en el cache compartido"""
+    for nombre in dict.fromkeys(almacen.categorias):
+        categoria = almacen.categoria(nombre)
+        for zona in categoria.zonas:
+            cubo = derivados.obtener(almacen.version, (nombre, 'cubo'), lambda: construir_cubo(categoria))
+            cubo['zonas'][zona]['clasificados']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sesiones', type=int, default=50)
+    args = parser.parse_args()
+
+    almacen = AlmacenClasificacion.desde_archivo(RUTA_DATOS)
+    categorias = len(dict.fromkeys(almacen.categorias))
+
+    inicio = time.perf_counter()
+    for _ in range(args.sesiones):
+        sesion_sin_cubo(almacen)
+    antes = (time.perf_counter() - inicio) / args.sesiones
+
+    derivados = CacheDerivados()
+    inicio = time.perf_counter()
+    for _ in range(args.sesiones):
+        sesion_con_cubo(almacen, derivados)
+    despues = (time.perf_counter() - inicio) / args.sesiones
+
+    # Un solo cálculo por categoría para toda la corrida, sin importar la cantidad de sesiones
+    estadisticas = derivados.estadisticas()
+    assert estadisticas['fallos'] == categorias, estadisticas
+
+    print(f"{args.sesiones} sesiones, {categorias} categorías")
+    print(f"  {'recalculando por sesión':<25} {antes * 1000:8.2f} ms/sesión")
+    print(f"  {'cubo compartido':<25} {despues * 1000:8.2f} ms/sesión")
+    print(f"  cache: {estadisticas['aciertos']} aciertos, {estadisticas['fallos']} cálculos")
+
+
+if __name__ == '__main__':
+    main()
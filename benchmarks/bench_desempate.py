@@ -0,0 +1,78 @@
+"""Benchmark del desempate olímpico con enfrentamiento directo.
+
+Genera datos sintéticos con resultados partido a partido (ver
+``datos_sinteticos.py``), construye el almacén con y sin partidos y mide
+cuánto cuesta reordenar los grupos. Los casos de desempate se verifican en
+``tests/test_desempate.py``.
+
+Uso:
+    python benchmarks/bench_desempate.py [--escalas 1 10 100] [--repeticiones 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import clasificacion  # noqa: E402
+from clasificacion import COLUMNAS_FILA, AlmacenClasificacion  # noqa: E402
+from datos_sinteticos import generar_datos  # noqa: E402
+from desempate import aplicar_desempate  # noqa: E402
+
+# Milisegundos máximos para reordenar los grupos del dataset real (x1)
+LIMITE_MS = 50
+
+
+def columnas_publicadas(data):
+    """Columnas base en el orden publicado, tal como las recibe el desempate al cargar"""
+    capturadas = []
+
+    def capturar(arreglos, columnas_fila):
+        capturadas.append(arreglos)
+        return arreglos
+
+    clasificacion.aplicar_desempate = capturar
+    try:
+        AlmacenClasificacion(data)
+    finally:
+        clasificacion.aplicar_desempate = aplicar_desempate
+    return capturadas[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--escalas', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--repeticiones', type=int, default=5)
+    args = parser.parse_args()
+
+    for escala in args.escalas:
+        data = generar_datos(escala, partidos=True)
+        sin_partidos = generar_datos(escala)
+
+        inicio = time.perf_counter()
+        almacen = AlmacenClasificacion(data)
+        ms_con = (time.perf_counter() - inicio) * 1000
+        inicio = time.perf_counter()
+        AlmacenClasificacion(sin_partidos)
+        ms_sin = (time.perf_counter() - inicio) * 1000
+
+        # El desempate solo, sobre las columnas en el orden publicado
+        publicado = columnas_publicadas(data)
+        tiempos = []
+        for _ in range(args.repeticiones):
+            inicio = time.perf_counter()
+            aplicar_desempate(publicado, COLUMNAS_FILA)
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+        ms = min(tiempos)
+        grupos = len(almacen.grupo_inicio)
+        if escala == 1:
+            assert ms < LIMITE_MS, f"desempate de {grupos} grupos en {ms:.1f} ms (límite {LIMITE_MS} ms)"
+
+        print(f"x{escala}: {grupos} grupos, {len(almacen)} equipos, {len(almacen.partido_local)} partidos"
+              f" • desempate {ms:.1f} ms • carga con partidos {ms_con:.0f} ms / sin partidos {ms_sin:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark del payload por rerun en una conexión móvil lenta.
+
+Levanta la app, recorre las vistas del selector (resumen general y cada
+región) con reruns completos y mide los bytes recibidos por el websocket en
+cada uno. Con los perfiles de red de abajo estima el tiempo de descarga de
+ese payload. También informa el tamaño de la hoja de estilos original,
+minificada y comprimida, y verifica que la app la sirva como archivo estático.
+
+Para comparar con otra versión de la app, pasar su ruta con ``--app``.
+
+Uso:
+    python benchmarks/bench_estilos.py [--app streamlit_app.py] [--vueltas 3]
+"""
+import argparse
+import asyncio
+import gzip
+import os
+import statistics
+import sys
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cliente_streamlit import APP, ServidorStreamlit, SesionStreamlit  # noqa: E402
+from estilos import ARCHIVO_CSS, CSS, CSS_MINIFICADO  # noqa: E402
+
+# Perfiles de throttling de Chrome DevTools: (bajada en bits por segundo, latencia en segundos)
+PERFILES = {
+    'Slow 3G': (400_000, 2.0),
+    'Fast 3G': (1_440_000, 0.5625),
+}
+
+
+async def medir(url, vueltas):
+    sesion = await SesionStreamlit(url).conectar()
+    try:
+        await sesion.rerun()
+        vistas = ["📊 Resumen General", "📍 CENTRO", "📍 NORTE", "📍 OESTE", "📍 SUR"]
+        payloads = []
+        for _ in range(vueltas):
+            for vista in vistas:
+                rerun = await sesion.rerun({"Seleccionar Vista:": vista})
+                payloads.append(rerun.bytes)
+        return payloads
+    finally:
+        await sesion.cerrar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--app', default=APP)
+    parser.add_argument('--vueltas', type=int, default=3)
+    args = parser.parse_args()
+
+    with ServidorStreamlit(args.app) as servidor:
+        payloads = asyncio.run(medir(servidor.url_websocket, args.vueltas))
+        try:
+            url_css = f'http://127.0.0.1:{servidor.puerto}/app/static/{ARCHIVO_CSS}'
+            with urllib.request.urlopen(url_css, timeout=5) as respuesta:
+                # Sin static serving la ruta devuelve el HTML de la app, no el CSS
+                es_css = respuesta.headers.get_content_type() == 'text/css'
+                css_servido = len(respuesta.read()) if es_css else None
+        except OSError:
+            css_servido = None
+
+    print(f"{args.app}")
+    print(f"  CSS fuente {len(CSS.encode()) / 1024:.1f} KB • minificado {len(CSS_MINIFICADO.encode()) / 1024:.1f} KB"
+          f" • gzip {len(gzip.compress(CSS_MINIFICADO.encode())) / 1024:.1f} KB")
+    print(f"  /app/static/{ARCHIVO_CSS}: "
+          + (f"{css_servido / 1024:.1f} KB (se descarga una vez)" if css_servido else "no se sirve"))
+
+    mediana = statistics.median(payloads)
+    print(f"  payload por rerun: mediana {mediana / 1024:.1f} KB, mínimo {min(payloads) / 1024:.1f} KB"
+          f" ({len(payloads)} reruns)")
+    for perfil, (bits_por_segundo, latencia) in PERFILES.items():
+        print(f"  {perfil:<8} descarga del payload {mediana * 8 / bits_por_segundo * 1000:7.0f} ms"
+              f" (+{latencia * 1000:.0f} ms de latencia)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark de los botones que alternan clasificación y playoffs en una región.
+
+Levanta la app con ``streamlit run``, se conecta por websocket como un
+navegador, abre una región y alterna varias veces entre "🏆 Ver Playoffs" y
+"⬅️ Volver a Clasificaciones". Por cada botón informa la mediana del tiempo
+hasta el fin del rerun, los bytes y mensajes recibidos por el websocket y la
+cantidad de reruns que disparó. Si el botón está dentro de un fragmento, el
+rerun se limita a ese fragmento, como hace el navegador.
+
+Para comparar con otra versión de la app, pasar su ruta con ``--app``.
+
+Uso:
+    python benchmarks/bench_fragmentos.py [--app streamlit_app.py] [--region NORTE] [--repeticiones 5]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cliente_streamlit import APP, ServidorStreamlit, SesionStreamlit  # noqa: E402
+
+BOTONES = ("🏆 Ver Playoffs", "⬅️ Volver a Clasificaciones")
+
+
+async def medir(url, region, repeticiones):
+    sesion = await SesionStreamlit(url).conectar()
+    try:
+        await sesion.rerun()
+        valores = {"Seleccionar Vista:": f"📍 {region}"}
+        await sesion.rerun(valores)
+
+        mediciones = {boton: [] for boton in BOTONES}
+        for _ in range(repeticiones):
+            for boton in BOTONES:
+                id_widget, _ = sesion.widgets[boton]
+                mediciones[boton].append(await sesion.rerun(
+                    valores, click=boton, fragmento=id_widget in sesion.fragmentos
+                ))
+        return mediciones, sesion.fragmentos
+    finally:
+        await sesion.cerrar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--app', default=APP)
+    parser.add_argument('--region', default='NORTE')
+    parser.add_argument('--repeticiones', type=int, default=5)
+    args = parser.parse_args()
+
+    with ServidorStreamlit(args.app) as servidor:
+        mediciones, fragmentos = asyncio.run(medir(servidor.url_websocket, args.region, args.repeticiones))
+
+    print(f"{args.app} • región {args.region} • {'con' if fragmentos else 'sin'} fragmentos")
+    for boton, reruns in mediciones.items():
+        # El primer click llena caches; la mediana descarta ese arranque
+        print(f"  {boton:<30} {statistics.median(r.segundos for r in reruns) * 1000:8.1f} ms"
+              f"  {statistics.median(r.bytes for r in reruns) / 1024:8.1f} KB"
+              f"  {statistics.median(r.mensajes for r in reruns):5.0f} mensajes"
+              f"  {max(r.reruns for r in reruns)} rerun(s)")
+
+
+if __name__ == '__main__':
+    main()
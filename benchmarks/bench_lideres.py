@@ -0,0 +1,109 @@
+"""Benchmark del índice de líderes: armado por versión y consultas top-N.
+
+Arma el índice sobre datos sintéticos (ver ``datos_sinteticos.py``) a varias
+escalas y mide consultas top-N de distintas métricas, alcances y filtros
+contra un recorrido completo con NumPy de las filas del alcance, que es lo
+que costaba cada ranking antes del índice. Verifica que ambos devuelvan las
+mismas filas y falla si alguna consulta tarda más de ``--max-ms``.
+
+Uso:
+    python benchmarks/bench_lideres.py [--escalas 1 100 1000] [--repeticiones 200] [--max-ms 1]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clasificacion import AlmacenClasificacion  # noqa: E402
+from datos_sinteticos import generar_datos  # noqa: E402
+from lideres import METRICAS, IndiceLideres  # noqa: E402
+
+
+def consultas(almacen):
+    """(descripción, argumentos de IndiceLideres.filas) para las consultas medidas"""
+    categoria = almacen.categoria(almacen.categorias[-1])
+    zona = categoria.zonas[-1]
+    grupo = int(categoria.grupos_de_zona(zona)[-1])
+    return [
+        ("puntos, todo el dataset, top 10", dict(metrica='puntos', n=10)),
+        ("invictos, todo el dataset, top 10", dict(metrica='puntos', n=10, filtros=('invictos',))),
+        ("porcentaje ≥10 PJ, categoría, top 10", dict(metrica='porcentaje', n=10, categoria=categoria, min_jugados=10)),
+        ("puntos a favor, categoría, top 1", dict(metrica='puntos_favor', n=1, categoria=categoria)),
+        ("puntos en contra, zona, top 5", dict(metrica='puntos_contra', n=5, categoria=categoria, zona=zona)),
+        ("diferencia, zona, top 16", dict(metrica='diferencia', n=16, categoria=categoria, zona=zona)),
+        ("racha positiva, grupo, top 3", dict(metrica='racha', n=3, grupo=grupo, filtros=('en_racha',))),
+    ]
+
+
+def recorrido(indice, metrica, n=10, categoria=None, zona=None, grupo=None, filtros=(), min_jugados=0):
+    """La misma consulta recorriendo y ordenando todas las filas del alcance"""
+    almacen = indice.almacen
+    if grupo is not None:
+        filas = np.arange(almacen.grupo_inicio[grupo], almacen.grupo_fin[grupo])
+    elif zona is not None:
+        filas = categoria.filas_de_zona(zona)
+    elif categoria is not None:
+        filas = categoria.filas
+    else:
+        filas = np.arange(len(almacen))
+
+    cumple = np.ones(len(filas), dtype=bool)
+    for filtro in filtros:
+        cumple &= indice.filtros[filtro][filas]
+    if min_jugados:
+        cumple &= almacen.columnas['partidos_jugados'][filas] >= min_jugados
+    filas = filas[cumple]
+
+    valores = {'diferencia': almacen.diferencia, **almacen.columnas}
+    if metrica == 'porcentaje':
+        jugados = almacen.columnas['partidos_jugados'][filas]
+        valores = {**valores, 'porcentaje': np.zeros(len(almacen))}
+        valores['porcentaje'][filas] = np.divide(
+            almacen.columnas['partidos_ganados'][filas], jugados,
+            out=np.zeros(len(filas)), where=jugados > 0,
+        )
+    claves = [-valores[c][filas] if desc else valores[c][filas] for c, desc in reversed(METRICAS[metrica])]
+    return filas[np.lexsort(claves)][:n]
+
+
+def medir(repeticiones, funcion):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--escalas', type=int, nargs='+', default=[1, 100, 1000])
+    parser.add_argument('--repeticiones', type=int, default=200)
+    parser.add_argument('--max-ms', type=float, default=1.0)
+    args = parser.parse_args()
+
+    for escala in args.escalas:
+        almacen = AlmacenClasificacion(generar_datos(escala))
+        inicio = time.perf_counter()
+        indice = IndiceLideres(almacen)
+        armado = time.perf_counter() - inicio
+        memoria = sum(filas.nbytes + limites.nbytes for filas, limites in indice._ordenes.values())
+        print(f"x{escala}: {len(almacen)} equipos • índice armado en {armado * 1000:.0f} ms,"
+              f" {memoria / 2**20:.1f} MB")
+
+        for descripcion, argumentos in consultas(almacen):
+            esperado = recorrido(indice, **argumentos)
+            obtenido = indice.filas(**argumentos)
+            assert np.array_equal(esperado, obtenido), descripcion
+
+            ms_indice = medir(args.repeticiones, lambda: indice.filas(**argumentos))
+            ms_recorrido = medir(max(1, args.repeticiones // 20), lambda: recorrido(indice, **argumentos))
+            print(f"  {descripcion:<38} índice {ms_indice:8.4f} ms • recorrido {ms_recorrido:9.3f} ms")
+            assert ms_indice <= args.max_ms, f"x{escala} {descripcion}: {ms_indice:.3f} ms"
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""Benchmark del motor de reglamentos: variantes del formato evaluadas sobre todo el dataset.
+
+Compila el reglamento vigente y varias variantes (cupos de terceros, tamaño
+del cuadro con byes, orden de desempate, asignación de zonas) y evalúa la
+siembra de todas las zonas de todas las categorías en un solo lote, sobre
+datos sintéticos (ver ``datos_sinteticos.py``). Verifica que el reglamento
+vigente reproduzca la clasificación anterior al motor (primeros, segundos y
+los 2 o 4 mejores terceros según la zona, cortado en 16) y la compara en
+tiempo con ese recorrido zona por zona, y que con otro orden de desempate
+``AlmacenClasificacion.ordenar`` siembre los terceros igual que el motor.
+
+Uso:
+    python benchmarks/bench_reglas.py [--escalas 1 100 1000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clasificacion import AlmacenClasificacion  # noqa: E402
+from datos_sinteticos import generar_datos  # noqa: E402
+from reglas import REGLAMENTO_FEBAMBA, TODOS, compilar, evaluar_variantes  # noqa: E402
+
+VARIANTES = {
+    'vigente': REGLAMENTO_FEBAMBA,
+    'sin terceros': {**REGLAMENTO_FEBAMBA, 'cupos': {1: TODOS, 2: TODOS}, 'byes': True, 'excepciones': ()},
+    'cuadro 32 con byes': {**REGLAMENTO_FEBAMBA, 'cupos': {1: TODOS, 2: TODOS, 3: TODOS, 4: 8},
+                           'cuadro': 32, 'byes': True, 'excepciones': ()},
+    'cuadro 8': {**REGLAMENTO_FEBAMBA, 'cupos': {1: TODOS, 2: 2}, 'cuadro': 8, 'excepciones': ()},
+    'desempate por diferencia': {**REGLAMENTO_FEBAMBA, 'desempate': ('diferencia', 'puntos_totales', 'puntos_favor')},
+    'CENTRO OESTE en OESTE': {**REGLAMENTO_FEBAMBA, 'zonas': (('CENTRO OESTE', 'OESTE'),) + REGLAMENTO_FEBAMBA['zonas']},
+}
+
+
+def siembra_anterior(almacen):
+    """Clasificación previa al motor, zona por zona: {(categoría, zona): filas en orden de siembra}"""
+    resultado = {}
+    for categoria_id, nombre in enumerate(almacen.categorias):
+        categoria = almacen.categoria(nombre)
+        if categoria.indice != categoria_id:
+            continue
+        for zona in categoria.zonas:
+            primeros, segundos, terceros = categoria.puestos_de_zona(zona)
+            cupos = 2 if zona == "SUR" else 4
+            filas = list(primeros) + list(segundos) + list(terceros[:cupos])
+            resultado[(categoria_id, zona)] = filas[:16]
+    return resultado
+
+
+def verificar_terceros(almacen, reglas, siembra):
+    """Los terceros de cada zona quedan en el orden de ``ordenar`` con el desempate de su regla"""
+    for nombre in dict.fromkeys(almacen.categorias):
+        categoria = almacen.categoria(nombre)
+        for zona in categoria.zonas:
+            regla = reglas.regla(categoria.fase, nombre, zona)
+            terceros = almacen.fila_puesto[categoria.grupos_de_zona(zona), 2]
+            esperados = almacen.ordenar(terceros[terceros >= 0], regla.desempate)[:regla.cupo(3)]
+            filas, puestos = siembra.clasificados(categoria.indice, zona)
+            assert np.array_equal(filas[puestos == 3], esperados), (nombre, zona)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--escalas', type=int, nargs='+', default=[1, 100, 1000])
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    compiladas = {nombre: compilar(reglamento) for nombre, reglamento in VARIANTES.items()}
+    print(f"{len(compiladas)} variantes compiladas en {(time.perf_counter() - inicio) * 1000:.2f} ms")
+
+    for escala in args.escalas:
+        almacen = AlmacenClasificacion(generar_datos(escala))
+
+        inicio = time.perf_counter()
+        anterior = siembra_anterior(almacen)
+        ms_anterior = (time.perf_counter() - inicio) * 1000
+
+        inicio = time.perf_counter()
+        siembras = evaluar_variantes(almacen, VARIANTES)
+        ms_lote = (time.perf_counter() - inicio) * 1000
+
+        vigente = siembras['vigente']
+        for (categoria_id, zona), filas in anterior.items():
+            obtenidas, _ = vigente.clasificados(categoria_id, zona)
+            assert np.array_equal(obtenidas, filas), (escala, categoria_id, zona)
+        por_diferencia = 'desempate por diferencia'
+        verificar_terceros(almacen, compiladas[por_diferencia], siembras[por_diferencia])
+
+        print(f"x{escala}: {len(almacen)} equipos, {len(anterior)} zonas • recorrido anterior"
+              f" {ms_anterior:.1f} ms (solo la vigente) • {len(VARIANTES)} variantes en {ms_lote:.1f} ms")
+        for nombre, siembra in siembras.items():
+            inicio = time.perf_counter()
+            compiladas[nombre].evaluar(almacen)
+            ms = (time.perf_counter() - inicio) * 1000
+            entran, salen = siembra.diferencias(vigente)
+            print(f"  {nombre:<26} {ms:8.1f} ms • {len(siembra):6d} clasificados"
+                  f" • +{len(entran)} / -{len(salen)} respecto del vigente")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,303 @@
+"""Benchmark del scraper incremental contra un servidor HTTP local.
+
+Graba las páginas de la competencia (índice y un HTML por grupo) a partir de
+un dataset y las sirve con un servidor local que imita al de la federación:
+HTTP/1.1 con keep-alive, ``ETag`` en algunas páginas, ``Last-Modified`` en
+otras, páginas sin validadores, el índice por partes (chunked), compresión
+gzip cuando se pide, redirecciones (la URL de la competencia y algunos
+grupos), un charset que Python no conoce y una latencia fija por pedido.
+
+Corre el scraper tres veces sobre el mismo destino y verifica:
+
+1. la primera descarga todo y el JSON resultante es igual al dataset grabado;
+2. la segunda no encuentra cambios (las páginas sin validadores se bajan pero
+   se reconocen por su huella) y no reescribe el JSON;
+3. después de cambiar algunos grupos, solo esos grupos cuentan como cambiados,
+   el JSON refleja el cambio y el feed de cambios contra la versión
+   reemplazada (ver ``cambios.py``) encuentra exactamente esos grupos.
+
+Uso:
+    python benchmarks/bench_scraper.py [--escala 0] [--conexiones 8] [--latencia-ms 10] [--cambios 3]
+
+``--escala 0`` usa ``basketball_complete_data.json``; con ``N > 0`` usa datos
+sintéticos con resultados partido a partido (ver ``datos_sinteticos.py``).
+"""
+import argparse
+import asyncio
+import gzip
+import hashlib
+import html
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from cambios import comparar as comparar_versiones  # noqa: E402
+from clasificacion import AlmacenClasificacion  # noqa: E402
+from datos_sinteticos import generar_datos  # noqa: E402
+from scraper import actualizar, ruta_cache  # noqa: E402
+from snapshot import abrir_snapshot, ruta_snapshot_anterior  # noqa: E402
+
+RUTA_DATOS = os.path.join(RAIZ, 'basketball_complete_data.json')
+COMPETENCIA = '1623'
+
+
+def _celdas(valores, etiqueta='td'):
+    return '<tr>' + ''.join(f'<{etiqueta}>{html.escape(str(v))}</{etiqueta}>' for v in valores) + '</tr>'
+
+
+def pagina_grupo(grupo):
+    """HTML de la página de un grupo: tabla de posiciones y, si hay, resultados"""
+    filas = [_celdas(('Pos', 'Equipo', 'PJ', 'PG', 'PP', 'PF', 'PC', 'Pts', 'Racha'), 'th')]
+    for e in grupo['clasificacion']:
+        filas.append(_celdas((e['posicion'], e['equipo'], e['partidos_jugados'], e['partidos_ganados'],
+                              e['partidos_perdidos'], e['puntos_favor'], e['puntos_contra'],
+                              e['puntos_totales'], e['racha'])))
+    partes = [f"<html><body><h1>{html.escape(grupo['nombre'])}</h1><table>{''.join(filas)}</table>"]
+    if grupo.get('partidos'):
+        filas = [_celdas(('Local', 'Tantos local', 'Tantos visitante', 'Visitante'), 'th')]
+        filas += [_celdas((p['local'], p['puntos_local'], p['puntos_visitante'], p['visitante']))
+                  for p in grupo['partidos']]
+        partes.append(f"<table>{''.join(filas)}</table>")
+    return ''.join(partes) + '</body></html>'
+
+
+def grabar_paginas(data, directorio):
+    """Escribe el índice y una página por grupo, como si se hubieran grabado del sitio"""
+    os.makedirs(directorio, exist_ok=True)
+    indice = ['<html><body>']
+    numero = 0
+    for categoria in data['datos']:
+        indice.append(f"<h2>{html.escape(categoria['categoria'])}</h2><h3>{html.escape(categoria['fase'])}</h3><ul>")
+        for grupo in categoria['grupos']:
+            numero += 1
+            # Algunos enlaces apuntan a la dirección vieja, que redirige a la página del grupo
+            pagina = 'grupo-viejo.aspx' if numero % 5 == 0 else 'grupo.aspx'
+            indice.append(f'<li><a href="{pagina}?competencia={COMPETENCIA}&amp;grupo={numero}">'
+                          f"{html.escape(grupo['nombre'])}</a></li>")
+            _grabar(directorio, f'grupo-{numero}.html', pagina_grupo(grupo))
+        indice.append('</ul>')
+    indice.append('</body></html>')
+    _grabar(directorio, 'competicion.html', ''.join(indice))
+
+
+def _grabar(directorio, nombre, contenido):
+    ruta = os.path.join(directorio, nombre)
+    contenido = contenido.encode('utf-8')
+    try:
+        with open(ruta, 'rb') as f:
+            if f.read() == contenido:
+                return  # Página sin cambios: conservar el mtime (Last-Modified)
+    except OSError:
+        pass
+    with open(ruta, 'wb') as f:
+        f.write(contenido)
+
+
+class Servidor(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, directorio, latencia):
+        super().__init__(('127.0.0.1', 0), Manejador)
+        self.directorio = directorio
+        self.latencia = latencia
+        self.respuestas = {}
+        self.conexiones = 0
+        self._lock = threading.Lock()
+
+    def contar(self, estado):
+        with self._lock:
+            self.respuestas[estado] = self.respuestas.get(estado, 0) + 1
+
+    def reiniciar(self):
+        with self._lock:
+            self.respuestas = {}
+            self.conexiones = 0
+
+    @property
+    def url(self):
+        # Dirección vieja de la competencia: redirige al índice
+        return f'http://127.0.0.1:{self.server_address[1]}/competencia?id={COMPETENCIA}'
+
+
+class Manejador(BaseHTTPRequestHandler):
+    """Sirve las páginas grabadas con validadores distintos según el grupo"""
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        # Encabezados y cuerpo salen en escrituras separadas: sin esto Nagle demora cada respuesta
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server._lock:
+            self.server.conexiones += 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        time.sleep(self.server.latencia)
+        partes = urlsplit(self.path)
+        if partes.path == '/competencia':
+            return self._responder(301, b'', {'Location': f'/liga/../competicion.aspx?competencia={COMPETENCIA}'})
+        if partes.path == '/grupo-viejo.aspx':
+            return self._responder(302, b'', {'Location': f'grupo.aspx?{partes.query}'})
+        if partes.path == '/competicion.aspx':
+            nombre, numero = 'competicion.html', 0
+        elif partes.path == '/grupo.aspx':
+            numero = int(parse_qs(partes.query)['grupo'][0])
+            nombre = f'grupo-{numero}.html'
+        else:
+            return self._responder(404, b'')
+        try:
+            with open(os.path.join(self.server.directorio, nombre), 'rb') as f:
+                cuerpo = f.read()
+            modificado = os.stat(f.name).st_mtime
+        except OSError:
+            return self._responder(404, b'')
+
+        # Índice y grupos pares con ETag, grupos impares de a tres con Last-Modified, el resto sin validadores
+        # Algunos grupos declaran un charset que Python no conoce: se leen como UTF-8
+        charset = 'x-desconocido' if numero % 7 == 0 else 'utf-8'
+        encabezados = {'Content-Type': f'text/html; charset={charset}'}
+        if numero % 2 == 0:
+            encabezados['ETag'] = '"' + hashlib.sha1(cuerpo).hexdigest()[:16] + '"'
+            if self.headers.get('If-None-Match') == encabezados['ETag']:
+                return self._responder(304, b'', encabezados)
+        elif numero % 3 == 0:
+            encabezados['Last-Modified'] = formatdate(int(modificado), usegmt=True)
+            desde = self.headers.get('If-Modified-Since')
+            if desde and int(modificado) <= parsedate_to_datetime(desde).timestamp():
+                return self._responder(304, b'', encabezados)
+
+        if 'gzip' in self.headers.get('Accept-Encoding', '') and numero % 4 == 2:
+            cuerpo = gzip.compress(cuerpo)
+            encabezados['Content-Encoding'] = 'gzip'
+        self._responder(200, cuerpo, encabezados, por_partes=numero == 0)
+
+    def _responder(self, estado, cuerpo, encabezados=None, por_partes=False):
+        self.server.contar(estado)
+        self.send_response(estado)
+        for clave, valor in (encabezados or {}).items():
+            self.send_header(clave, valor)
+        if por_partes:
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for i in range(0, len(cuerpo), 4096):
+                parte = cuerpo[i:i + 4096]
+                self.wfile.write(f'{len(parte):x}\r\n'.encode() + parte + b'\r\n')
+            self.wfile.write(b'0\r\n\r\n')
+        else:
+            if estado != 304:
+                self.send_header('Content-Length', str(len(cuerpo)))
+            self.end_headers()
+            self.wfile.write(cuerpo)
+
+
+def cambiar_grupos(data, cantidad):
+    """Suma un partido ganado al líder de los primeros ``cantidad`` grupos. Devuelve sus nombres"""
+    nombres = []
+    for categoria in data['datos']:
+        for grupo in categoria['grupos'][:1]:
+            if len(nombres) == cantidad:
+                return nombres
+            lider = grupo['clasificacion'][0]
+            lider['partidos_jugados'] += 1
+            lider['partidos_ganados'] += 1
+            lider['puntos_favor'] += 70
+            lider['puntos_contra'] += 60
+            lider['puntos_totales'] += 2
+            nombres.append((categoria['categoria'], grupo['nombre']))
+    return nombres
+
+
+def comparar(ruta, data):
+    with open(ruta, encoding='utf-8') as f:
+        obtenido = json.load(f)
+    assert obtenido['datos'] == data['datos']
+    assert obtenido['metadata']['total_grupos'] == sum(len(c['grupos']) for c in data['datos'])
+    AlmacenClasificacion(obtenido)  # El JSON escrito se puede cargar en la app
+    return obtenido
+
+
+def corrida(servidor, destino, conexiones):
+    servidor.reiniciar()
+    resumen = asyncio.run(actualizar(destino, servidor.url, conexiones))
+    print(f"  {resumen['segundos'] * 1000:7.0f} ms • {resumen['descargadas']} descargadas, "
+          f"{resumen['sin_cambios']} sin cambios (304), {len(resumen['grupos_cambiados'])} grupos cambiados • "
+          f"{resumen['pedidos']} pedidos en {resumen['conexiones']} conexiones "
+          f"(servidor: {servidor.conexiones}) • respuestas {dict(sorted(servidor.respuestas.items()))}")
+    assert resumen['conexiones'] <= conexiones
+    return resumen
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--escala', type=int, default=0)
+    parser.add_argument('--conexiones', type=int, default=8)
+    parser.add_argument('--latencia-ms', type=float, default=10.0)
+    parser.add_argument('--cambios', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.escala:
+        data = generar_datos(args.escala, partidos=True)
+    else:
+        with open(RUTA_DATOS, encoding='utf-8') as f:
+            data = json.load(f)
+    total = sum(len(c['grupos']) for c in data['datos'])
+
+    with tempfile.TemporaryDirectory() as temporal:
+        paginas = os.path.join(temporal, 'paginas')
+        destino = os.path.join(temporal, 'datos.json')
+        grabar_paginas(data, paginas)
+        servidor = Servidor(paginas, args.latencia_ms / 1000)
+        threading.Thread(target=servidor.serve_forever, daemon=True).start()
+        try:
+            print(f"{total} grupos, {args.conexiones} conexiones, latencia {args.latencia_ms:g} ms por pedido")
+
+            print("completa:")
+            resumen = corrida(servidor, destino, args.conexiones)
+            assert resumen['descargadas'] == total + 1 and resumen['reescrito']
+            assert servidor.respuestas.get(301) == 1 and servidor.respuestas.get(302) == total // 5
+            comparar(destino, data)
+
+            print("sin cambios:")
+            mtime = os.stat(destino).st_mtime_ns
+            resumen = corrida(servidor, destino, args.conexiones)
+            assert not resumen['grupos_cambiados'] and not resumen['reescrito']
+            assert os.stat(destino).st_mtime_ns == mtime
+            # Solo las páginas sin validadores se vuelven a bajar enteras
+            assert servidor.respuestas.get(304) == resumen['sin_cambios'] > 0
+
+            print(f"{args.cambios} grupos cambiados:")
+            cambiados = cambiar_grupos(data, args.cambios)
+            time.sleep(1)  # Last-Modified tiene resolución de un segundo
+            grabar_paginas(data, paginas)
+            resumen = corrida(servidor, destino, args.conexiones)
+            assert resumen['reescrito'] and len(resumen['grupos_cambiados']) == len(cambiados)
+            obtenido = comparar(destino, data)
+            assert os.path.exists(ruta_cache(destino))
+            print(f"  JSON actualizado ({obtenido['metadata']['fecha_scraping']}): "
+                  + ", ".join(f"{categoria} {grupo}" for categoria, grupo in cambiados))
+
+            # La versión reemplazada queda como snapshot: el feed de cambios ve exactamente esos grupos
+            feed = comparar_versiones(abrir_snapshot(ruta_snapshot_anterior(destino)),
+                                      AlmacenClasificacion.desde_archivo(destino))
+            assert {(e['categoria'], e['grupo']) for e in feed if e['tipo'] == 'resultado'} == set(cambiados)
+            print(f"  feed de cambios: {len(feed)} eventos en {len(feed.zonas)} zonas")
+        finally:
+            servidor.shutdown()
+            servidor.server_close()
+
+
+if __name__ == '__main__':
+    main()
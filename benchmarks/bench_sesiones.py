@@ -0,0 +1,207 @@
+"""Prueba de carga con sesiones concurrentes simuladas con ``AppTest``.
+
+Cada sesión es un ``AppTest`` de ``streamlit_app.py`` en su propio hilo, todas
+en el mismo proceso, así que comparten los caches de ``st.cache_resource``
+como las sesiones de un servidor real. Arrancan juntas y navegan como un
+usuario en un día de partidos: cambian de categoría, abren regiones del
+selector, abren los playoffs y vuelven a la clasificación. Las acciones se
+eligen al azar con una semilla fija.
+
+``AppTest`` reemplaza el ``Runtime`` global y compila el script en cada
+rerun, así que dos reruns no pueden ejecutarse a la vez en el mismo proceso:
+las sesiones hacen cola para ejecutar. En un servidor real los reruns de un
+proceso también compiten por el GIL, así que la cola modela bastante bien la
+espera que ve cada usuario cuando hay muchos mirando a la vez.
+
+Informa los percentiles 50, 95 y 99 de la latencia de cada rerun (espera más
+ejecución, en total y por acción), la mediana de la ejecución sola, los
+reruns por segundo y el crecimiento de la memoria del proceso. La ejecución
+incluye el costo propio de ``AppTest``, que arma el árbol de elementos en
+cada rerun, así que es una cota superior de lo que tarda el servidor.
+
+Corre sin red: usa el JSON incluido o, con ``--escala``, un dataset sintético
+(ver ``datos_sinteticos.py``) que se pasa a la app con ``COPA_DATOS``.
+
+Uso:
+    python benchmarks/bench_sesiones.py [--sesiones 20] [--pasos 30] [--escala 10] [--salida resultados.json]
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from streamlit.logger import set_log_level  # noqa: E402
+
+from datos_sinteticos import escribir_datos  # noqa: E402
+from metricas import rss_bytes  # noqa: E402
+
+APP = os.path.join(RAIZ, 'streamlit_app.py')
+
+CATEGORIA = "Seleccionar Categoría:"
+VISTA = "Seleccionar Vista:"
+VER_PLAYOFFS = "🏆 Ver Playoffs"
+VOLVER = "⬅️ Volver a Clasificaciones"
+
+# Un solo rerun de AppTest a la vez en el proceso
+_turno = threading.Lock()
+
+
+def widget(elementos, etiqueta):
+    return next((elemento for elemento in elementos if elemento.label == etiqueta), None)
+
+
+class Sesion:
+    """Un usuario simulado: un AppTest y las duraciones de sus reruns por acción"""
+
+    def __init__(self, semilla, timeout):
+        from streamlit.testing.v1 import AppTest
+
+        self.rng = random.Random(semilla)
+        self.app = AppTest.from_file(APP, default_timeout=timeout)
+        self.tiempos = []  # (acción, segundos hasta el fin del rerun, segundos ejecutando)
+
+    def _rerun(self, accion, ejecutar):
+        pedido = time.perf_counter()
+        with _turno:
+            inicio = time.perf_counter()
+            ejecutar()
+            fin = time.perf_counter()
+        self.tiempos.append((accion, fin - pedido, fin - inicio))
+        if self.app.exception:
+            raise RuntimeError(f"{accion}: {self.app.exception[0].message}")
+
+    def paso(self):
+        """Elige y ejecuta una acción posible en la pantalla actual"""
+        app = self.app
+        ver_playoffs = widget(app.button, VER_PLAYOFFS)
+        volver = widget(app.button, VOLVER)
+        vista = widget(app.sidebar.selectbox, VISTA)
+
+        if volver is not None and self.rng.random() < 0.6:
+            self._rerun('volver', volver.click().run)
+        elif ver_playoffs is not None and volver is None and self.rng.random() < 0.4:
+            self._rerun('playoffs', ver_playoffs.click().run)
+        elif self.rng.random() < 0.2:
+            categoria = widget(app.sidebar.selectbox, CATEGORIA)
+            self._rerun('categoria', categoria.select(self.rng.choice(categoria.options)).run)
+        else:
+            self._rerun('vista', vista.select(self.rng.choice(vista.options)).run)
+
+    def abrir(self):
+        self._rerun('inicio', self.app.run)
+        return self
+
+    def navegar(self, pasos, largada):
+        largada.wait()
+        for _ in range(pasos):
+            self.paso()
+        return self.tiempos
+
+
+def percentiles(tiempos):
+    # quantiles necesita al menos dos valores
+    cortes = statistics.quantiles(tiempos * 2 if len(tiempos) < 2 else tiempos, n=100, method='inclusive')
+    return {'p50': cortes[49] * 1000, 'p95': cortes[94] * 1000, 'p99': cortes[98] * 1000, 'reruns': len(tiempos)}
+
+
+def correr(sesiones, pasos, semilla, timeout):
+    # Calentamiento: la primera sesión carga los datos y llena los caches compartidos
+    Sesion(semilla - 1, timeout).abrir().navegar(5, threading.Barrier(1))
+    gc.collect()
+    rss_inicial = rss_bytes()
+
+    # La primera ejecución de cada AppTest compila el script, y compilar desde varios
+    # hilos a la vez no es seguro: las sesiones se abren de a una antes de la largada
+    usuarios = [Sesion(semilla + i, timeout).abrir() for i in range(sesiones)]
+    largada = threading.Barrier(sesiones)
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sesiones) as pool:
+        resultados = list(pool.map(lambda usuario: usuario.navegar(pasos, largada), usuarios))
+    duracion = time.perf_counter() - inicio
+    rss_pico = rss_bytes()
+
+    del usuarios
+    gc.collect()
+    rss_final = rss_bytes()
+
+    por_accion = {}
+    ejecucion = []
+    for resultado in resultados:
+        for accion, segundos, ejecutando in resultado:
+            por_accion.setdefault(accion, []).append(segundos)
+            if accion != 'inicio':
+                ejecucion.append(ejecutando)
+    # La apertura ocurre antes de la largada: cuenta en su propia fila, no en el total ni en el throughput
+    tiempos = [segundos for accion, valores in por_accion.items() if accion != 'inicio' for segundos in valores]
+
+    return {
+        'sesiones': sesiones,
+        'pasos': pasos,
+        'duracion_s': duracion,
+        'reruns_por_segundo': len(tiempos) / duracion,
+        'latencia_ms': percentiles(tiempos),
+        'ejecucion_ms': percentiles(ejecucion),
+        'por_accion_ms': {accion: percentiles(valores) for accion, valores in sorted(por_accion.items())},
+        'rss_mb': {
+            'inicial': rss_inicial / 2**20,
+            'con_sesiones': rss_pico / 2**20,
+            'al_cerrar': rss_final / 2**20,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sesiones', type=int, default=20)
+    parser.add_argument('--pasos', type=int, default=30, help="Acciones por sesión después de abrir la app")
+    parser.add_argument('--escala', type=int, help="Usar datos sintéticos a esta escala en lugar del JSON incluido")
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--timeout', type=float, default=120, help="Segundos máximos por rerun")
+    parser.add_argument('--salida')
+    args = parser.parse_args()
+
+    # Sin servidor de métricas: las sesiones corren dentro de este proceso
+    os.environ['COPA_METRICAS_PUERTO'] = '0'
+    set_log_level('error')
+    os.chdir(RAIZ)
+
+    with tempfile.TemporaryDirectory() as directorio:
+        if args.escala:
+            os.environ['COPA_DATOS'] = os.path.join(directorio, 'datos.json')
+            escribir_datos(os.environ['COPA_DATOS'], args.escala, args.semilla)
+        resultado = correr(args.sesiones, args.pasos, args.semilla, args.timeout)
+    resultado['datos'] = f"sintéticos x{args.escala}" if args.escala else 'basketball_complete_data.json'
+
+    latencia = resultado['latencia_ms']
+    print(f"{resultado['sesiones']} sesiones × {resultado['pasos']} acciones • {resultado['datos']}")
+    print(f"  {latencia['reruns']} reruns en {resultado['duracion_s']:.1f} s"
+          f" → {resultado['reruns_por_segundo']:.1f} reruns/s")
+    print(f"  ejecución sola: p50 {resultado['ejecucion_ms']['p50']:.1f} ms"
+          f" • p95 {resultado['ejecucion_ms']['p95']:.1f} ms (sin la espera en la cola)")
+    print(f"  {'total':<10} p50 {latencia['p50']:7.1f} ms  p95 {latencia['p95']:7.1f} ms  p99 {latencia['p99']:7.1f} ms")
+    for accion, valores in resultado['por_accion_ms'].items():
+        print(f"  {accion:<10} p50 {valores['p50']:7.1f} ms  p95 {valores['p95']:7.1f} ms"
+              f"  p99 {valores['p99']:7.1f} ms  ({valores['reruns']} reruns)")
+    rss = resultado['rss_mb']
+    print(f"  RSS {rss['inicial']:.0f} MB → {rss['con_sesiones']:.0f} MB con las sesiones abiertas"
+          f" (+{(rss['con_sesiones'] - rss['inicial']) / resultado['sesiones']:.2f} MB/sesión)"
+          f" → {rss['al_cerrar']:.0f} MB al cerrarlas")
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(resultado, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
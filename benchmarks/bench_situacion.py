@@ -0,0 +1,56 @@
+"""Benchmark de la situación matemática (clasificado asegurado / eliminado / en juego).
+
+Calcula la situación de todas las zonas de todas las categorías del dataset
+real y de datos sintéticos (ver ``datos_sinteticos.py``) a varias escalas. Los
+casos de empates abiertos y del corte de los mejores terceros se verifican en
+``tests/test_situacion.py``.
+
+Uso:
+    python benchmarks/bench_situacion.py [--escalas 1 10]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clasificacion import AlmacenClasificacion  # noqa: E402
+from datos_sinteticos import generar_datos  # noqa: E402
+from situacion import situacion_completa  # noqa: E402
+
+RUTA_DATOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'basketball_complete_data.json')
+
+
+def medir(data, nombre):
+    almacen = AlmacenClasificacion(data)
+    inicio = time.perf_counter()
+    situacion = situacion_completa(almacen)
+    ms = (time.perf_counter() - inicio) * 1000
+
+    estados = {}
+    for equipos in situacion.values():
+        for estado in equipos.values():
+            estados[estado] = estados.get(estado, 0) + 1
+    total = sum(estados.values())
+    print(f"{nombre}: {total} equipos en {len(situacion)} zonas • {ms:.0f} ms • "
+          + ", ".join(f"{cantidad} {estado}" for estado, cantidad in sorted(estados.items())))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--escalas', type=int, nargs='+', default=[1, 10])
+    args = parser.parse_args()
+
+    with open(RUTA_DATOS, encoding='utf-8') as f:
+        data = json.load(f)
+    medir(data, "dataset real")
+
+    for escala in args.escalas:
+        medir(generar_datos(escala), f"x{escala}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark de arranque en frío: JSON, carga perezosa por categoría y snapshot binario.
+
+Cada medición corre en un proceso nuevo para que el arranque sea realmente en
+frío. Se mide el tiempo hasta tener el almacén listo y la memoria pico (RSS
+máximo) del proceso, leída de ``/proc`` (Linux).
+
+Uso:
+    python benchmarks/bench_snapshot.py [--escala 1] [--repeticiones 5]
+
+``--escala N`` replica las categorías N veces para simular un archivo
+histórico más grande.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from snapshot import compilar_snapshot  # noqa: E402
+
+RUTA_DATOS = os.path.join(RAIZ, 'basketball_complete_data.json')
+
+MEDICION = """
+import sys, time
+sys.path.insert(0, {raiz!r})
+import numpy
+inicio = time.perf_counter()
+if {modo!r} == 'json':
+    from clasificacion import AlmacenClasificacion
+    almacen = AlmacenClasificacion.desde_archivo({ruta!r})
+elif {modo!r} == 'perezoso':
+    from carga_perezosa import CargadorPerezoso
+    almacen = CargadorPerezoso({ruta!r})
+else:
+    from snapshot import abrir_snapshot
+    almacen = abrir_snapshot({ruta!r})
+vista = almacen.categoria(almacen.categorias[0])
+vista.puestos_de_zona(vista.zonas[0])
+segundos = time.perf_counter() - inicio
+# VmHWM es el pico de RSS de este proceso (ru_maxrss se hereda del proceso padre)
+with open('/proc/self/status') as f:
+    pico = next(int(linea.split()[1]) for linea in f if linea.startswith('VmHWM:'))
+print(segundos, pico)
+"""
+
+
+def generar_dataset(escala, destino):
+    """Escribe una versión del dataset con las categorías replicadas ``escala`` veces"""
+    with open(RUTA_DATOS, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    datos = []
+    for i in range(escala):
+        for categoria in data['datos']:
+            sufijo = f" T{i + 1}" if escala > 1 else ""
+            datos.append({**categoria, 'categoria': categoria['categoria'] + sufijo})
+    data['datos'] = datos
+    with open(destino, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+def medir(modo, ruta, repeticiones):
+    tiempos = []
+    memoria = []
+    for _ in range(repeticiones):
+        salida = subprocess.run(
+            [sys.executable, '-c', MEDICION.format(raiz=RAIZ, modo=modo, ruta=ruta)],
+            check=True, capture_output=True, text=True,
+        ).stdout.split()
+        tiempos.append(float(salida[0]))
+        memoria.append(int(salida[1]) / 1024)
+    tiempos.sort()
+    return tiempos[len(tiempos) // 2], max(memoria)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--escala', type=int, default=1)
+    parser.add_argument('--repeticiones', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta_json = os.path.join(directorio, 'datos.json')
+        generar_dataset(args.escala, ruta_json)
+        ruta_snapshot = compilar_snapshot(ruta_json)
+
+        print(f"Escala x{args.escala}: JSON {os.path.getsize(ruta_json) / 1024:.0f} KB, "
+              f"snapshot {os.path.getsize(ruta_snapshot) / 1024:.0f} KB")
+        for modo, ruta in (('json', ruta_json), ('perezoso', ruta_json), ('snapshot', ruta_snapshot)):
+            segundos, rss = medir(modo, ruta, args.repeticiones)
+            print(f"  {modo:<9} arranque {segundos * 1000:8.2f} ms   RSS pico {rss:7.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""Micro-benchmark del renderizado de las tablas de equipos.
+
+Compara, para cada tabla (primeros, segundos y terceros de cada zona de cada
+categoría), el camino anterior con ``Styler`` de pandas (DataFrame,
+``style.apply`` fila por fila y ``to_html``) contra la plantilla de
+``tablas.tabla_equipos`` y contra la búsqueda del fragmento ya cacheado.
+
+Uso:
+    python benchmarks/bench_tablas.py [--repeticiones 20]
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clasificacion import AlmacenClasificacion, classify_teams_by_region, terceros_que_clasifican  # noqa: E402
+from estilos import format_racha  # noqa: E402
+from recarga import CacheDerivados  # noqa: E402
+from situacion import situacion_zona  # noqa: E402
+from tablas import tabla_equipos  # noqa: E402
+
+RUTA_DATOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'basketball_complete_data.json')
+
+
+def tabla_styler(teams, classification_spots=None, situacion=None):
+    """Camino anterior de show_team_table, sin las llamadas a Streamlit"""
+    data = []
+    for i, team in enumerate(teams):
+        estado = "✅ CLASIFICA"
+        if classification_spots and i >= classification_spots:
+            estado = "❌ ELIMINADO"
+        invicto = "🏆" if team['partidos_perdidos'] == 0 and team['partidos_jugados'] > 0 else ""
+        data.append({
+            'Pos': i + 1,
+            'Equipo': f"{invicto} {team['equipo']}",
+            'Zona': team.get('zona', ''),
+            'J': team['partidos_jugados'],
+            'G': team['partidos_ganados'],
+            'P': team['partidos_perdidos'],
+            'PF': team['puntos_favor'],
+            'PC': team['puntos_contra'],
+            'Diff': f"{team['puntos_favor'] - team['puntos_contra']:+d}",
+            'Pts': team['puntos_totales'],
+            'Racha': format_racha(team['racha']),
+            'Estado': estado if classification_spots else "",
+            'Situación': situacion.get((team.get('zona'), team['equipo']), "") if situacion else ""
+        })
+    df = pd.DataFrame(data)
+
+    if classification_spots:
+        def highlight_rows(row):
+            if row.name < 2:
+                return ['background-color: #d4edda'] * len(row)
+            elif classification_spots and row.name < classification_spots:
+                return ['background-color: #fff3cd'] * len(row)
+            else:
+                return ['background-color: #f8d7da; opacity: 0.7'] * len(row)
+        styled_df = df.style.apply(highlight_rows, axis=1)
+    else:
+        styled_df = df.style.apply(lambda x: ['background-color: #d4edda'] * len(x), axis=1)
+    return styled_df.to_html(escape=False, index=False)
+
+
+def medir(funcion, tablas, repeticiones):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        for tabla in tablas:
+            funcion(*tabla)
+    return (time.perf_counter() - inicio) / (repeticiones * len(tablas))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeticiones', type=int, default=20)
+    args = parser.parse_args()
+
+    almacen = AlmacenClasificacion.desde_archivo(RUTA_DATOS)
+    tablas = []
+    for nombre in dict.fromkeys(almacen.categorias):
+        categoria = almacen.categoria(nombre)
+        for zona in categoria.zonas:
+            situacion = situacion_zona(categoria, zona)
+            primeros, segundos, terceros = classify_teams_by_region(categoria, zona)
+            tablas.append(((nombre, zona, 'primeros'), primeros, None, situacion))
+            tablas.append(((nombre, zona, 'segundos'), segundos, None, situacion))
+            tablas.append(((nombre, zona, 'terceros'), terceros, terceros_que_clasifican(zona), situacion))
+
+    derivados = CacheDerivados()
+
+    def cacheado(clave, equipos, cupos, situacion):
+        return derivados.obtener(almacen.version, clave, lambda: tabla_equipos(equipos, cupos, situacion))
+
+    styler = medir(lambda _, *tabla: tabla_styler(*tabla), tablas, max(1, args.repeticiones // 10))
+    plantilla = medir(lambda _, *tabla: tabla_equipos(*tabla), tablas, args.repeticiones)
+    cache = medir(cacheado, tablas, args.repeticiones)
+
+    print(f"{len(tablas)} tablas")
+    for modo, segundos in (("Styler", styler), ("plantilla", plantilla), ("fragmento cacheado", cache)):
+        print(f"  {modo:<20} {segundos * 1e3:9.3f} ms/tabla  ({styler / segundos:7.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
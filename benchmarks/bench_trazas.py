@@ -0,0 +1,102 @@
+"""Benchmark del costo de las trazas con el panel de depuración apagado y encendido.
+
+Mide el costo por llamada del decorador ``@traza`` sobre una función vacía y
+el de un recorrido completo de clasificación, siembra y cruces de todas las
+zonas, llamando a las funciones instrumentadas y a las originales
+(``__wrapped__``). Falla si, con las trazas apagadas, el decorador agrega más
+de ``--max-ns`` por llamada o más de ``--max-porcentaje`` al recorrido.
+
+Uso:
+    python benchmarks/bench_trazas.py [--repeticiones 7] [--max-ns 500] [--max-porcentaje 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clasificacion import (  # noqa: E402
+    AlmacenClasificacion,
+    classify_teams_by_region,
+    generate_playoff_matchups,
+    get_clasificados_por_zona,
+)
+from trazas import iniciar_rerun, terminar_rerun, traza  # noqa: E402
+
+RUTA_DATOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'basketball_complete_data.json')
+
+LLAMADAS = 200_000
+
+
+def vacia():
+    return None
+
+
+def recorrido(almacen, clasificar, sembrar, cruzar):
+    for nombre in dict.fromkeys(almacen.categorias):
+        categoria = almacen.categoria(nombre)
+        for zona in categoria.zonas:
+            clasificar(categoria, zona)
+            cruzar(sembrar(categoria, zona))
+
+
+def mejor_de(repeticiones, funcion):
+    """Mínimo de varias corridas: la medición menos afectada por el ruido"""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos)
+
+
+def por_llamada(funcion, repeticiones):
+    def bucle():
+        for _ in range(LLAMADAS):
+            funcion()
+    return mejor_de(repeticiones, bucle) / LLAMADAS * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeticiones', type=int, default=7)
+    parser.add_argument('--max-ns', type=float, default=500)
+    parser.add_argument('--max-porcentaje', type=float, default=3)
+    args = parser.parse_args()
+
+    instrumentada = traza(vacia)
+    ns_original = por_llamada(vacia, args.repeticiones)
+    ns_apagada = por_llamada(instrumentada, args.repeticiones)
+    iniciar_rerun()
+    try:
+        ns_encendida = por_llamada(instrumentada, args.repeticiones)
+    finally:
+        terminar_rerun(archivo=None)
+
+    almacen = AlmacenClasificacion.desde_archivo(RUTA_DATOS)
+    funciones = (classify_teams_by_region, get_clasificados_por_zona, generate_playoff_matchups)
+    originales = tuple(funcion.__wrapped__ for funcion in funciones)
+    s_original = mejor_de(args.repeticiones, lambda: recorrido(almacen, *originales))
+    s_apagada = mejor_de(args.repeticiones, lambda: recorrido(almacen, *funciones))
+    iniciar_rerun()
+    try:
+        s_encendida = mejor_de(args.repeticiones, lambda: recorrido(almacen, *funciones))
+    finally:
+        terminar_rerun(archivo=None)
+
+    sobrecosto_ns = ns_apagada - ns_original
+    sobrecosto_porcentaje = (s_apagada / s_original - 1) * 100
+    print("Función vacía:")
+    print(f"  sin decorador {ns_original:8.0f} ns • trazas apagadas {ns_apagada:8.0f} ns"
+          f" • encendidas {ns_encendida:8.0f} ns")
+    print("Clasificación, siembra y cruces de todas las zonas:")
+    print(f"  sin decorador {s_original * 1000:8.2f} ms • trazas apagadas {s_apagada * 1000:8.2f} ms"
+          f" ({sobrecosto_porcentaje:+.1f}%) • encendidas {s_encendida * 1000:8.2f} ms")
+
+    assert sobrecosto_ns <= args.max_ns, f"trazas apagadas: +{sobrecosto_ns:.0f} ns por llamada"
+    assert sobrecosto_porcentaje <= args.max_porcentaje, f"trazas apagadas: {sobrecosto_porcentaje:+.1f}%"
+
+
+if __name__ == '__main__':
+    main()
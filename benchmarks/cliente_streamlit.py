@@ -0,0 +1,166 @@
+"""Cliente mínimo del protocolo de Streamlit para los benchmarks.
+
+Levanta la app con ``streamlit run`` en un puerto libre y habla con ella por
+el websocket ``/_stcore/stream`` como lo haría el navegador: manda
+``BackMsg`` con el estado de los widgets y cuenta los ``ForwardMsg`` que
+vuelven hasta que termina el rerun. Igual que el navegador, recuerda los
+mensajes cacheables y avisa sus hashes en cada rerun, así que el servidor
+puede mandar solo una referencia en lugar del elemento completo.
+"""
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(RAIZ, 'streamlit_app.py')
+
+_FIN_DE_RERUN = (
+    ForwardMsg.FINISHED_SUCCESSFULLY,
+    ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY,
+    ForwardMsg.FINISHED_WITH_COMPILE_ERROR,
+)
+
+
+def puerto_libre():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+class ServidorStreamlit:
+    """``streamlit run`` en un subproceso, como context manager"""
+
+    def __init__(self, app=APP, puerto=None, entorno=None):
+        self.app = app
+        self.puerto = puerto or puerto_libre()
+        self.entorno = entorno or {}
+        self._proceso = None
+
+    @property
+    def url_websocket(self):
+        return f'ws://127.0.0.1:{self.puerto}/_stcore/stream'
+
+    def __enter__(self):
+        self._proceso = subprocess.Popen(
+            [sys.executable, '-m', 'streamlit', 'run', self.app,
+             '--server.headless', 'true',
+             '--server.port', str(self.puerto),
+             '--server.address', '127.0.0.1',
+             '--browser.gatherUsageStats', 'false',
+             '--server.fileWatcherType', 'none'],
+            cwd=os.path.dirname(os.path.abspath(self.app)),
+            env={**os.environ, **self.entorno},
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        limite = time.monotonic() + 60
+        while time.monotonic() < limite:
+            try:
+                with urllib.request.urlopen(f'http://127.0.0.1:{self.puerto}/_stcore/health', timeout=1):
+                    return self
+            except OSError:
+                time.sleep(0.2)
+        self.__exit__(None, None, None)
+        raise RuntimeError(f"Streamlit no respondió en el puerto {self.puerto}")
+
+    def __exit__(self, *_):
+        self._proceso.terminate()
+        try:
+            self._proceso.wait(10)
+        except subprocess.TimeoutExpired:
+            self._proceso.kill()
+
+
+class Rerun:
+    """Resultado de un rerun: segundos, bytes recibidos, mensajes y reruns encadenados"""
+
+    def __init__(self):
+        self.segundos = 0.0
+        self.bytes = 0
+        self.mensajes = 0
+        self.reruns = 0
+        self.elementos = []
+
+
+class SesionStreamlit:
+    """Una pestaña del navegador conectada a la app"""
+
+    def __init__(self, url):
+        self.url = url
+        self.widgets = {}  # etiqueta -> (id, tipo)
+        self.fragmentos = {}  # id de widget -> id del fragmento que lo contiene
+        self._cacheados = set()
+        self._ws = None
+
+    async def conectar(self):
+        self._ws = await websockets.connect(self.url, subprotocols=['streamlit'], max_size=None, compression=None)
+        return self
+
+    async def cerrar(self):
+        await self._ws.close()
+
+    async def rerun(self, valores=None, click=None, fragmento=False, timeout=120):
+        """Ejecuta un rerun con los valores de los widgets (por etiqueta).
+
+        ``click`` es la etiqueta de un botón a presionar; con ``fragmento`` el
+        rerun se limita al fragmento que contiene ese botón.
+        """
+        mensaje = BackMsg()
+        estado = mensaje.rerun_script
+        for etiqueta, valor in (valores or {}).items():
+            id_widget, _ = self.widgets[etiqueta]
+            widget = estado.widget_states.widgets.add()
+            widget.id = id_widget
+            widget.string_value = valor
+        if click is not None:
+            id_widget, _ = self.widgets[click]
+            widget = estado.widget_states.widgets.add()
+            widget.id = id_widget
+            widget.trigger_value = True
+            if fragmento:
+                estado.fragment_id = self.fragmentos[id_widget]
+        estado.cached_message_hashes.extend(self._cacheados)
+
+        resultado = Rerun()
+        inicio = time.perf_counter()
+        await self._ws.send(mensaje.SerializeToString())
+        while True:
+            datos = await asyncio.wait_for(self._ws.recv(), timeout)
+            resultado.bytes += len(datos)
+            resultado.mensajes += 1
+            recibido = ForwardMsg()
+            recibido.ParseFromString(datos)
+            tipo = recibido.WhichOneof('type')
+            if tipo == 'delta':
+                self._registrar(recibido, resultado)
+            elif tipo == 'script_finished':
+                resultado.reruns += 1
+                if recibido.script_finished in _FIN_DE_RERUN:
+                    break
+        resultado.segundos = time.perf_counter() - inicio
+        return resultado
+
+    def _registrar(self, mensaje, resultado):
+        if mensaje.metadata.cacheable:
+            self._cacheados.add(mensaje.hash)
+        delta = mensaje.delta
+        if delta.WhichOneof('type') != 'new_element':
+            return
+        elemento = delta.new_element
+        tipo = elemento.WhichOneof('type')
+        resultado.elementos.append(tipo)
+        contenido = getattr(elemento, tipo)
+        etiqueta = getattr(contenido, 'label', None)
+        id_widget = getattr(contenido, 'id', None)
+        if etiqueta and id_widget:
+            self.widgets[etiqueta] = (id_widget, tipo)
+            if delta.fragment_id:
+                self.fragmentos[id_widget] = delta.fragment_id
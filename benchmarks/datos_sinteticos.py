@@ -0,0 +1,190 @@
+"""Generador de datos sintéticos con la forma del JSON del scraper.
+
+La escala 1 reproduce el tamaño del dataset real: 5 categorías de una fase,
+con las regiones SUR (7 grupos), NORTE, CENTRO y OESTE (6 grupos cada una),
+125 grupos y unos 920 equipos. Las escalas mayores agregan una segunda fase,
+más categorías y regiones nuevas, de modo que la cantidad de grupos crece en
+proporción a la escala. Los nombres de los clubes se repiten entre
+categorías, como en los datos reales. Con la misma semilla el resultado es
+siempre el mismo. Con ``partidos`` cada grupo trae además los resultados
+partido a partido (ida y vuelta, con algunos partidos sin jugar) y la tabla
+se calcula a partir de ellos.
+
+Uso:
+    python benchmarks/datos_sinteticos.py destino.json [--escala 10] [--semilla 0] [--partidos]
+"""
+import argparse
+import json
+import random
+
+REGIONES_BASE = ('SUR', 'NORTE', 'CENTRO', 'OESTE')
+REGIONES_EXTRA = (
+    'ESTE', 'LITORAL', 'DELTA', 'PAMPA', 'RIBERA', 'SIERRA', 'LLANURA', 'COSTA',
+    'VALLE', 'MESETA', 'ISLAS', 'PUERTO',
+)
+CATEGORIAS_BASE = ('U17', 'U15', 'U13', 'MINI', 'PRE MINI')
+RAMAS = ('MASCULINO', 'FEMENINO')
+FASES = ('1er ETAPA LFF', '2da ETAPA LFF')
+GRUPOS_POR_REGION = 6
+CLUBES_POR_REGION = 60
+
+
+def dimensiones(escala):
+    """Categorías, fases y regiones por categoría para una escala: grupos ≈ 125 × escala"""
+    if escala <= 1:
+        return len(CATEGORIAS_BASE), 1, len(REGIONES_BASE)
+    fases = len(FASES)
+    regiones = len(REGIONES_BASE) * min(4, max(1, round(escala ** 0.5 / 3)))
+    grupos_por_fase = 1 + regiones * GRUPOS_POR_REGION  # SUR tiene un grupo más
+    categorias = max(1, round(125 * escala / (fases * grupos_por_fase)))
+    return categorias, fases, regiones
+
+
+def nombres_categorias(cantidad):
+    """U17 MASCULINO, U15 MASCULINO, ... y después otras ramas y divisiones"""
+    nombres = []
+    division = 1
+    while len(nombres) < cantidad:
+        for rama in RAMAS:
+            for base in CATEGORIAS_BASE:
+                sufijo = f" D{division}" if division > 1 else ""
+                nombres.append(f"{base} {rama}{sufijo}")
+        division += 1
+    # Primero todas las masculinas de la división 1, como en el dataset real
+    return nombres[:cantidad]
+
+
+def nombres_grupos(region):
+    """Nombres de los grupos de una región, con las variantes que produce el scraper"""
+    if region == 'SUR':
+        return [f"SUR {i}" for i in range(1, GRUPOS_POR_REGION + 2)]
+    if region == 'CENTRO':
+        return ["CENTRO 1", "CENTRO 2", "CENTRO 3", "CENTRO OESTE 4", "CENTRO OESTE 5", "CENTRO OESTE  6"]
+    return [f"{region} {i}" for i in range(1, GRUPOS_POR_REGION + 1)]
+
+
+def _clasificacion(rng, clubes):
+    """Tabla de un grupo: 7 u 8 equipos con estadísticas coherentes entre sí"""
+    equipos = []
+    for club in rng.sample(clubes, rng.choice((7, 7, 8))):
+        jugados = rng.randint(10, 12)
+        ganados = rng.randint(0, jugados)
+        perdidos = jugados - ganados
+        favor = sum(rng.randint(35, 95) for _ in range(jugados))
+        equipos.append({
+            'equipo': club,
+            'partidos_jugados': jugados,
+            'partidos_ganados': ganados,
+            'partidos_perdidos': perdidos,
+            'puntos_favor': favor,
+            'puntos_contra': max(0, favor - (ganados - perdidos) * rng.randint(2, 12) + rng.randint(-20, 20)),
+            'puntos_totales': 2 * ganados + perdidos,
+            'racha': rng.choice((-1, 1)) * rng.randint(1, 5),
+        })
+    equipos.sort(key=lambda x: (-x['puntos_totales'], x['puntos_contra'] - x['puntos_favor']))
+    return [{'posicion': i + 1, **equipo} for i, equipo in enumerate(equipos)]
+
+
+def _grupo_con_partidos(rng, clubes, jugados=0.85):
+    """Tabla y partidos de un grupo: todos contra todos ida y vuelta, con una parte sin jugar"""
+    nombres = rng.sample(clubes, rng.choice((7, 7, 8)))
+    tabla = {nombre: dict.fromkeys(('jugados', 'ganados', 'favor', 'contra'), 0) for nombre in nombres}
+    partidos = []
+    for local in nombres:
+        for visitante in nombres:
+            if local == visitante or rng.random() > jugados:
+                continue
+            puntos_local, puntos_visitante = rng.randint(35, 95), rng.randint(35, 95)
+            while puntos_local == puntos_visitante:
+                puntos_visitante = rng.randint(35, 95)
+            partidos.append({
+                'local': local, 'visitante': visitante,
+                'puntos_local': puntos_local, 'puntos_visitante': puntos_visitante,
+            })
+            for nombre, favor, contra in ((local, puntos_local, puntos_visitante), (visitante, puntos_visitante, puntos_local)):
+                tabla[nombre]['jugados'] += 1
+                tabla[nombre]['ganados'] += favor > contra
+                tabla[nombre]['favor'] += favor
+                tabla[nombre]['contra'] += contra
+
+    equipos = [{
+        'equipo': nombre,
+        'partidos_jugados': t['jugados'],
+        'partidos_ganados': t['ganados'],
+        'partidos_perdidos': t['jugados'] - t['ganados'],
+        'puntos_favor': t['favor'],
+        'puntos_contra': t['contra'],
+        'puntos_totales': 2 * t['ganados'] + (t['jugados'] - t['ganados']),
+        'racha': rng.choice((-1, 1)) * rng.randint(1, 5),
+    } for nombre, t in tabla.items()]
+    # Orden publicado sin enfrentamiento directo: puntos, diferencia y tantos a favor
+    equipos.sort(key=lambda x: (-x['puntos_totales'], x['puntos_contra'] - x['puntos_favor'], -x['puntos_favor']))
+    return [{'posicion': i + 1, **equipo} for i, equipo in enumerate(equipos)], partidos
+
+
+def _grupo(rng, nombre, clubes, partidos):
+    if not partidos:
+        return {'nombre': nombre, 'clasificacion': _clasificacion(rng, clubes)}
+    clasificacion, resultados = _grupo_con_partidos(rng, clubes)
+    return {'nombre': nombre, 'clasificacion': clasificacion, 'partidos': resultados}
+
+
+def generar_datos(escala=1, semilla=0, partidos=False):
+    """Dataset sintético con la forma del JSON del scraper"""
+    rng = random.Random(semilla)
+    cantidad_categorias, cantidad_fases, cantidad_regiones = dimensiones(escala)
+    regiones = (REGIONES_BASE + REGIONES_EXTRA)[:cantidad_regiones]
+    clubes = {
+        region: [f"CLUB {region} {i:02d}" for i in range(1, CLUBES_POR_REGION + 1)]
+        for region in regiones
+    }
+
+    datos = []
+    categorias = nombres_categorias(cantidad_categorias)
+    for fase in FASES[:cantidad_fases]:
+        for categoria in categorias:
+            datos.append({
+                'categoria': categoria,
+                'fase': fase,
+                'grupos': [
+                    _grupo(rng, nombre, clubes[region], partidos)
+                    for region in regiones
+                    for nombre in nombres_grupos(region)
+                ],
+            })
+
+    return {
+        'metadata': {
+            'url_base': 'sintetico',
+            'categorias_procesadas': categorias,
+            'total_grupos': sum(len(categoria['grupos']) for categoria in datos),
+            'fecha_scraping': '2025-06-21 15:21:37',
+        },
+        'datos': datos,
+    }
+
+
+def escribir_datos(destino, escala=1, semilla=0, partidos=False):
+    """Escribe el dataset sintético en ``destino`` y lo devuelve"""
+    data = generar_datos(escala, semilla, partidos)
+    with open(destino, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('destino')
+    parser.add_argument('--escala', type=int, default=1)
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--partidos', action='store_true', help="incluir los resultados partido a partido")
+    args = parser.parse_args()
+
+    data = escribir_datos(args.destino, args.escala, args.semilla, args.partidos)
+    equipos = sum(len(grupo['clasificacion']) for categoria in data['datos'] for grupo in categoria['grupos'])
+    print(f"{args.destino}: {len(data['datos'])} categorías/fases, "
+          f"{data['metadata']['total_grupos']} grupos, {equipos} equipos")
+
+
+if __name__ == '__main__':
+    main()
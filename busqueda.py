@@ -0,0 +1,169 @@
+"""Búsqueda de equipos por nombre en todas las categorías.
+
+Los nombres se normalizan (mayúsculas, sin acentos ni puntuación, con las
+siglas unidas: "Quilmes A.C." y "QUILMES A.C" son "QUILMES AC") y se indexan
+por trigramas y por prefijos cortos de cada palabra. Una consulta cruza las
+listas de los trigramas de sus palabras y solo verifica esos candidatos, sin
+recorrer los grupos. El índice se arma una vez por versión del dataset, junto
+con la ubicación de cada equipo en cada categoría: región, grupo, posición y
+puesto de siembra en los playoffs de su zona.
+"""
+import re
+import unicodedata
+
+from clasificacion import get_clasificados_por_zona
+
+# Resultados por consulta en la barra lateral
+RESULTADOS = 8
+
+_NO_ALFANUMERICO = re.compile(r'[^0-9A-Z]+')
+
+
+def normalizar(texto):
+    """Forma canónica de un nombre para comparar: 'Quilmes A.C.' -> 'QUILMES AC'"""
+    sin_acentos = unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode('ascii')
+    palabras = _NO_ALFANUMERICO.sub(' ', sin_acentos.upper()).split()
+
+    # Unir las letras sueltas consecutivas: siglas escritas con puntos o espacios
+    unidas = []
+    sigla = ''
+    for palabra in palabras:
+        if len(palabra) == 1 and palabra.isalpha():
+            sigla += palabra
+            continue
+        if sigla:
+            unidas.append(sigla)
+            sigla = ''
+        unidas.append(palabra)
+    if sigla:
+        unidas.append(sigla)
+    return ' '.join(unidas)
+
+
+def trigramas(palabra):
+    return {palabra[i:i + 3] for i in range(len(palabra) - 2)}
+
+
+def ubicaciones(almacen):
+    """Cada equipo de cada categoría con su región, grupo, posición, récord, tantos y puesto de siembra.
+
+    Recorre las categorías, zonas y filas del almacén una sola vez; la siembra
+    sale de ``get_clasificados_por_zona`` (None si el equipo no clasifica).
+    """
+    for nombre_categoria in dict.fromkeys(almacen.categorias):
+        categoria = almacen.categoria(nombre_categoria)
+        filas_almacen = categoria.almacen
+        for zona in categoria.zonas:
+            sembrados = {
+                equipo['equipo']: equipo['posicion_playoff'] for equipo in get_clasificados_por_zona(categoria, zona)
+            }
+            for fila in categoria.filas_de_zona(zona).tolist():
+                equipo = filas_almacen.fila(fila)
+                yield {
+                    'categoria': nombre_categoria,
+                    'zona': zona,
+                    'grupo': filas_almacen.nombre_grupo_de_fila(fila),
+                    'equipo': equipo['equipo'],
+                    'posicion': equipo['posicion'],
+                    'record': f"{equipo['partidos_ganados']}-{equipo['partidos_perdidos']}",
+                    'partidos_jugados': equipo['partidos_jugados'],
+                    'partidos_ganados': equipo['partidos_ganados'],
+                    'partidos_perdidos': equipo['partidos_perdidos'],
+                    'puntos_favor': equipo['puntos_favor'],
+                    'puntos_contra': equipo['puntos_contra'],
+                    'puntos_totales': equipo['puntos_totales'],
+                    'seed': sembrados.get(equipo['equipo']),
+                }
+
+
+class IndiceBusqueda:
+    """Índice de nombres normalizados con la ubicación de cada equipo por categoría"""
+
+    def __init__(self, almacen):
+        self.claves = []        # id -> nombre normalizado
+        self.nombres = []       # id -> nombres originales (pueden variar entre categorías)
+        self.apariciones = []   # id -> ubicaciones del equipo en cada categoría
+        ids = {}  # nombre normalizado -> id
+
+        for aparicion in ubicaciones(almacen):
+            clave = normalizar(aparicion['equipo'])
+            if clave not in ids:
+                ids[clave] = len(self.claves)
+                self.claves.append(clave)
+                self.nombres.append([])
+                self.apariciones.append([])
+            identificador = ids[clave]
+            if aparicion['equipo'] not in self.nombres[identificador]:
+                self.nombres[identificador].append(aparicion['equipo'])
+            self.apariciones[identificador].append(aparicion)
+
+        # Trigramas y prefijos de 1 y 2 letras de cada palabra -> ids
+        self._trigramas = {}
+        self._prefijos = {}
+        for identificador, clave in enumerate(self.claves):
+            for palabra in clave.split():
+                for trigrama in trigramas(palabra):
+                    self._trigramas.setdefault(trigrama, set()).add(identificador)
+                for largo in (1, 2):
+                    self._prefijos.setdefault(palabra[:largo], set()).add(identificador)
+
+        self.claves = tuple(self.claves)
+        self.nombres = tuple(tuple(nombres) for nombres in self.nombres)
+        self.apariciones = tuple(tuple(apariciones) for apariciones in self.apariciones)
+
+    def _candidatos(self, palabras):
+        candidatos = None
+        for palabra in palabras:
+            if len(palabra) >= 3:
+                conjuntos = [self._trigramas.get(trigrama, set()) for trigrama in trigramas(palabra)]
+            else:
+                conjuntos = [self._prefijos.get(palabra, set())]
+            for conjunto in sorted(conjuntos, key=len):
+                candidatos = set(conjunto) if candidatos is None else candidatos & conjunto
+                if not candidatos:
+                    return set()
+        return candidatos if candidatos is not None else set()
+
+    def buscar(self, consulta, limite=RESULTADOS):
+        """Ids de los equipos cuyo nombre contiene todas las palabras de la consulta, los mejores primero.
+
+        Las palabras de una o dos letras (lo primero que se tipea) tienen que
+        ser el principio de una palabra del nombre; las más largas pueden
+        aparecer en cualquier parte. Primero la coincidencia exacta, después
+        los nombres que empiezan con la consulta, los que tienen palabras que
+        empiezan con cada palabra buscada y por último el resto; a igualdad,
+        los nombres más cortos.
+        """
+        consulta = normalizar(consulta)
+        palabras = consulta.split()
+        if not palabras:
+            return []
+
+        encontrados = []
+        for identificador in self._candidatos(palabras):
+            clave = self.claves[identificador]
+            palabras_clave = clave.split()
+            if not all(
+                palabra in clave if len(palabra) >= 3 else any(p.startswith(palabra) for p in palabras_clave)
+                for palabra in palabras
+            ):
+                continue
+            if clave == consulta:
+                orden = 0
+            elif clave.startswith(consulta):
+                orden = 1
+            elif all(any(p.startswith(palabra) for p in palabras_clave) for palabra in palabras):
+                orden = 2
+            else:
+                orden = 3
+            encontrados.append((orden, len(clave), clave, identificador))
+        encontrados.sort()
+        return [identificador for *_, identificador in encontrados[:limite]]
+
+    def resultado(self, identificador):
+        """Nombre y ubicaciones de un equipo del índice"""
+        return {
+            'nombre': self.nombres[identificador][0],
+            'variantes': self.nombres[identificador],
+            'apariciones': self.apariciones[identificador],
+        }
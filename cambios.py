@@ -0,0 +1,234 @@
+"""Feed de cambios entre dos versiones del dataset.
+
+Compara la versión anterior (el almacén publicado antes o un snapshot viejo)
+con la nueva equipo por equipo, por (categoría, grupo, equipo), y arma una
+lista de eventos: resultados nuevos, cambios de posición, equipos que entran o
+salen de un grupo, cambios de siembra y cruces de playoff que cambiaron.
+
+Antes de mirar equipos se compara una huella de cada zona (nombres de los
+grupos y sus filas de la tabla), así que solo se recorren las zonas cuyos
+datos cambiaron; esas mismas zonas son las únicas que hay que recalcular en el
+cubo (ver ``construir_cubo``), el resto se reutiliza de la versión anterior.
+
+Uso:
+    python cambios.py anterior.json nuevo.json
+"""
+import hashlib
+import sys
+
+import numpy as np
+
+from clasificacion import COLUMNAS_NUMERICAS
+from cubo import construir_zona
+
+# Tipos de evento, en el orden en que se listan dentro de cada zona
+TIPOS = {
+    'cruce': "Cruce",
+    'siembra': "Siembra",
+    'posicion': "Posición",
+    'resultado': "Resultado",
+    'correccion': "Corrección",
+    'alta': "Alta",
+    'baja': "Baja",
+}
+
+
+def huellas_zonas(almacen):
+    """Huella de los datos de cada zona: {(categoría, zona): bytes}"""
+    huellas = {}
+    tablas = {}
+    for nombre in dict.fromkeys(almacen.categorias):
+        categoria = almacen.categoria(nombre)
+        datos = categoria.almacen
+        # Una matriz por almacén (en carga perezosa, uno por categoría) con la posición y las
+        # columnas numéricas: un solo corte por zona
+        if id(datos) not in tablas:
+            tablas[id(datos)] = np.column_stack(
+                [datos.posicion] + [datos.columnas[columna] for columna in COLUMNAS_NUMERICAS]
+            ).astype(np.int64)
+        tabla = tablas[id(datos)]
+        for zona in categoria.zonas:
+            grupos = categoria.grupos_de_zona(zona)
+            filas = categoria.filas_de_zona(zona)
+            h = hashlib.blake2b(digest_size=16)
+            h.update('\0'.join(datos.grupo_nombre[g] for g in grupos.tolist()).encode('utf-8') + b'\1')
+            h.update((datos.grupo_fin[grupos] - datos.grupo_inicio[grupos]).astype(np.int64).tobytes())
+            h.update('\0'.join(datos.equipo[filas].tolist()).encode('utf-8') + b'\1')
+            h.update(tabla[filas].tobytes())
+            huellas[(nombre, zona)] = h.digest()
+    return huellas
+
+
+def zonas_cambiadas(anterior, nuevo):
+    """(categoría, zona) cuyos datos cambiaron, aparecieron o desaparecieron entre las dos versiones"""
+    huellas_anteriores, huellas_nuevas = huellas_zonas(anterior), huellas_zonas(nuevo)
+    return frozenset(
+        clave for clave in huellas_anteriores.keys() | huellas_nuevas.keys()
+        if huellas_anteriores.get(clave) != huellas_nuevas.get(clave)
+    )
+
+
+class FeedCambios:
+    """Eventos de una versión del dataset respecto de la anterior.
+
+    Cada evento es un dict con ``tipo`` (ver ``TIPOS``), ``categoria``,
+    ``zona``, ``grupo``, ``equipo`` (None en los cruces) y ``detalle``.
+    """
+
+    def __init__(self, anterior, nuevo, eventos, zonas):
+        self.version_anterior = anterior.version
+        self.version = nuevo.version
+        self.fecha_anterior = anterior.metadata.get('fecha_scraping', '')
+        self.fecha = nuevo.metadata.get('fecha_scraping', '')
+        self.eventos = eventos
+        self.zonas = zonas
+
+    def __len__(self):
+        return len(self.eventos)
+
+    def __iter__(self):
+        return iter(self.eventos)
+
+    def conteo(self):
+        """Cantidad de eventos por tipo, en el orden de ``TIPOS``"""
+        conteo = dict.fromkeys(TIPOS, 0)
+        for evento in self.eventos:
+            conteo[evento['tipo']] += 1
+        return {tipo: cantidad for tipo, cantidad in conteo.items() if cantidad}
+
+    def zonas_con_eventos(self):
+        """(categoría, zona) con al menos un evento, en orden de aparición"""
+        return list(dict.fromkeys((evento['categoria'], evento['zona']) for evento in self.eventos))
+
+
+def _equipos(almacen, nombre, zona):
+    """{(grupo, equipo): fila} de una zona, vacío si la categoría o la zona no existen"""
+    if nombre not in almacen.categorias:
+        return {}
+    categoria = almacen.categoria(nombre)
+    datos = categoria.almacen
+    equipos = {}
+    for fila in categoria.filas_de_zona(zona).tolist():
+        equipo = datos.fila(fila)
+        equipos[(datos.nombre_grupo_de_fila(fila), equipo['equipo'])] = equipo
+    return equipos
+
+
+def _zona(almacen, nombre, zona, datos_zona):
+    """Datos de la zona del cubo (``datos_zona`` si ya están armados), o None si no existe"""
+    if nombre not in almacen.categorias:
+        return None
+    categoria = almacen.categoria(nombre)
+    if zona not in categoria.zonas:
+        return None
+    if datos_zona is not None:
+        return datos_zona(nombre, zona)
+    return construir_zona(categoria, zona)
+
+
+def _record(equipo):
+    return f"{equipo['partidos_ganados']}-{equipo['partidos_perdidos']}"
+
+
+def _eventos_equipos(antes, despues):
+    for clave in list(despues) + [clave for clave in antes if clave not in despues]:
+        grupo, nombre = clave
+        viejo, nuevo = antes.get(clave), despues.get(clave)
+        if viejo is None:
+            yield 'alta', grupo, nombre, f"entra al grupo ({nuevo['posicion']}º, {_record(nuevo)})"
+            continue
+        if nuevo is None:
+            yield 'baja', grupo, nombre, f"sale del grupo (era {viejo['posicion']}º)"
+            continue
+        jugados = nuevo['partidos_jugados'] - viejo['partidos_jugados']
+        if jugados:
+            puntos = nuevo['puntos_totales'] - viejo['puntos_totales']
+            yield 'resultado', grupo, nombre, (
+                f"{jugados:+d} PJ: {_record(viejo)} → {_record(nuevo)} ({puntos:+d} pts, "
+                f"{nuevo['puntos_favor'] - viejo['puntos_favor']}-{nuevo['puntos_contra'] - viejo['puntos_contra']})"
+            )
+        elif any(viejo[columna] != nuevo[columna] for columna in COLUMNAS_NUMERICAS):
+            yield 'correccion', grupo, nombre, f"tabla corregida sin partidos nuevos ({_record(viejo)} → {_record(nuevo)})"
+        if viejo['posicion'] != nuevo['posicion']:
+            yield 'posicion', grupo, nombre, f"{viejo['posicion']}º → {nuevo['posicion']}º"
+
+
+def _siembra(zona):
+    return {} if zona is None else {
+        (equipo['zona_grupo'], equipo['equipo']): equipo['posicion_playoff'] for equipo in zona['clasificados']
+    }
+
+
+def _eventos_siembra(antes, despues):
+    for clave in list(despues) + [clave for clave in antes if clave not in despues]:
+        viejo, nuevo = antes.get(clave), despues.get(clave)
+        if viejo == nuevo:
+            continue
+        if viejo is None:
+            detalle = f"entra a playoffs como seed #{nuevo}"
+        elif nuevo is None:
+            detalle = f"queda fuera de playoffs (era seed #{viejo})"
+        else:
+            detalle = f"seed #{viejo} → #{nuevo}"
+        yield 'siembra', clave[0], clave[1], detalle
+
+
+def _cruces(zona):
+    if zona is None:
+        return {}
+    return {
+        cruce['numero']: (
+            f"{cruce['equipo_superior']['nombre']} vs {cruce['equipo_inferior']['nombre']}"
+            if cruce['equipo_inferior'] else f"{cruce['equipo_superior']['nombre']} (bye)"
+        )
+        for cruce in zona['enfrentamientos']
+    }
+
+
+def _eventos_cruces(antes, despues):
+    for numero in sorted(antes.keys() | despues.keys()):
+        viejo, nuevo = antes.get(numero), despues.get(numero)
+        if viejo != nuevo:
+            yield 'cruce', None, None, f"Cruce {numero}: {viejo or 'sin cruce'} → {nuevo or 'sin cruce'}"
+
+
+def comparar(anterior, nuevo, zonas=None, zona_anterior=None, zona_nueva=None):
+    """Feed de cambios de ``anterior`` a ``nuevo``.
+
+    ``zonas`` son las zonas cambiadas si ya se calcularon (``zonas_cambiadas``).
+    ``zona_anterior(categoría, zona)`` y ``zona_nueva(categoría, zona)``
+    devuelven los datos de la zona del cubo ya armado; sin ellos se arman solo
+    las zonas cambiadas.
+    """
+    if zonas is None:
+        zonas = zonas_cambiadas(anterior, nuevo)
+    orden = {nombre: i for i, nombre in enumerate(dict.fromkeys(list(nuevo.categorias) + list(anterior.categorias)))}
+    orden_tipos = {tipo: i for i, tipo in enumerate(TIPOS)}
+    eventos = []
+    for nombre, zona in sorted(zonas, key=lambda clave: (orden[clave[0]], clave[1])):
+        datos_anteriores = _zona(anterior, nombre, zona, zona_anterior)
+        datos_nuevos = _zona(nuevo, nombre, zona, zona_nueva)
+        de_zona = [
+            *_eventos_cruces(_cruces(datos_anteriores), _cruces(datos_nuevos)),
+            *_eventos_siembra(_siembra(datos_anteriores), _siembra(datos_nuevos)),
+            *_eventos_equipos(_equipos(anterior, nombre, zona), _equipos(nuevo, nombre, zona)),
+        ]
+        de_zona.sort(key=lambda evento: orden_tipos[evento[0]])  # Estable: conserva el orden de la tabla
+        eventos += [{
+            'tipo': tipo, 'categoria': nombre, 'zona': zona, 'grupo': grupo, 'equipo': equipo, 'detalle': detalle,
+        } for tipo, grupo, equipo, detalle in de_zona]
+    return FeedCambios(anterior, nuevo, eventos, zonas)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        print(__doc__)
+        sys.exit(1)
+    from clasificacion import AlmacenClasificacion
+
+    feed = comparar(*(AlmacenClasificacion.desde_archivo(ruta) for ruta in sys.argv[1:]))
+    print(f"{feed.fecha_anterior} → {feed.fecha}: {len(feed.zonas)} zonas cambiadas, {len(feed)} eventos: "
+          + ", ".join(f"{cantidad} {TIPOS[tipo].lower()}" for tipo, cantidad in feed.conteo().items()))
+    for evento in feed:
+        donde = " · ".join(filter(None, (evento['categoria'], evento['zona'], evento['grupo'], evento['equipo'])))
+        print(f"  [{TIPOS[evento['tipo']]}] {donde}: {evento['detalle']}")
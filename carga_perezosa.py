@@ -0,0 +1,171 @@
+"""Carga perezosa por categoría de archivos grandes del scraper.
+
+Un único recorrido del archivo (con expresiones regulares sobre el ``mmap``,
+sin parsear JSON) ubica la metadata y el rango de bytes de cada entrada de
+``datos`` junto con su categoría y fase. Los grupos de una categoría se
+decodifican recién cuando se la pide, y las categorías decodificadas se
+guardan en un LRU con un presupuesto de memoria configurable.
+
+La versión no hashea el archivo entero (eso leería todas sus páginas al
+abrirlo): sale de la fecha de modificación y el tamaño del archivo y del
+índice por categoría.
+"""
+import hashlib
+import json
+import logging
+import mmap
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from clasificacion import AlmacenClasificacion, congelar_valor
+
+logger = logging.getLogger(__name__)
+
+# Presupuesto por defecto para las categorías decodificadas en memoria
+PRESUPUESTO_BYTES = 64 * 1024 * 1024
+
+_CADENA = rb'"(?:[^"\\]|\\.)*"'
+_RE_METADATA = re.compile(rb'"metadata"\s*:\s*')
+_RE_DATOS = re.compile(rb'"datos"\s*:\s*\[')
+_RE_DATOS_VACIO = re.compile(rb'\s*\]')
+_RE_ENTRADA = re.compile(rb'\{\s*"categoria"\s*:\s*(' + _CADENA + rb')(?:\s*,\s*"fase"\s*:\s*(' + _CADENA + rb'))?')
+
+
+def version_de_indice(estado, entradas):
+    """Versión del dataset: hash corto de la fecha y el tamaño del archivo y del índice por categoría"""
+    h = hashlib.sha256(f"{estado.st_mtime_ns}:{estado.st_size}".encode())
+    h.update(json.dumps(
+        [(entrada['categoria'], entrada['fase'], entrada.get('inicio'), entrada.get('fin')) for entrada in entradas],
+        ensure_ascii=False,
+    ).encode('utf-8'))
+    return h.hexdigest()[:12]
+
+
+class CargadorPerezoso:
+    """Dataset del scraper indexado por categoría y decodificado bajo demanda.
+
+    Expone la misma interfaz que ``AlmacenClasificacion`` que usa la app
+    (``version``, ``metadata``, ``categorias``, ``fases`` y ``categoria()``),
+    pero cada categoría es un almacén propio que se arma al primer uso.
+    """
+
+    def __init__(self, ruta, presupuesto_bytes=PRESUPUESTO_BYTES):
+        self.ruta = ruta
+        self.presupuesto_bytes = presupuesto_bytes
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+
+        with open(ruta, 'rb') as f:
+            estado = os.fstat(f.fileno())
+            self._memoria = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        metadata, self._entradas = self._indexar()
+        self.version = version_de_indice(estado, self._entradas)
+        self.metadata = congelar_valor(metadata)
+        self.categorias = tuple(entrada['categoria'] for entrada in self._entradas)
+        self.fases = tuple(entrada['fase'] for entrada in self._entradas)
+
+        # Si una categoría aparece en varias fases, se usa la primera (como en el JSON)
+        self._entrada_por_categoria = {}
+        for entrada in self._entradas:
+            self._entrada_por_categoria.setdefault(entrada['categoria'], entrada)
+
+    def _indexar(self):
+        """Ubica la metadata y el rango de bytes de cada entrada de ``datos`` en una sola pasada"""
+        memoria = self._memoria
+        datos = _RE_DATOS.search(memoria)
+        if datos is None:
+            return self._indexar_completo()
+
+        metadata = {}
+        inicio_metadata = _RE_METADATA.search(memoria, 0, datos.start())
+        if inicio_metadata is not None:
+            metadata = _decodificar(memoria, inicio_metadata.end(), datos.start())
+
+        entradas = []
+        for coincidencia in _RE_ENTRADA.finditer(memoria, datos.end()):
+            fase = coincidencia.group(2)
+            entradas.append({
+                'categoria': json.loads(coincidencia.group(1)),
+                'fase': json.loads(fase) if fase is not None else None,
+                'inicio': coincidencia.start(),
+            })
+
+        # El patrón solo reconoce entradas cuya primera clave es "categoria": si las categorías
+        # encontradas no son las de la metadata (o no se encontró ninguna en un ``datos`` no
+        # vacío), el índice no es confiable y se parsea el archivo completo
+        encontradas = list(dict.fromkeys(entrada['categoria'] for entrada in entradas))
+        esperadas = metadata.get('categorias_procesadas')
+        if (esperadas is not None and encontradas != list(dict.fromkeys(esperadas))) or (
+                not entradas and not _RE_DATOS_VACIO.match(memoria, datos.end())):
+            logger.warning(
+                "Índice por categoría de %s incompleto (%d de %s categorías); se parsea el archivo completo",
+                self.ruta, len(encontradas), len(set(esperadas)) if esperadas is not None else '?',
+            )
+            return self._indexar_completo()
+
+        for actual, siguiente in zip(entradas, entradas[1:] + [None]):
+            actual['fin'] = siguiente['inicio'] if siguiente else len(memoria)
+
+        # La fase no vino inmediatamente después de la categoría: decodificar esa entrada para obtenerla
+        for entrada in entradas:
+            if entrada['fase'] is None:
+                entrada['fase'] = self._decodificar_entrada(entrada).get('fase', '')
+
+        return metadata, entradas
+
+    def _indexar_completo(self):
+        """Alternativa para archivos con otro formato: parsear todo una vez"""
+        data = json.loads(self._memoria[:].decode('utf-8'))
+        entradas = [
+            {'categoria': c['categoria'], 'fase': c.get('fase', ''), 'datos': c}
+            for c in data.get('datos', [])
+        ]
+        return data.get('metadata', {}), entradas
+
+    def _decodificar_entrada(self, entrada):
+        if 'datos' in entrada:
+            return entrada['datos']
+        valor = _decodificar(self._memoria, entrada['inicio'], entrada['fin'])
+        if not isinstance(valor, dict) or valor.get('categoria') != entrada['categoria']:
+            raise ValueError(f"Índice inválido para la categoría {entrada['categoria']}")
+        return valor
+
+    def categoria(self, nombre):
+        """Vista de una categoría, decodificándola si no está en el LRU"""
+        with self._lock:
+            if nombre in self._lru:
+                self._lru.move_to_end(nombre)
+                return self._lru[nombre].categoria(nombre)
+
+        entrada = self._entrada_por_categoria[nombre]
+        almacen = AlmacenClasificacion(
+            {'metadata': self.metadata, 'datos': [self._decodificar_entrada(entrada)]},
+            version=self.version,
+        )
+
+        with self._lock:
+            almacen = self._lru.setdefault(nombre, almacen)
+            self._lru.move_to_end(nombre)
+            self._liberar()
+            return almacen.categoria(nombre)
+
+    def _liberar(self):
+        """Descarta las categorías menos usadas hasta respetar el presupuesto (siempre queda la última)"""
+        total = sum(almacen.tamano_estimado() for almacen in self._lru.values())
+        while total > self.presupuesto_bytes and len(self._lru) > 1:
+            _, almacen = self._lru.popitem(last=False)
+            total -= almacen.tamano_estimado()
+
+    def categorias_en_memoria(self):
+        with self._lock:
+            return list(self._lru)
+
+
+def _decodificar(memoria, inicio, fin):
+    """Decodifica el primer valor JSON en memoria[inicio:fin], ignorando lo que sigue (comas, corchetes)"""
+    texto = memoria[inicio:fin].decode('utf-8')
+    valor, _ = json.JSONDecoder().raw_decode(texto)
+    return valor
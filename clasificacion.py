@@ -0,0 +1,527 @@
+import hashlib
+import json
+from collections import namedtuple
+from functools import cached_property
+from types import MappingProxyType
+
+import numpy as np
+
+from desempate import COLUMNAS_PARTIDOS, MatricesResultados, aplicar_desempate
+from lideres import IndiceLideres
+from reglas import REGLAS, claves_desempate, valores_de_criterios
+from trazas import traza
+
+# Columnas numéricas de cada fila de clasificación (mismo orden que el JSON)
+COLUMNAS_NUMERICAS = (
+    'partidos_jugados',
+    'partidos_ganados',
+    'partidos_perdidos',
+    'puntos_favor',
+    'puntos_contra',
+    'puntos_totales',
+    'racha',
+)
+
+# Puestos por grupo que entran en la clasificación a playoffs
+PUESTOS_CLASIFICACION = 3
+
+TIPOS_CLASIFICACION = ("1º puesto", "2º puesto", "3º puesto")
+
+# Tamaño del cuadro de playoffs por defecto (el de cada zona lo fija el reglamento)
+CUADRO = REGLAS.regla().cuadro
+
+# Equipos en una ronda -> (nombre, abreviatura de sus partidos, ícono)
+NOMBRES_RONDAS = {
+    64: ('Treintaidosavos de Final', 'T', '🎯'),
+    32: ('Dieciseisavos de Final', 'D', '🎯'),
+    16: ('Octavos de Final', 'O', '⚔️'),
+    8: ('Cuartos de Final', 'C', '⚡'),
+    4: ('Semifinales', 'SF', '🔥'),
+    2: ('Final', 'F', '👑'),
+}
+
+# Una ronda del cuadro: partidos como pares de textos ('Ganador P1', 'Ganador P8')
+Ronda = namedtuple('Ronda', ['nombre', 'abreviatura', 'icono', 'partidos'])
+
+# Rondas, orden de los partidos de primera ronda en el cuadro y franjas de seeds
+# (favoritos: seeds 1..favoritos; underdogs: seeds underdogs..cuadro)
+EstructuraBracket = namedtuple('EstructuraBracket', ['rondas', 'orden', 'favoritos', 'underdogs'])
+
+# Claves de cada fila materializada, en el orden del JSON
+CLAVES_FILA = ('posicion', 'equipo') + COLUMNAS_NUMERICAS
+
+# Costo aproximado en memoria de cada fila materializada en tipos nativos de Python
+BYTES_POR_FILA_NATIVA = 200
+
+# Columnas base del almacén y su tipo; todo lo demás se deriva de ellas
+ARREGLOS_BASE = {
+    'posicion': np.int32,
+    'equipo_codigo': np.int32,
+    'grupo_categoria': np.int32,
+    'grupo_zona': np.int32,
+    'grupo_inicio': np.int64,
+    'grupo_fin': np.int64,
+    **{columna: np.int32 for columna in COLUMNAS_NUMERICAS},
+    # Partidos jugados (opcionales): filas del local y del visitante y tantos de cada uno
+    'partido_local': np.int64,
+    'partido_visitante': np.int64,
+    'partido_puntos_local': np.int32,
+    'partido_puntos_visitante': np.int32,
+}
+
+# Columnas con un valor por fila, que se reordenan junto con la posición
+COLUMNAS_FILA = ('equipo_codigo',) + COLUMNAS_NUMERICAS
+
+
+def get_zona_from_group_name(group_name):
+    """Determina la zona correcta basándose en el nombre del grupo (patrones del reglamento)"""
+    return REGLAS.zona_de_grupo(group_name)
+
+
+def version_de_contenido(contenido):
+    """Versión del dataset: hash corto del contenido del archivo"""
+    return hashlib.sha256(contenido).hexdigest()[:12]
+
+
+def regla_de(categoria, zona):
+    """Regla del reglamento para una zona de una categoría (``VistaCategoria``) o solo de la zona"""
+    if categoria is None:
+        return REGLAS.regla(zona=zona)
+    return REGLAS.regla(categoria.fase, categoria.nombre, zona)
+
+
+def terceros_que_clasifican(zona, categoria=None):
+    """Cantidad de mejores terceros que clasifican según el reglamento de la zona"""
+    return regla_de(categoria, zona).cupo(PUESTOS_CLASIFICACION)
+
+
+class AlmacenClasificacion:
+    """Almacén columnar con todas las clasificaciones, construido una sola vez al cargar los datos.
+
+    Cada equipo es una fila; las filas están agrupadas por grupo y ordenadas por
+    posición dentro del grupo. Categoría, zona y grupo se guardan como códigos
+    enteros, y los índices por zona y por puesto se precalculan para que cada
+    vista sea una búsqueda y no un recorrido de todos los grupos.
+    """
+
+    def __init__(self, data, version=None):
+        if version is None:
+            version = version_de_contenido(json.dumps(data, sort_keys=True).encode('utf-8'))
+
+        categorias = []
+        fases = []
+        grupo_nombre = []
+        codigos_zona = {}
+        codigos_equipo = {}
+        arreglos = {nombre: [] for nombre in ARREGLOS_BASE}
+
+        for categoria in data.get('datos', []):
+            categoria_id = len(categorias)
+            categorias.append(categoria['categoria'])
+            fases.append(categoria.get('fase', ''))
+
+            for grupo in categoria['grupos']:
+                zona = get_zona_from_group_name(grupo['nombre'])
+                grupo_nombre.append(grupo['nombre'])
+                arreglos['grupo_categoria'].append(categoria_id)
+                arreglos['grupo_zona'].append(codigos_zona.setdefault(zona, len(codigos_zona)))
+                arreglos['grupo_inicio'].append(len(arreglos['posicion']))
+
+                filas_grupo = {}
+                for equipo in sorted(grupo['clasificacion'], key=lambda x: x['posicion']):
+                    filas_grupo.setdefault(equipo['equipo'], len(arreglos['posicion']))
+                    arreglos['posicion'].append(equipo['posicion'])
+                    arreglos['equipo_codigo'].append(codigos_equipo.setdefault(equipo['equipo'], len(codigos_equipo)))
+                    for columna in COLUMNAS_NUMERICAS:
+                        arreglos[columna].append(equipo[columna])
+
+                arreglos['grupo_fin'].append(len(arreglos['posicion']))
+
+                for partido in grupo.get('partidos', ()):
+                    for lado in ('local', 'visitante'):
+                        if partido[lado] not in filas_grupo:
+                            raise ValueError(
+                                f"Partido del grupo {grupo['nombre']} con un equipo fuera de la tabla: {partido[lado]}"
+                            )
+                        arreglos[f'partido_{lado}'].append(filas_grupo[partido[lado]])
+                    arreglos['partido_puntos_local'].append(partido['puntos_local'])
+                    arreglos['partido_puntos_visitante'].append(partido['puntos_visitante'])
+
+        self._indexar(
+            version=version,
+            metadata=data.get('metadata', {}),
+            categorias=categorias,
+            fases=fases,
+            grupo_nombre=grupo_nombre,
+            zonas=list(codigos_zona),
+            equipos=list(codigos_equipo),
+            # Con partidos, el orden dentro del grupo sale del desempate olímpico
+            arreglos=aplicar_desempate(
+                {nombre: np.array(valores, dtype=ARREGLOS_BASE[nombre]) for nombre, valores in arreglos.items()},
+                COLUMNAS_FILA,
+            ),
+        )
+
+    @classmethod
+    def desde_columnas(cls, version, metadata, categorias, fases, grupo_nombre, zonas, equipos, arreglos):
+        """Construye el almacén directamente desde sus columnas (por ejemplo, un snapshot binario)"""
+        almacen = cls.__new__(cls)
+        almacen._indexar(version, metadata, categorias, fases, grupo_nombre, zonas, equipos, arreglos)
+        return almacen
+
+    def _indexar(self, version, metadata, categorias, fases, grupo_nombre, zonas, equipos, arreglos):
+        """Guarda las columnas base y precalcula los índices derivados"""
+        self.version = version
+        self.metadata = metadata
+
+        # Tablas de strings; categoría, zona, grupo y equipo se guardan como códigos enteros
+        self.categorias = categorias
+        self.fases = fases
+        self.grupo_nombre = grupo_nombre
+        self.zonas = zonas
+        self.equipos = equipos
+
+        self.posicion = arreglos['posicion']
+        self.equipo_codigo = arreglos['equipo_codigo']
+        self.columnas = MappingProxyType({columna: arreglos[columna] for columna in COLUMNAS_NUMERICAS})
+        self.grupo_categoria = arreglos['grupo_categoria']
+        self.grupo_zona = arreglos['grupo_zona']
+        self.grupo_inicio = arreglos['grupo_inicio']
+        self.grupo_fin = arreglos['grupo_fin']
+
+        # Snapshots anteriores a los partidos no traen estas columnas
+        for columna in COLUMNAS_PARTIDOS:
+            setattr(self, columna, arreglos.get(columna, np.empty(0, dtype=ARREGLOS_BASE[columna])))
+
+        self.equipo = np.array(equipos, dtype=object)[self.equipo_codigo]
+        self.diferencia = self.columnas['puntos_favor'] - self.columnas['puntos_contra']
+
+        tamanos = self.grupo_fin - self.grupo_inicio
+        self.fila_grupo = np.repeat(np.arange(len(grupo_nombre)), tamanos)
+        self.fila_categoria = self.grupo_categoria[self.fila_grupo]
+        self.fila_zona = self.grupo_zona[self.fila_grupo]
+
+        # Fila del equipo en cada puesto (1º, 2º, 3º) de cada grupo, -1 si no existe.
+        # Se asigna en orden inverso para que gane la primera fila de cada puesto.
+        self.fila_puesto = np.full((len(grupo_nombre), PUESTOS_CLASIFICACION), -1, dtype=np.int64)
+        filas = np.flatnonzero((self.posicion >= 1) & (self.posicion <= PUESTOS_CLASIFICACION))[::-1]
+        self.fila_puesto[self.fila_grupo[filas], self.posicion[filas] - 1] = filas
+
+        # Índices precalculados por (categoría, zona)
+        self._grupos_por_zona = {}
+        for grupo, (categoria_id, zona_id) in enumerate(zip(self.grupo_categoria.tolist(), self.grupo_zona.tolist())):
+            self._grupos_por_zona.setdefault((categoria_id, zonas[zona_id]), []).append(grupo)
+        self._grupos_por_zona = {
+            clave: np.array(grupos, dtype=np.int64) for clave, grupos in self._grupos_por_zona.items()
+        }
+
+        self._zonas_por_categoria = {categoria_id: [] for categoria_id in range(len(categorias))}
+        for categoria_id, zona in self._grupos_por_zona:
+            self._zonas_por_categoria[categoria_id].append(zona)
+        for lista in self._zonas_por_categoria.values():
+            lista.sort()
+
+        # Cada puesto ordenado entre grupos con el desempate del reglamento de la zona
+        self._puestos_por_zona = {
+            (categoria_id, zona): tuple(
+                self.ordenar(self._filas_en_puesto(grupos, puesto),
+                             REGLAS.regla(self.fases[categoria_id], self.categorias[categoria_id], zona).desempate)
+                for puesto in range(PUESTOS_CLASIFICACION)
+            )
+            for (categoria_id, zona), grupos in self._grupos_por_zona.items()
+        }
+
+        # Si una categoría aparece en varias fases, la vista por nombre es la primera (como en el JSON)
+        self._vistas = {}
+        for i, nombre in enumerate(categorias):
+            self._vistas.setdefault(nombre, VistaCategoria(self, i))
+        self._congelar()
+
+    def _congelar(self):
+        """Deja el almacén de solo lectura para poder compartirlo entre sesiones"""
+        self.metadata = congelar_valor(self.metadata)
+        self.categorias = tuple(self.categorias)
+        self.fases = tuple(self.fases)
+        self.grupo_nombre = tuple(self.grupo_nombre)
+        self.zonas = tuple(self.zonas)
+        self.equipos = tuple(self.equipos)
+        self._zonas_por_categoria = MappingProxyType(
+            {categoria_id: tuple(zonas) for categoria_id, zonas in self._zonas_por_categoria.items()}
+        )
+        self._grupos_por_zona = MappingProxyType(self._grupos_por_zona)
+        self._puestos_por_zona = MappingProxyType(self._puestos_por_zona)
+        self._vistas = MappingProxyType(self._vistas)
+
+        for arreglo in _arreglos(self):
+            arreglo.flags.writeable = False
+        for vista in self._vistas.values():
+            vista.filas.flags.writeable = False
+
+    @classmethod
+    def desde_archivo(cls, ruta):
+        """Construye el almacén a partir del JSON del scraper"""
+        with open(ruta, 'rb') as f:
+            contenido = f.read()
+        return cls(json.loads(contenido.decode('utf-8')), version=version_de_contenido(contenido))
+
+    def __len__(self):
+        return len(self.equipo)
+
+    def tamano_estimado(self):
+        """Memoria aproximada del almacén en bytes (columnas más filas nativas)"""
+        columnas = sum(arreglo.nbytes for arreglo in _arreglos(self))
+        return columnas + len(self) * BYTES_POR_FILA_NATIVA
+
+    def categoria(self, nombre):
+        """Devuelve la vista de una categoría por nombre"""
+        return self._vistas[nombre]
+
+    def filas_de_grupos(self, grupos):
+        """Filas de todos los equipos de los grupos indicados"""
+        if len(grupos) == 0:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([np.arange(self.grupo_inicio[g], self.grupo_fin[g]) for g in grupos])
+
+    def _filas_en_puesto(self, grupos, puesto):
+        filas = self.fila_puesto[grupos, puesto]
+        return filas[filas >= 0]
+
+    def ordenar(self, filas, desempate):
+        """Ordena filas por los criterios de desempate de una regla (estable ante empates)"""
+        if len(filas) == 0:
+            return filas
+        return filas[np.lexsort(claves_desempate(desempate, valores_de_criterios(self), filas))]
+
+    @cached_property
+    def _filas_nativas(self):
+        # Copia en tipos nativos de Python para materializar filas sin convertir escalares de NumPy.
+        # Se arma recién al primer uso para no pagarla al abrir un snapshot.
+        return tuple(zip(
+            self.posicion.tolist(), self.equipo.tolist(),
+            *(self.columnas[columna].tolist() for columna in COLUMNAS_NUMERICAS)
+        ))
+
+    @cached_property
+    def lideres(self):
+        """Índice de top-N por métrica y alcance; se arma al primer uso y vale para esta versión"""
+        return IndiceLideres(self)
+
+    @cached_property
+    def resultados(self):
+        """Matrices de resultados por grupo (vacías para los grupos sin partidos)"""
+        return MatricesResultados(
+            self.grupo_inicio, self.grupo_fin, *(getattr(self, columna) for columna in COLUMNAS_PARTIDOS)
+        )
+
+    @cached_property
+    def siembra(self):
+        """Clasificados de cada zona según el reglamento; se calcula al primer uso para esta versión"""
+        return REGLAS.evaluar(self)
+
+    @cached_property
+    def _fila_grupo_nativa(self):
+        return tuple(self.fila_grupo.tolist())
+
+    def fila(self, fila):
+        """Materializa una fila como diccionario con el mismo formato que el JSON"""
+        return dict(zip(CLAVES_FILA, self._filas_nativas[fila]))
+
+    def nombre_grupo_de_fila(self, fila):
+        return self.grupo_nombre[self._fila_grupo_nativa[fila]]
+
+
+def congelar_valor(valor):
+    """Copia inmutable de un valor JSON (dicts de solo lectura y tuplas)"""
+    if isinstance(valor, dict):
+        return MappingProxyType({clave: congelar_valor(v) for clave, v in valor.items()})
+    if isinstance(valor, list):
+        return tuple(congelar_valor(v) for v in valor)
+    return valor
+
+
+def _arreglos(almacen):
+    """Todos los arreglos de NumPy del almacén, incluidos los de los índices"""
+    for valor in vars(almacen).values():
+        if isinstance(valor, np.ndarray):
+            yield valor
+    yield from almacen.columnas.values()
+    yield from almacen._grupos_por_zona.values()
+    for puestos in almacen._puestos_por_zona.values():
+        yield from puestos
+
+
+class VistaCategoria:
+    """Vista de solo lectura sobre una categoría del almacén"""
+
+    def __init__(self, almacen, indice):
+        self.almacen = almacen
+        self.indice = indice
+        self.nombre = almacen.categorias[indice]
+        self.fase = almacen.fases[indice]
+        self.filas = almacen.filas_de_grupos(np.flatnonzero(almacen.grupo_categoria == indice))
+
+    @property
+    def zonas(self):
+        """Zonas de la categoría, ordenadas alfabéticamente"""
+        return self.almacen._zonas_por_categoria[self.indice]
+
+    def grupos_de_zona(self, zona):
+        """Índices de los grupos de una zona"""
+        return self.almacen._grupos_por_zona.get((self.indice, zona), np.empty(0, dtype=np.int64))
+
+    def puestos_de_zona(self, zona):
+        """Filas de primeros, segundos y terceros de la zona, ya ordenadas"""
+        vacio = np.empty(0, dtype=np.int64)
+        return self.almacen._puestos_por_zona.get((self.indice, zona), (vacio,) * PUESTOS_CLASIFICACION)
+
+    def filas_de_zona(self, zona):
+        """Filas de todos los equipos de la zona"""
+        return self.almacen.filas_de_grupos(self.grupos_de_zona(zona))
+
+
+@traza
+def get_clasificados_por_zona(categoria, zona):
+    """Obtiene los clasificados de una zona en orden de siembra, según el reglamento"""
+    almacen = categoria.almacen
+    filas, puestos = almacen.siembra.clasificados(categoria.indice, zona)
+
+    # Orden jerárquico: todos los primeros, todos los segundos y los mejores terceros
+    clasificados = []
+    for i, (fila, puesto) in enumerate(zip(filas.tolist(), puestos.tolist())):
+        equipo = almacen.fila(fila)
+        equipo['zona_grupo'] = almacen.nombre_grupo_de_fila(fila)
+        equipo['tipo_clasificacion'] = tipo_clasificacion(puesto)
+        equipo['posicion_playoff'] = i + 1
+        clasificados.append(equipo)
+
+    return clasificados
+
+
+def tipo_clasificacion(puesto):
+    """'1º puesto', '2º puesto', ..."""
+    return TIPOS_CLASIFICACION[puesto - 1] if puesto <= len(TIPOS_CLASIFICACION) else f"{puesto}º puesto"
+
+
+def _lado_del_cruce(equipo):
+    return {
+        'nombre': equipo['equipo'],
+        'posicion': equipo['posicion_playoff'],
+        'zona_grupo': equipo['zona_grupo'],
+        'tipo': equipo['tipo_clasificacion'],
+        'record': f"{equipo['partidos_ganados']}-{equipo['partidos_perdidos']}",
+        'puntos_totales': equipo['puntos_totales'],
+        'puntos_favor': equipo['puntos_favor'],
+        'puntos_contra': equipo['puntos_contra'],
+        'diferencia': equipo['puntos_favor'] - equipo['puntos_contra']
+    }
+
+
+@traza
+def generate_playoff_matchups(clasificados, cuadro=CUADRO, byes=False):
+    """Genera los enfrentamientos de playoff: 1vs16, 2vs15, etc.
+
+    Sin byes hace falta el cuadro completo; con byes, los mejores sembrados
+    sin rival pasan de ronda ('equipo_inferior' en None).
+    """
+    if not clasificados or len(clasificados) > cuadro:
+        return []
+    if len(clasificados) < cuadro and not byes:
+        return []
+
+    enfrentamientos = []
+
+    # Crear enfrentamientos: 1vs16, 2vs15, 3vs14, etc.
+    for i in range(min(cuadro // 2, len(clasificados))):
+        rival = cuadro - 1 - i
+        enfrentamientos.append({
+            'numero': i + 1,
+            'equipo_superior': _lado_del_cruce(clasificados[i]),
+            'equipo_inferior': _lado_del_cruce(clasificados[rival]) if rival < len(clasificados) else None,
+        })
+
+    return enfrentamientos
+
+
+def orden_del_cuadro(partidos):
+    """Números de los partidos de primera ronda en orden de cuadro (1, 8, 4, 5, 2, 7, 3, 6 con 8)
+
+    En ese orden, los cruces de cada ronda siguiente son siempre ganadores consecutivos.
+    """
+    orden = [1]
+    while len(orden) < partidos:
+        total = 2 * len(orden) + 1
+        orden = [n for numero in orden for n in (numero, total - numero)]
+    return orden
+
+
+def estructura_bracket(cuadro):
+    """Rondas y franjas de seeds de un cuadro de eliminación directa
+
+    La primera ronda son los partidos de generate_playoff_matchups (P1 a P{cuadro/2}).
+    En cada ronda siguiente, con M partidos en la anterior, el partido k cruza a
+    los ganadores de k y 2M+1-k, igual que 1vs16 en la primera ronda. Los
+    favoritos son el primer cuarto de los seeds y los underdogs el último.
+    """
+    rondas = []
+    anterior = None
+    equipos = cuadro
+    while equipos >= 2:
+        nombre, abreviatura, icono = NOMBRES_RONDAS.get(equipos, (f"Ronda de {equipos}", f"R{equipos}-", '🎯'))
+        partidos = equipos // 2
+        if anterior is None:
+            abreviatura = 'P'
+            cruces = [(f"#{k}", f"#{equipos + 1 - k}") for k in range(1, partidos + 1)]
+        else:
+            cruces = [(f"Ganador {anterior}{k}", f"Ganador {anterior}{equipos + 1 - k}") for k in range(1, partidos + 1)]
+        rondas.append(Ronda(nombre, abreviatura, icono, cruces))
+        anterior = abreviatura
+        equipos = partidos
+
+    franja = max(1, cuadro // 4)
+    return EstructuraBracket(rondas, orden_del_cuadro(cuadro // 2), franja, cuadro - franja + 1)
+
+
+@traza
+def classify_teams_by_region(categoria, region_name):
+    """Clasifica equipos por región según el sistema FeBAMBA"""
+    almacen = categoria.almacen
+    listas = []
+
+    # Cada lista ya viene ordenada con el desempate del reglamento de la zona (MANTENER JERARQUÍA)
+    for filas in categoria.puestos_de_zona(region_name.upper()):
+        equipos = []
+        for fila in filas:
+            equipo = almacen.fila(fila)
+            equipo['zona'] = almacen.nombre_grupo_de_fila(fila)
+            equipos.append(equipo)
+        listas.append(equipos)
+
+    primeros_ordenados, segundos_ordenados, terceros_ordenados = listas
+    return primeros_ordenados, segundos_ordenados, terceros_ordenados
+
+
+def resumen_region(categoria, region_name):
+    """Cantidad de grupos, equipos e invictos de una región"""
+    almacen = categoria.almacen
+    filas = categoria.filas_de_zona(region_name.upper())
+    jugados = almacen.columnas['partidos_jugados'][filas]
+    perdidos = almacen.columnas['partidos_perdidos'][filas]
+    return {
+        'grupos': len(categoria.grupos_de_zona(region_name.upper())),
+        'equipos': len(filas),
+        'invictos': int(np.count_nonzero((perdidos == 0) & (jugados > 0))),
+    }
+
+
+def equipos_destacados(categoria, max_invictos=10):
+    """Mejor récord, mejor ataque, mejor defensa e invictos de una categoría"""
+    if len(categoria.filas) == 0:
+        return None
+
+    lideres = categoria.almacen.lideres
+    return {
+        'mejor_record': lideres.top('puntos', 1, categoria=categoria)[0],
+        'mejor_ataque': lideres.top('puntos_favor', 1, categoria=categoria)[0],
+        'mejor_defensa': lideres.top('puntos_contra', 1, categoria=categoria)[0],
+        'invictos': lideres.top('puntos', max_invictos, categoria=categoria, filtros=('invictos',)),
+    }
@@ -0,0 +1,91 @@
+"""Dimensión de clubes: los equipos de un club en todas las categorías.
+
+Un club presenta equipos en varias categorías y a veces más de uno por
+categoría ("BOCA JUNIORS A" y "BOCA JUNIORS B", "FERROCARRIL OESTE VERDE
+(A)"...). La clave del club es el nombre normalizado del buscador sin la
+letra del equipo, los colores ni la categoría al final. La dimensión se arma
+en una sola pasada por versión del dataset y después cada club es una
+búsqueda en un diccionario, con sus equipos por categoría y los totales
+ya sumados.
+"""
+import re
+
+from busqueda import normalizar, ubicaciones
+
+# Palabras finales que distinguen equipos de un mismo club
+COLORES = {
+    'AZUL', 'BLANCO', 'BLANCA', 'ROJO', 'ROJA', 'NEGRO', 'NEGRA', 'VERDE', 'CELESTE',
+    'AMARILLO', 'AMARILLA', 'NARANJA', 'VIOLETA', 'GRIS', 'BORDO', 'DORADO', 'ROSA',
+}
+_CATEGORIA = re.compile(r'U\d{1,2}')
+
+# Letra del equipo entre comillas o paréntesis: 'A.F.A.L.P. "A"', 'CLUB GEI AZUL (A)'
+_LETRA_MARCADA = re.compile(r'''\s*["'(]\s*[A-Ea-e]\s*["')]\s*$''')
+
+TOTALES = ('partidos_jugados', 'partidos_ganados', 'partidos_perdidos', 'puntos_favor', 'puntos_contra')
+
+
+def clave_club(nombre):
+    """Clave del club de un equipo: 'FERROCARRIL OESTE VERDE (A)' -> 'FERROCARRIL OESTE'"""
+    palabras = normalizar(_LETRA_MARCADA.sub('', nombre)).split()
+    # La letra del equipo queda sola al final (las siglas ya están unidas: 'QUILMES AC')
+    while len(palabras) > 1 and (
+        palabras[-1] in COLORES or _CATEGORIA.fullmatch(palabras[-1])
+        or (len(palabras[-1]) == 1 and palabras[-1].isalpha())
+    ):
+        palabras.pop()
+    return ' '.join(palabras)
+
+
+class DimensionClubes:
+    """Equipos, ubicación y totales de cada club, precalculados para una versión del almacén"""
+
+    def __init__(self, almacen):
+        self.categorias = tuple(dict.fromkeys(almacen.categorias))
+        self._clubes = {}
+        self._club_de_equipo = {}
+
+        for aparicion in ubicaciones(almacen):
+            clave = self._club_de_equipo.get(aparicion['equipo'])
+            if clave is None:
+                clave = self._club_de_equipo[aparicion['equipo']] = clave_club(aparicion['equipo'])
+            club = self._clubes.get(clave)
+            if club is None:
+                club = self._clubes[clave] = {
+                    'nombre': clave,
+                    'equipos': [],
+                    'por_categoria': {},
+                    'totales': dict.fromkeys(TOTALES, 0),
+                }
+            club['equipos'].append(aparicion)
+            club['por_categoria'].setdefault(aparicion['categoria'], []).append(aparicion)
+            for columna in TOTALES:
+                club['totales'][columna] += aparicion[columna]
+
+        for club in self._clubes.values():
+            totales = club['totales']
+            totales['diferencia'] = totales['puntos_favor'] - totales['puntos_contra']
+            totales['equipos'] = len(club['equipos'])
+            totales['categorias'] = len(club['por_categoria'])
+            totales['clasificados'] = sum(1 for equipo in club['equipos'] if equipo['seed'] is not None)
+            club['equipos'] = tuple(club['equipos'])
+            club['por_categoria'] = {
+                categoria: tuple(club['por_categoria'][categoria])
+                for categoria in self.categorias if categoria in club['por_categoria']
+            }
+
+        self.nombres = tuple(sorted(self._clubes))
+
+    def __len__(self):
+        return len(self._clubes)
+
+    def __contains__(self, clave):
+        return clave in self._clubes
+
+    def club(self, clave):
+        """Equipos por categoría y totales de un club (None si no existe)"""
+        return self._clubes.get(clave)
+
+    def club_de_equipo(self, nombre_equipo):
+        """Clave del club de un equipo del dataset, o la que le correspondería si no está"""
+        return self._club_de_equipo.get(nombre_equipo) or clave_club(nombre_equipo)
@@ -0,0 +1,62 @@
+"""Cubo precalculado de clasificaciones: categoría × zona.
+
+Para cada zona de una categoría guarda las listas de primeros, segundos y
+terceros, los clasificados sembrados según el reglamento, los cruces de playoff y el resumen de
+la región; para la categoría, los equipos destacados. Se arma una sola vez por
+versión del dataset y se comparte entre todas las sesiones, así que las
+páginas solo leen del cubo. Sus valores son compartidos: no deben modificarse.
+"""
+from clasificacion import (
+    classify_teams_by_region,
+    equipos_destacados,
+    generate_playoff_matchups,
+    get_clasificados_por_zona,
+    regla_de,
+    resumen_region,
+)
+
+
+def construir_zona(categoria, zona):
+    """Clasificación, siembra, cruces, resumen y regla de una zona"""
+    primeros, segundos, terceros = classify_teams_by_region(categoria, zona)
+    clasificados = get_clasificados_por_zona(categoria, zona)
+    regla = regla_de(categoria, zona)
+    return {
+        'primeros': primeros,
+        'segundos': segundos,
+        'terceros': terceros,
+        'clasificados': clasificados,
+        'enfrentamientos': generate_playoff_matchups(clasificados, regla.cuadro, regla.byes),
+        'resumen': resumen_region(categoria, zona),
+        'regla': regla,
+    }
+
+
+def construir_cubo(categoria, anterior=None, zonas_cambiadas=()):
+    """Cubo completo de una categoría: {'zonas': {zona: ...}, 'destacados': ...}
+
+    Con el cubo ``anterior`` de la misma categoría, solo se recalculan las zonas
+    incluidas en ``zonas_cambiadas`` (pares (categoría, zona), ver
+    ``cambios.zonas_cambiadas``); las demás se reutilizan tal cual.
+    """
+    if anterior is None:
+        return {
+            'zonas': {zona: construir_zona(categoria, zona) for zona in categoria.zonas},
+            'destacados': equipos_destacados(categoria),
+        }
+    zonas = {
+        zona: anterior['zonas'][zona]
+        if zona in anterior['zonas'] and (categoria.nombre, zona) not in zonas_cambiadas
+        else construir_zona(categoria, zona)
+        for zona in categoria.zonas
+    }
+    sin_cambios = not any(nombre == categoria.nombre for nombre, _ in zonas_cambiadas)
+    return {
+        'zonas': zonas,
+        'destacados': anterior['destacados'] if sin_cambios else equipos_destacados(categoria),
+    }
+
+
+def construir_cubo_completo(almacen):
+    """Cubo de todas las categorías del almacén: {categoría: cubo}"""
+    return {nombre: construir_cubo(almacen.categoria(nombre)) for nombre in dict.fromkeys(almacen.categorias)}
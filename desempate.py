@@ -0,0 +1,179 @@
+"""Desempate olímpico dentro de cada grupo, con los resultados partido a partido.
+
+Con los partidos de un grupo se arman dos matrices por grupo: los puntos de
+clasificación que sacó cada equipo contra cada rival y los tantos que le
+convirtió. Los equipos igualados en puntos se ordenan con una mini-liga entre
+ellos (reglamento FIBA):
+
+a) puntos de clasificación en los partidos entre los empatados,
+b) diferencia de tantos en esos partidos,
+c) tantos a favor en esos partidos,
+d) diferencia de tantos en todo el grupo,
+e) tantos a favor en todo el grupo.
+
+En cuanto un criterio separa a los empatados, cada subgrupo que sigue
+igualado vuelve a empezar desde a) con los partidos entre sus integrantes
+solamente. Si nada los separa queda el orden publicado por la federación.
+
+Solo se recorren en Python los bloques de equipos empatados; todas las
+matrices se construyen de una vez en un único arreglo plano, así que
+reordenar los 125 grupos del dataset lleva unos pocos milisegundos.
+"""
+import numpy as np
+
+# Sistema de puntos FIBA: 2 por victoria, 1 por derrota
+PUNTOS_VICTORIA = 2
+PUNTOS_DERROTA = 1
+
+# Criterios dentro de un grupo, para mostrar en la app
+DESCRIPCION = "Puntos → Enfrentamiento directo (mini-liga) → Diferencia → Puntos a favor"
+
+# Columnas de cada partido en el almacén
+COLUMNAS_PARTIDOS = ('partido_local', 'partido_visitante', 'partido_puntos_local', 'partido_puntos_visitante')
+
+
+class MatricesResultados:
+    """Matrices de resultados de todos los grupos en dos arreglos planos.
+
+    Para el grupo g, con n equipos en las filas grupo_inicio[g]..grupo_fin[g]
+    del almacén, ``puntos(g)[i, j]`` son los puntos de clasificación que el
+    i-ésimo equipo sacó contra el j-ésimo y ``tantos(g)[i, j]`` los tantos que
+    le convirtió, sumando ida y vuelta.
+    """
+
+    def __init__(self, grupo_inicio, grupo_fin, local, visitante, puntos_local, puntos_visitante):
+        self.grupo_inicio = grupo_inicio
+        tamanos = (grupo_fin - grupo_inicio).astype(np.int64)
+        self.desplazamiento = np.zeros(len(tamanos) + 1, dtype=np.int64)
+        np.cumsum(tamanos * tamanos, out=self.desplazamiento[1:])
+        self.tamanos = tamanos
+        self.partidos_por_grupo = np.zeros(len(tamanos), dtype=np.int64)
+
+        self._puntos = np.zeros(self.desplazamiento[-1], dtype=np.int32)
+        self._tantos = np.zeros(self.desplazamiento[-1], dtype=np.int32)
+        if len(local) == 0:
+            return
+
+        # Grupo de cada partido: el de la fila del local (las dos filas están en el mismo grupo)
+        grupo = np.searchsorted(grupo_inicio, local, side='right') - 1
+        i = local - grupo_inicio[grupo]
+        j = visitante - grupo_inicio[grupo]
+        base = self.desplazamiento[grupo]
+        n = tamanos[grupo]
+        gana_local = puntos_local > puntos_visitante
+
+        np.add.at(self._tantos, base + i * n + j, puntos_local)
+        np.add.at(self._tantos, base + j * n + i, puntos_visitante)
+        np.add.at(self._puntos, base + i * n + j, np.where(gana_local, PUNTOS_VICTORIA, PUNTOS_DERROTA))
+        np.add.at(self._puntos, base + j * n + i, np.where(gana_local, PUNTOS_DERROTA, PUNTOS_VICTORIA))
+        self.partidos_por_grupo = np.bincount(grupo, minlength=len(tamanos))
+
+    def _matriz(self, plano, grupo):
+        n = int(self.tamanos[grupo])
+        inicio = int(self.desplazamiento[grupo])
+        return plano[inicio:inicio + n * n].reshape(n, n)
+
+    def puntos(self, grupo):
+        return self._matriz(self._puntos, grupo)
+
+    def tantos(self, grupo):
+        return self._matriz(self._tantos, grupo)
+
+    def enfrentamiento(self, fila_a, fila_b):
+        """(puntos, tantos a favor, tantos en contra) de la fila a contra la fila b del mismo grupo"""
+        grupo = int(np.searchsorted(self.grupo_inicio, fila_a, side='right') - 1)
+        i, j = fila_a - int(self.grupo_inicio[grupo]), fila_b - int(self.grupo_inicio[grupo])
+        puntos, tantos = self.puntos(grupo), self.tantos(grupo)
+        return int(puntos[i, j]), int(tantos[i, j]), int(tantos[j, i])
+
+
+def _separar(equipos, valores, desempatar):
+    """Ordena por valor (mayor primero, estable) y desempata cada tramo que sigue igualado"""
+    orden = sorted(range(len(equipos)), key=lambda k: -valores[k])
+    resultado = []
+    inicio = 0
+    while inicio < len(orden):
+        fin = inicio + 1
+        while fin < len(orden) and valores[orden[fin]] == valores[orden[inicio]]:
+            fin += 1
+        tramo = [equipos[k] for k in orden[inicio:fin]]
+        resultado += desempatar(tramo) if len(tramo) > 1 else tramo
+        inicio = fin
+    return resultado
+
+
+def mini_liga(equipos, puntos, tantos, diferencia, favor):
+    """Orden de equipos igualados en puntos (índices locales del grupo, en el orden publicado)"""
+    if len(equipos) < 2:
+        return list(equipos)
+
+    def desempatar(tramo):
+        return mini_liga(tramo, puntos, tantos, diferencia, favor)
+
+    entre = np.ix_(equipos, equipos)
+    tantos_entre = tantos[entre]
+    a_favor = tantos_entre.sum(axis=1)
+    criterios = (
+        puntos[entre].sum(axis=1).tolist(),       # a) puntos entre los empatados
+        (a_favor - tantos_entre.sum(axis=0)).tolist(),  # b) diferencia entre los empatados
+        a_favor.tolist(),                         # c) tantos a favor entre los empatados
+        [diferencia[e] for e in equipos],         # d) diferencia en todo el grupo
+        [favor[e] for e in equipos],              # e) tantos a favor en todo el grupo
+    )
+    for valores in criterios:
+        if min(valores) != max(valores):
+            return _separar(list(equipos), valores, desempatar)
+    return list(equipos)
+
+
+def orden_olimpico(inicio, fin, puntos_totales, diferencia, favor, matrices, grupo):
+    """Filas del grupo en el orden olímpico; las filas vienen en el orden publicado"""
+    filas = list(range(fin - inicio))
+    puntos_grupo = puntos_totales[inicio:fin].tolist()
+    diferencia_grupo = diferencia[inicio:fin].tolist()
+    favor_grupo = favor[inicio:fin].tolist()
+    puntos, tantos = matrices.puntos(grupo), matrices.tantos(grupo)
+
+    def desempatar(tramo):
+        return mini_liga(tramo, puntos, tantos, diferencia_grupo, favor_grupo)
+
+    return [inicio + fila for fila in _separar(filas, puntos_grupo, desempatar)]
+
+
+def aplicar_desempate(arreglos, columnas_fila):
+    """Reordena las filas de los grupos con partidos según el desempate olímpico.
+
+    ``arreglos`` son las columnas base del almacén, con las filas de cada grupo
+    en el orden publicado, y ``columnas_fila`` las que tienen un valor por
+    fila además de la posición. Devuelve las columnas con las filas de esos grupos
+    reordenadas, la posición recalculada y las filas de los partidos
+    actualizadas; los grupos sin partidos quedan como vinieron.
+    """
+    inicio, fin = arreglos['grupo_inicio'], arreglos['grupo_fin']
+    matrices = MatricesResultados(
+        inicio, fin, *(arreglos[columna] for columna in COLUMNAS_PARTIDOS)
+    )
+    grupos = np.flatnonzero(matrices.partidos_por_grupo)
+    if len(grupos) == 0:
+        return arreglos
+
+    puntos_totales = arreglos['puntos_totales']
+    diferencia = arreglos['puntos_favor'].astype(np.int64) - arreglos['puntos_contra']
+    favor = arreglos['puntos_favor']
+
+    permutacion = np.arange(len(arreglos['posicion']))
+    posicion = arreglos['posicion'].copy()
+    for grupo in grupos.tolist():
+        a, b = int(inicio[grupo]), int(fin[grupo])
+        permutacion[a:b] = orden_olimpico(a, b, puntos_totales, diferencia, favor, matrices, grupo)
+        posicion[a:b] = np.arange(1, b - a + 1)
+
+    nueva_fila = np.empty_like(permutacion)
+    nueva_fila[permutacion] = np.arange(len(permutacion))
+    resultado = dict(arreglos)
+    for nombre in columnas_fila:
+        resultado[nombre] = arreglos[nombre][permutacion]
+    resultado['posicion'] = posicion
+    resultado['partido_local'] = nueva_fila[arreglos['partido_local']].astype(arreglos['partido_local'].dtype)
+    resultado['partido_visitante'] = nueva_fila[arreglos['partido_visitante']].astype(arreglos['partido_visitante'].dtype)
+    return resultado
@@ -0,0 +1,343 @@
+"""Pre-renderizado de las páginas de clasificación y playoffs como HTML estático.
+
+Genera un directorio que se puede servir desde cualquier servidor de archivos
+o CDN: un índice de categorías, el resumen de cada categoría y, por cada zona,
+la página de clasificación y la del bracket de playoffs, todas con la misma
+hoja de estilos que la app. Las páginas se renderizan en un pool de procesos.
+
+Cada página tiene una huella de sus entradas (las filas de su categoría o
+zona, la regla de cada zona, las plantillas y el CSS) guardada en un
+manifiesto; en las corridas siguientes solo se regeneran las páginas cuya
+huella cambió y se borran las que ya no corresponden a ninguna categoría o
+zona.
+
+Uso:
+    python estatico.py basketball_complete_data.json salida/ [--procesos N] [--forzar]
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+
+from clasificacion import COLUMNAS_NUMERICAS, AlmacenClasificacion, estructura_bracket, regla_de, terceros_que_clasifican
+from cubo import construir_cubo, construir_zona
+from estilos import ARCHIVO_CSS, CSS, get_team_seed_class, publicar_css
+from snapshot import abrir_snapshot, snapshot_vigente
+from tablas import tabla_equipos
+
+# Cambiar al modificar las plantillas: invalida todas las páginas generadas
+VERSION_PLANTILLAS = 4
+
+MANIFIESTO = 'manifiesto.json'
+
+# Almacén de cada proceso del pool, cargado una vez en el inicializador
+_almacen = None
+
+
+def cargar(ruta):
+    """Almacén completo desde el snapshot si está al día o desde el JSON"""
+    snapshot = snapshot_vigente(ruta)
+    if snapshot:
+        return abrir_snapshot(snapshot)
+    return AlmacenClasificacion.desde_archivo(ruta)
+
+
+def slug(texto):
+    """Nombre de archivo seguro para una categoría o zona"""
+    ascii_ = unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', '-', ascii_.lower()).strip('-')
+
+
+# --- Plantillas ---
+
+def _pagina(titulo, cuerpo, raiz):
+    return f"""<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{html.escape(titulo)}</title>
+<link rel="stylesheet" href="{raiz}{ARCHIVO_CSS}">
+</head>
+<body>
+<div class="main-header">
+    <h1>🏀 COPA FeBAMBA - CLASIFICACIONES Y PLAYOFFS</h1>
+    <p>Sistema completo de clasificación y generación de playoffs</p>
+</div>
+{cuerpo}
+</body>
+</html>
+"""
+
+
+def _encabezado_categoria(categoria, raiz):
+    return f"""<p><a href="{raiz}index.html">⬅️ Categorías</a></p>
+<div class="categoria-header">
+    <h2>{html.escape(categoria.nombre)} - {html.escape(categoria.fase)}</h2>
+</div>
+<div class="warning-banner">
+    ⚠️ CLASIFICACIONES OFICIALES - SISTEMA OLÍMPICO DE DESEMPATE ⚠️
+</div>"""
+
+
+def _tabla(equipos, titulo, cupos=None):
+    if not equipos:
+        return f"<p>No hay datos para {html.escape(titulo)}</p>"
+    return f"<h3>{html.escape(titulo)}</h3>\n{tabla_equipos(equipos, cupos)}"
+
+
+def pagina_indice(almacen):
+    enlaces = "\n".join(
+        f'<li><a href="{slug(nombre)}/index.html">{html.escape(nombre)}</a></li>'
+        for nombre in dict.fromkeys(almacen.categorias)
+    )
+    fecha = html.escape(str(almacen.metadata.get('fecha_scraping', '')))
+    cuerpo = f"""<h2>Categorías</h2>
+<ul>
+{enlaces}
+</ul>
+<p>Última actualización: {fecha}</p>"""
+    return _pagina("Copa FeBAMBA", cuerpo, "")
+
+
+def pagina_resumen(categoria):
+    cubo = construir_cubo(categoria)
+    regiones = []
+    for zona, datos in cubo['zonas'].items():
+        resumen = datos['resumen']
+        regiones.append(
+            f"""<div class="metric-card">
+    <h3><a href="{slug(zona)}.html">🏀 {html.escape(zona)}</a></h3>
+    <p>{resumen['grupos']} zonas • {resumen['equipos']} equipos • 🏆 {resumen['invictos']} invictos</p>
+    <p><a href="{slug(zona)}-playoffs.html">🏆 Ver Playoffs</a></p>
+</div>"""
+        )
+
+    destacados = cubo['destacados']
+    bloque_destacados = ""
+    if destacados is not None:
+        record = destacados['mejor_record']
+        ataque = destacados['mejor_ataque']
+        defensa = destacados['mejor_defensa']
+        invictos = "\n".join(
+            f"<li><b>{html.escape(e['equipo'])}</b> ({html.escape(e['zona'])}) "
+            f"{e['partidos_ganados']}-0 • {e['puntos_totales']} pts • {e['diferencia']:+d}</li>"
+            for e in destacados['invictos']
+        )
+        bloque_destacados = f"""<h3>🏆 Equipos Destacados</h3>
+<div class="zona-stats">
+    <p><b>🥇 Mejor Récord:</b> {html.escape(record['equipo'])} ({html.escape(record['zona'])})
+    {record['partidos_ganados']}-{record['partidos_perdidos']} ({record['puntos_totales']} pts)</p>
+    <p><b>⚡ Mejor Ataque:</b> {html.escape(ataque['equipo'])} ({html.escape(ataque['zona'])})
+    {ataque['puntos_favor']} puntos a favor</p>
+    <p><b>🛡️ Mejor Defensa:</b> {html.escape(defensa['equipo'])} ({html.escape(defensa['zona'])})
+    {defensa['puntos_contra']} puntos en contra</p>
+</div>
+<h3>🏆 Equipos Invictos</h3>
+<ul>
+{invictos}
+</ul>"""
+
+    cuerpo = f"""{_encabezado_categoria(categoria, "../")}
+<h2>📊 Resumen General por Regiones</h2>
+{chr(10).join(regiones)}
+{bloque_destacados}"""
+    return _pagina(f"{categoria.nombre} - Resumen", cuerpo, "../")
+
+
+def pagina_zona(categoria, zona, datos):
+    cupos = terceros_que_clasifican(zona, categoria)
+    cuerpo = f"""{_encabezado_categoria(categoria, "../")}
+<h2>📍 REGIÓN {html.escape(zona)}</h2>
+<p><a href="{slug(zona)}-playoffs.html">🏆 Ver Playoffs</a></p>
+{_tabla(datos['primeros'], "🥇 Primeros Lugares (Clasificados Directos)")}
+{_tabla(datos['segundos'], "🥈 Segundos Lugares (Clasificados Directos)")}
+{_tabla(datos['terceros'], f"🥉 Mejores Terceros ({cupos} clasifican)", cupos)}"""
+    return _pagina(f"{categoria.nombre} - {zona}", cuerpo, "../")
+
+
+def _equipo_bracket(equipo):
+    if equipo is None:
+        return '<div class="bracket-team"><div class="team-info"><span class="team-name">Bye: pasa de ronda</span></div></div>'
+    return f"""<div class="bracket-team {get_team_seed_class(equipo['posicion'])}">
+    <span class="team-seed">{equipo['posicion']}</span>
+    <div class="team-info">
+        <span class="team-name">{html.escape(equipo['nombre'])}</span>
+        <span class="team-details">{equipo['record']} • {equipo['puntos_totales']} pts • {html.escape(equipo['zona_grupo'])}</span>
+    </div>
+</div>"""
+
+
+def pagina_playoffs(categoria, zona, datos):
+    enfrentamientos = datos['enfrentamientos']
+    if enfrentamientos:
+        partidos = "\n".join(
+            f"""<div class="bracket-game">
+    <div class="game-header">Partido {enf['numero']}</div>
+    {_equipo_bracket(enf['equipo_superior'])}
+    <div class="bracket-vs">VS</div>
+    {_equipo_bracket(enf['equipo_inferior'])}
+</div>"""
+            for enf in enfrentamientos
+        )
+        primera, *siguientes = estructura_bracket(datos['regla'].cuadro).rondas
+        rondas = "\n".join(
+            f"""<div class="round-title">{ronda.icono} {ronda.nombre}</div>
+<div class="future-round">{" • ".join(f"{equipo1} vs {equipo2}" for equipo1, equipo2 in ronda.partidos)}</div>"""
+            for ronda in siguientes
+        )
+        bracket = f"""<div class="bracket-container">
+<div class="round-title">{primera.icono} {primera.nombre}</div>
+{partidos}
+{rondas}
+<div class="champion-spot">👑 CAMPEÓN ZONA {html.escape(zona)}</div>
+</div>"""
+    else:
+        bracket = (f"<p>⚠️ No hay suficientes equipos clasificados en {html.escape(zona)} para generar "
+                   f"playoffs completos ({len(datos['clasificados'])}/{datos['regla'].cuadro})</p>")
+
+    cuerpo = f"""{_encabezado_categoria(categoria, "../")}
+<div class="zona-playoff-header">
+    <h3>🏀 ZONA {html.escape(zona)} - PLAYOFFS</h3>
+</div>
+<p><a href="{slug(zona)}.html">📊 Ver Clasificación</a></p>
+{bracket}
+{_tabla([dict(e, zona=e['zona_grupo']) for e in datos['clasificados']], "📋 Clasificados")}"""
+    return _pagina(f"{categoria.nombre} - {zona} - Playoffs", cuerpo, "../")
+
+
+# --- Tareas y huellas ---
+
+def _tareas(almacen):
+    """Páginas a generar: (clave, categoría, zona, archivos)"""
+    tareas = [('indice', None, None, ['index.html'])]
+    for nombre in dict.fromkeys(almacen.categorias):
+        directorio = slug(nombre)
+        tareas.append((f'resumen/{nombre}', nombre, None, [f'{directorio}/index.html']))
+        for zona in almacen.categoria(nombre).zonas:
+            archivos = [f'{directorio}/{slug(zona)}.html', f'{directorio}/{slug(zona)}-playoffs.html']
+            tareas.append((f'zona/{nombre}/{zona}', nombre, zona, archivos))
+    return tareas
+
+
+def _huella(almacen, nombre, zona):
+    """Hash de todo lo que entra en una página: filas, nombres de grupos, reglas de las zonas, plantillas y CSS"""
+    h = hashlib.sha256()
+    h.update(f'{VERSION_PLANTILLAS}\0'.encode())
+    h.update(CSS.encode('utf-8'))
+    if nombre is None:
+        h.update(json.dumps([list(dict.fromkeys(almacen.categorias)), str(almacen.metadata.get('fecha_scraping', ''))],
+                            ensure_ascii=False).encode('utf-8'))
+        return h.hexdigest()
+
+    categoria = almacen.categoria(nombre)
+    if zona is None:
+        filas = categoria.filas
+    else:
+        filas = categoria.filas_de_zona(zona)
+    grupos = sorted(set(almacen.grupo_nombre[g] for g in almacen.fila_grupo[filas].tolist()))
+    # Cupos, cuadro, byes y desempate: cambiar el reglamento cambia la siembra y los textos
+    reglas = [list(regla_de(categoria, z)) for z in (categoria.zonas if zona is None else (zona,))]
+    h.update(json.dumps([nombre, categoria.fase, zona, grupos, almacen.equipo[filas].tolist(), reglas],
+                        ensure_ascii=False).encode('utf-8'))
+    h.update(almacen.posicion[filas].tobytes())
+    for columna in COLUMNAS_NUMERICAS:
+        h.update(almacen.columnas[columna][filas].tobytes())
+    return h.hexdigest()
+
+
+def _escribir(ruta, contenido):
+    """Escritura atómica: nunca se sirve una página a medio escribir"""
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    temporal = ruta + '.tmp'
+    with open(temporal, 'w', encoding='utf-8') as f:
+        f.write(contenido)
+    os.replace(temporal, ruta)
+
+
+def _iniciar_trabajador(ruta):
+    global _almacen
+    _almacen = cargar(ruta)
+
+
+def _renderizar(nombre, zona, archivos, destino, almacen=None):
+    """Renderiza y escribe las páginas de una tarea"""
+    almacen = almacen or _almacen
+    if nombre is None:
+        paginas = [pagina_indice(almacen)]
+    else:
+        categoria = almacen.categoria(nombre)
+        if zona is None:
+            paginas = [pagina_resumen(categoria)]
+        else:
+            datos = construir_zona(categoria, zona)
+            paginas = [pagina_zona(categoria, zona, datos), pagina_playoffs(categoria, zona, datos)]
+
+    for archivo, contenido in zip(archivos, paginas):
+        _escribir(os.path.join(destino, archivo), contenido)
+    return archivos
+
+
+def generar_sitio(ruta_datos, destino, procesos=None, forzar=False):
+    """Genera o actualiza el sitio estático. Devuelve {'generadas', 'sin_cambios', 'eliminadas'}"""
+    almacen = cargar(ruta_datos)
+    ruta_manifiesto = os.path.join(destino, MANIFIESTO)
+    try:
+        with open(ruta_manifiesto, 'r', encoding='utf-8') as f:
+            anterior = json.load(f)
+    except (OSError, ValueError):
+        anterior = {}
+
+    manifiesto = {}
+    pendientes = []
+    for clave, nombre, zona, archivos in _tareas(almacen):
+        huella = _huella(almacen, nombre, zona)
+        manifiesto[clave] = {'huella': huella, 'archivos': archivos}
+        previa = anterior.get(clave)
+        vigente = (
+            not forzar and previa is not None and previa['huella'] == huella
+            and all(os.path.exists(os.path.join(destino, archivo)) for archivo in archivos)
+        )
+        if not vigente:
+            pendientes.append((nombre, zona, archivos))
+
+    publicar_css(destino)
+
+    generadas = []
+    if procesos == 1 or len(pendientes) <= 1:
+        for nombre, zona, archivos in pendientes:
+            generadas += _renderizar(nombre, zona, archivos, destino, almacen)
+    elif pendientes:
+        with ProcessPoolExecutor(procesos, initializer=_iniciar_trabajador, initargs=(ruta_datos,)) as pool:
+            futuros = [pool.submit(_renderizar, nombre, zona, archivos, destino) for nombre, zona, archivos in pendientes]
+            for futuro in futuros:
+                generadas += futuro.result()
+
+    # Páginas de categorías o zonas que ya no existen
+    vigentes = {archivo for entrada in manifiesto.values() for archivo in entrada['archivos']}
+    eliminadas = []
+    for entrada in anterior.values():
+        for archivo in entrada['archivos']:
+            if archivo not in vigentes and os.path.exists(os.path.join(destino, archivo)):
+                os.remove(os.path.join(destino, archivo))
+                eliminadas.append(archivo)
+
+    _escribir(ruta_manifiesto, json.dumps(manifiesto, ensure_ascii=False, indent=1))
+    total = sum(len(entrada['archivos']) for entrada in manifiesto.values())
+    return {'generadas': generadas, 'sin_cambios': total - len(generadas), 'eliminadas': eliminadas}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('datos')
+    parser.add_argument('destino')
+    parser.add_argument('--procesos', type=int, default=None)
+    parser.add_argument('--forzar', action='store_true', help="regenerar todas las páginas")
+    args = parser.parse_args()
+    resultado = generar_sitio(args.datos, args.destino, args.procesos, args.forzar)
+    print(f"{len(resultado['generadas'])} páginas generadas, {resultado['sin_cambios']} sin cambios, "
+          f"{len(resultado['eliminadas'])} eliminadas")
@@ -0,0 +1,430 @@
+"""Estilos compartidos por la app de Streamlit y las páginas estáticas.
+
+``CSS`` es la fuente; la app y el sitio estático sirven la versión minificada
+como archivo aparte (``static/estilos.css``), que el navegador descarga una
+vez y cachea, en lugar de reenviar el bloque ``<style>`` en cada rerun.
+"""
+import os
+import re
+
+from clasificacion import version_de_contenido
+
+# Carpeta que Streamlit sirve en /app/static con server.enableStaticServing
+DIRECTORIO_ESTATICO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+ARCHIVO_CSS = 'estilos.css'
+
+CSS = """
+.main-header {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    padding: 2rem;
+    border-radius: 10px;
+    color: white;
+    text-align: center;
+    margin-bottom: 2rem;
+}
+
+.warning-banner {
+    background: linear-gradient(135deg, #f39c12, #e67e22);
+    color: white;
+    padding: 1rem;
+    border-radius: 10px;
+    text-align: center;
+    font-weight: bold;
+    margin-bottom: 2rem;
+}
+
+.categoria-header {
+    background: linear-gradient(135deg, #2c3e50, #3498db);
+    color: white;
+    padding: 1rem;
+    border-radius: 10px 10px 0 0;
+    text-align: center;
+    font-weight: bold;
+}
+
+.playoff-header {
+    background: linear-gradient(135deg, #e74c3c, #c0392b);
+    color: white;
+    padding: 1rem;
+    border-radius: 10px 10px 0 0;
+    text-align: center;
+    font-weight: bold;
+}
+
+.zona-playoff-header {
+    background: linear-gradient(135deg, #8e44ad, #9b59b6);
+    color: white;
+    padding: 1rem;
+    border-radius: 10px;
+    text-align: center;
+    font-weight: bold;
+    margin: 1rem 0;
+}
+
+.clasificado-directo {
+    background-color: #d4edda !important;
+}
+
+.playoff-tercero {
+    background-color: #fff3cd !important;
+}
+
+.eliminado {
+    background-color: #f8d7da !important;
+    opacity: 0.7;
+}
+
+.invicto {
+    background-color: #e8f5e8 !important;
+    border-left: 4px solid #28a745 !important;
+}
+
+.playoff-card {
+    background: white;
+    border: 2px solid #e74c3c;
+    border-radius: 10px;
+    padding: 1rem;
+    margin: 0.5rem 0;
+    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+}
+
+.team-superior {
+    background: linear-gradient(135deg, #27ae60, #2ecc71);
+    color: white;
+    padding: 0.5rem;
+    border-radius: 5px;
+    margin: 0.25rem 0;
+}
+
+.team-inferior {
+    background: linear-gradient(135deg, #e67e22, #f39c12);
+    color: white;
+    padding: 0.5rem;
+    border-radius: 5px;
+    margin: 0.25rem 0;
+}
+
+.vs-separator {
+    text-align: center;
+    font-size: 1.2rem;
+    font-weight: bold;
+    color: #e74c3c;
+    margin: 0.25rem 0;
+}
+
+.metric-card {
+    background: white;
+    padding: 1rem;
+    border-radius: 8px;
+    border-left: 4px solid #28a745;
+    margin: 0.5rem 0;
+}
+
+.zona-stats {
+    background: #f8f9fa;
+    padding: 1rem;
+    border-radius: 8px;
+    margin: 1rem 0;
+}
+
+.bracket-modal-header {
+    background: linear-gradient(135deg, #e74c3c, #c0392b);
+    color: white;
+    padding: 2rem;
+    border-radius: 15px;
+    text-align: center;
+    margin: 2rem 0;
+    box-shadow: 0 10px 30px rgba(231, 76, 60, 0.3);
+    border: 2px solid #ffffff;
+}
+
+.bracket-modal-header h1 {
+    margin: 0;
+    font-size: 2.5rem;
+}
+
+.bracket-modal-header p {
+    margin: 0.5rem 0 0 0;
+    font-size: 1.2rem;
+    opacity: 0.9;
+}
+
+.bracket-modal {
+    background: linear-gradient(135deg, #f8f9fa, #e9ecef);
+    padding: 2rem;
+    border-radius: 15px;
+    margin: 1rem 0;
+    border: 1px solid #dee2e6;
+    box-shadow: 0 15px 35px rgba(0,0,0,0.1);
+}
+
+.champion-card {
+    background: linear-gradient(135deg, #ffd700, #ffed4e);
+    color: #212529;
+    padding: 1.5rem;
+    border-radius: 15px;
+    text-align: center;
+    margin-top: 1rem;
+    border: 3px solid #ffc107;
+    box-shadow: 0 8px 25px rgba(255, 215, 0, 0.4);
+}
+
+.champion-card h3 {
+    margin: 0;
+}
+
+.champion-card h2 {
+    margin: 0.5rem 0 0 0;
+}
+
+.racha-positiva {
+    color: #28a745;
+    font-weight: bold;
+}
+
+.racha-negativa {
+    color: #dc3545;
+    font-weight: bold;
+}
+
+.tabla-equipos {
+    width: 100%;
+    border-collapse: collapse;
+    margin-bottom: 1rem;
+}
+
+.tabla-equipos th,
+.tabla-equipos td {
+    padding: 0.3rem 0.5rem;
+    border-bottom: 1px solid #dee2e6;
+    text-align: left;
+}
+
+/* Estilos para el bracket de playoffs */
+.bracket-container {
+    background: linear-gradient(135deg, #f8f9fa, #e9ecef);
+    padding: 2rem;
+    border-radius: 15px;
+    margin: 1rem 0;
+    box-shadow: 0 8px 25px rgba(0,0,0,0.1);
+}
+
+.bracket-round {
+    display: flex;
+    flex-direction: column;
+    justify-content: space-around;
+    min-height: 600px;
+    margin: 0 1rem;
+}
+
+.bracket-game {
+    background: white;
+    border: 2px solid #e74c3c;
+    border-radius: 12px;
+    padding: 1rem;
+    margin: 0.5rem 0;
+    box-shadow: 0 6px 20px rgba(231, 76, 60, 0.15);
+    transition: all 0.3s ease;
+    position: relative;
+}
+
+.bracket-game:hover {
+    transform: translateY(-2px);
+    box-shadow: 0 8px 25px rgba(231, 76, 60, 0.25);
+}
+
+.game-header {
+    text-align: center;
+    font-weight: bold;
+    color: #e74c3c;
+    margin-bottom: 0.5rem;
+    font-size: 0.9rem;
+    text-transform: uppercase;
+    letter-spacing: 1px;
+}
+
+.bracket-team {
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+    padding: 0.75rem;
+    border-radius: 8px;
+    margin: 0.25rem 0;
+    font-weight: 500;
+    transition: all 0.2s ease;
+}
+
+.bracket-team:hover {
+    transform: scale(1.02);
+}
+
+.team-seed-1-4 {
+    background: linear-gradient(135deg, #28a745, #20c997);
+    color: white;
+    border-left: 4px solid #155724;
+}
+
+.team-seed-5-8 {
+    background: linear-gradient(135deg, #17a2b8, #6f42c1);
+    color: white;
+    border-left: 4px solid #0c5460;
+}
+
+.team-seed-9-12 {
+    background: linear-gradient(135deg, #ffc107, #fd7e14);
+    color: #212529;
+    border-left: 4px solid #856404;
+}
+
+.team-seed-13-16 {
+    background: linear-gradient(135deg, #dc3545, #e83e8c);
+    color: white;
+    border-left: 4px solid #721c24;
+}
+
+.team-info {
+    display: flex;
+    flex-direction: column;
+    flex-grow: 1;
+}
+
+.team-name {
+    font-weight: bold;
+    font-size: 1rem;
+    margin-bottom: 0.2rem;
+}
+
+.team-details {
+    font-size: 0.85rem;
+    opacity: 0.9;
+}
+
+.team-seed {
+    background: rgba(255,255,255,0.2);
+    color: white;
+    padding: 0.3rem 0.6rem;
+    border-radius: 50%;
+    font-weight: bold;
+    font-size: 0.9rem;
+    min-width: 2rem;
+    text-align: center;
+    margin-right: 0.75rem;
+    box-shadow: 0 2px 4px rgba(0,0,0,0.2);
+}
+
+.bracket-vs {
+    text-align: center;
+    font-weight: bold;
+    color: #e74c3c;
+    font-size: 1.1rem;
+    margin: 0.25rem 0;
+    text-shadow: 0 1px 2px rgba(0,0,0,0.1);
+}
+
+.round-title {
+    text-align: center;
+    background: linear-gradient(135deg, #6f42c1, #e83e8c);
+    color: white;
+    padding: 1rem;
+    border-radius: 10px;
+    margin-bottom: 1rem;
+    font-weight: bold;
+    font-size: 1.1rem;
+    text-transform: uppercase;
+    letter-spacing: 1px;
+    box-shadow: 0 4px 15px rgba(111, 66, 193, 0.3);
+}
+
+.future-round {
+    background: linear-gradient(135deg, #6c757d, #495057);
+    color: white;
+    padding: 1rem;
+    border-radius: 8px;
+    text-align: center;
+    margin: 0.5rem 0;
+    font-weight: 500;
+    opacity: 0.8;
+}
+
+.champion-spot {
+    background: linear-gradient(135deg, #ffd700, #ffed4e);
+    color: #212529;
+    padding: 2rem;
+    border-radius: 15px;
+    text-align: center;
+    font-weight: bold;
+    font-size: 1.2rem;
+    box-shadow: 0 8px 25px rgba(255, 215, 0, 0.4);
+    border: 3px solid #ffc107;
+}
+
+.playoff-button {
+    background: linear-gradient(135deg, #e74c3c, #c0392b) !important;
+    color: white !important;
+    border: none !important;
+    border-radius: 8px !important;
+    padding: 0.5rem 1rem !important;
+    font-weight: bold !important;
+    cursor: pointer !important;
+    transition: all 0.3s ease !important;
+    box-shadow: 0 4px 15px rgba(231, 76, 60, 0.3) !important;
+}
+
+.playoff-button:hover {
+    transform: translateY(-2px) !important;
+    box-shadow: 0 6px 20px rgba(231, 76, 60, 0.4) !important;
+    background: linear-gradient(135deg, #c0392b, #a93226) !important;
+}
+"""
+
+
+
+def minificar_css(css):
+    """Quita comentarios y espacios sobrantes del CSS"""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.DOTALL)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{}:;,>])\s*', r'\1', css)
+    return css.replace(';}', '}').strip()
+
+
+CSS_MINIFICADO = minificar_css(CSS)
+
+
+def publicar_css(directorio=DIRECTORIO_ESTATICO):
+    """Escribe el CSS minificado como archivo estático si cambió. Devuelve su versión"""
+    contenido = CSS_MINIFICADO.encode('utf-8')
+    ruta = os.path.join(directorio, ARCHIVO_CSS)
+    try:
+        with open(ruta, 'rb') as f:
+            vigente = f.read() == contenido
+    except OSError:
+        vigente = False
+    if not vigente:
+        os.makedirs(directorio, exist_ok=True)
+        temporal = ruta + '.tmp'
+        with open(temporal, 'wb') as f:
+            f.write(contenido)
+        os.replace(temporal, ruta)
+    return version_de_contenido(contenido)
+
+
+def get_team_seed_class(posicion):
+    """Obtiene la clase CSS según la posición del equipo"""
+    if posicion <= 4:
+        return "team-seed-1-4"
+    elif posicion <= 8:
+        return "team-seed-5-8"
+    elif posicion <= 12:
+        return "team-seed-9-12"
+    else:
+        return "team-seed-13-16"
+
+
+def format_racha(racha):
+    """Formatea la racha con colores"""
+    if racha > 0:
+        return f'<span class="racha-positiva">+{racha}</span>'
+    elif racha < 0:
+        return f'<span class="racha-negativa">{racha}</span>'
+    else:
+        return '<span>0</span>'
@@ -0,0 +1,147 @@
+"""Índice de líderes: top-N por métrica y alcance sobre el almacén columnar.
+
+Para cada métrica se ordenan una sola vez todas las filas del almacén, y para
+cada alcance (todo el almacén, categoría, zona de una categoría o grupo) se
+guardan esas mismas filas agrupadas por alcance y, dentro de cada uno, en el
+orden de la métrica. Una consulta es un corte del arreglo del alcance más los
+filtros, aplicados solo hasta juntar N filas, así que no depende de la
+cantidad de equipos del dataset.
+
+Los empates se resuelven con los criterios de cada métrica y, si persisten,
+por el orden de las filas del almacén, igual que ``max``/``min``/``sorted``
+sobre la lista de equipos.
+"""
+import numpy as np
+
+# Métrica -> criterios de orden, del más importante al menos importante: (columna, descendente)
+METRICAS = {
+    'puntos': (('puntos_totales', True), ('diferencia', True)),
+    'diferencia': (('diferencia', True), ('puntos_totales', True)),
+    'puntos_favor': (('puntos_favor', True),),
+    'puntos_contra': (('puntos_contra', False),),
+    'porcentaje': (('porcentaje', True), ('puntos_totales', True), ('diferencia', True)),
+    'racha': (('racha', True), ('puntos_totales', True)),
+}
+
+# Primer corte al buscar N filas que cumplan los filtros; se multiplica si no alcanza
+CORTE_INICIAL = 256
+
+
+class IndiceLideres:
+    """Top-N por métrica y alcance, precalculado para una versión del almacén"""
+
+    def __init__(self, almacen):
+        self.almacen = almacen
+        columnas = almacen.columnas
+        jugados = columnas['partidos_jugados']
+
+        valores = {
+            **columnas,
+            'diferencia': almacen.diferencia,
+            'porcentaje': np.divide(
+                columnas['partidos_ganados'], jugados,
+                out=np.zeros(len(almacen), dtype=np.float64), where=jugados > 0,
+            ),
+        }
+
+        self.filtros = {
+            'con_partidos': jugados > 0,
+            'invictos': (columnas['partidos_perdidos'] == 0) & (jugados > 0),
+            'en_racha': columnas['racha'] > 0,
+        }
+
+        # Identificador de cada fila en cada alcance
+        cantidad_zonas = max(len(almacen.zonas), 1)
+        ids_alcance = {
+            'todos': np.zeros(len(almacen), dtype=np.int64),
+            'categoria': almacen.fila_categoria.astype(np.int64),
+            'zona': almacen.fila_categoria.astype(np.int64) * cantidad_zonas + almacen.fila_zona,
+            'grupo': almacen.fila_grupo.astype(np.int64),
+        }
+        self._cantidad_zonas = cantidad_zonas
+        self._codigo_zona = {zona: codigo for codigo, zona in enumerate(almacen.zonas)}
+
+        self._ordenes = {}
+        for metrica, criterios in METRICAS.items():
+            # lexsort usa la última clave como principal y es estable: ante empates queda el orden de las filas
+            claves = [
+                -valores[columna] if descendente else valores[columna]
+                for columna, descendente in reversed(criterios)
+            ]
+            orden = np.lexsort(claves)
+            rango = np.empty(len(orden), dtype=np.int64)
+            rango[orden] = np.arange(len(orden))
+
+            for alcance, ids in ids_alcance.items():
+                # Una sola clave entera (alcance, rango): argsort estable de enteros es mucho más rápido que lexsort
+                filas = np.argsort(ids * len(orden) + rango, kind='stable').astype(np.int32)
+                ids_ordenados = ids[filas]
+                cantidad = int(ids.max()) + 1 if len(ids) else 0
+                limites = np.searchsorted(ids_ordenados, np.arange(cantidad + 1))
+                filas.flags.writeable = False
+                self._ordenes[metrica, alcance] = (filas, limites)
+
+        for filtro in self.filtros.values():
+            filtro.flags.writeable = False
+
+    def _alcance(self, categoria, zona, grupo):
+        if grupo is not None:
+            return 'grupo', grupo
+        if categoria is None:
+            if zona is not None:
+                raise ValueError("El alcance por zona necesita la categoría")
+            return 'todos', 0
+        if zona is None:
+            return 'categoria', categoria.indice
+        if zona not in self._codigo_zona:
+            return 'zona', None
+        return 'zona', categoria.indice * self._cantidad_zonas + self._codigo_zona[zona]
+
+    def filas(self, metrica, n=10, categoria=None, zona=None, grupo=None, filtros=(), min_jugados=0):
+        """Filas del almacén de las N mejores según la métrica, dentro del alcance y con los filtros.
+
+        El alcance es todo el almacén, una categoría (``VistaCategoria``), una
+        zona de esa categoría o un grupo (índice de grupo del almacén).
+        """
+        if metrica not in METRICAS:
+            raise ValueError(f"Métrica desconocida: {metrica}")
+        alcance, identificador = self._alcance(categoria, zona, grupo)
+        filas, limites = self._ordenes[metrica, alcance]
+        if identificador is None or not 0 <= identificador < len(limites) - 1:
+            return filas[:0]
+        candidatas = filas[limites[identificador]:limites[identificador + 1]]
+
+        mascaras = [self.filtros[filtro] for filtro in filtros]
+        jugados = self.almacen.columnas['partidos_jugados']
+        if not mascaras and not min_jugados:
+            return candidatas[:n]
+
+        # Filtrar por tramos: con filtros poco selectivos alcanza con mirar el principio del alcance
+        elegidas = []
+        cantidad = 0
+        inicio = 0
+        corte = max(CORTE_INICIAL, 4 * n)
+        while inicio < len(candidatas) and cantidad < n:
+            tramo = candidatas[inicio:inicio + corte]
+            cumple = np.ones(len(tramo), dtype=bool)
+            for mascara in mascaras:
+                cumple &= mascara[tramo]
+            if min_jugados:
+                cumple &= jugados[tramo] >= min_jugados
+            elegidas.append(tramo[cumple])
+            cantidad += len(elegidas[-1])
+            inicio += corte
+            corte *= 4
+        return np.concatenate(elegidas)[:n] if elegidas else candidatas[:0]
+
+    def top(self, metrica, n=10, **alcance_y_filtros):
+        """Como ``filas``, pero materializa cada equipo con su grupo y diferencia"""
+        return [self.equipo(fila) for fila in self.filas(metrica, n, **alcance_y_filtros).tolist()]
+
+    def equipo(self, fila):
+        """Fila materializada con el nombre del grupo en 'zona' y la diferencia de puntos"""
+        almacen = self.almacen
+        equipo = almacen.fila(fila)
+        equipo['zona'] = almacen.nombre_grupo_de_fila(fila)
+        equipo['diferencia'] = int(almacen.diferencia[fila])
+        return equipo
@@ -0,0 +1,247 @@
+"""Métricas del proceso para operación: latencias por vista, caches, dataset, sesiones y memoria.
+
+Las métricas se acumulan en memoria (un registro por proceso) y se exponen
+con un servidor HTTP chico en un hilo aparte, junto al de Streamlit:
+
+    /metrics       formato de texto de Prometheus
+    /metrics.json  el mismo contenido en JSON
+"""
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+# Límites superiores de los buckets de latencia, en segundos
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Una sesión cuenta como activa si tuvo un rerun en esta ventana
+VENTANA_SESIONES = 300.0
+
+FORMATO_FECHA_SCRAPING = "%Y-%m-%d %H:%M:%S"
+
+
+def rss_bytes():
+    """RSS actual del proceso en bytes"""
+    try:
+        with open('/proc/self/status') as f:
+            for linea in f:
+                if linea.startswith('VmRSS:'):
+                    return int(linea.split()[1]) * 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class Histograma:
+    """Histograma acumulativo por combinación de etiquetas"""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self._series = {}  # etiquetas -> [conteos por bucket (+Inf al final), suma, cantidad]
+        self._lock = threading.Lock()
+
+    def observar(self, etiquetas, valor):
+        with self._lock:
+            serie = self._series.get(etiquetas)
+            if serie is None:
+                serie = self._series[etiquetas] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            serie[0][bisect_left(self.buckets, valor)] += 1
+            serie[1] += valor
+            serie[2] += 1
+
+    def series(self):
+        """{etiquetas: {'buckets': [(límite, acumulado)], 'suma', 'cantidad'}}"""
+        with self._lock:
+            resultado = {}
+            for etiquetas, (conteos, suma, cantidad) in self._series.items():
+                acumulado = 0
+                buckets = []
+                for limite, conteo in zip(self.buckets + (float('inf'),), conteos):
+                    acumulado += conteo
+                    buckets.append((limite, acumulado))
+                resultado[etiquetas] = {'buckets': buckets, 'suma': suma, 'cantidad': cantidad}
+            return resultado
+
+
+class Metricas:
+    """Registro de métricas del proceso"""
+
+    def __init__(self):
+        self.inicio = time.time()
+        self.vistas = Histograma()
+        self.reruns = Histograma()
+        self.load_data_aciertos = 0
+        self.fuente = None
+        self._sesiones = {}
+        self._lock = threading.Lock()
+
+    def observar_vista(self, vista, categoria, zona, segundos):
+        self.vistas.observar((('vista', vista), ('categoria', categoria), ('zona', zona)), segundos)
+
+    @contextmanager
+    def medir_vista(self, vista, categoria, zona=''):
+        """Registra la duración del bloque en el histograma de vistas"""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observar_vista(vista, categoria, zona, time.perf_counter() - inicio)
+
+    def observar_rerun(self, segundos):
+        self.reruns.observar((), segundos)
+
+    def contar_load_data(self):
+        with self._lock:
+            self.load_data_aciertos += 1
+
+    def sesion_activa(self, sesion):
+        with self._lock:
+            self._sesiones[sesion] = time.time()
+
+    def sesiones_activas(self):
+        limite = time.time() - VENTANA_SESIONES
+        with self._lock:
+            for sesion in [s for s, visto in self._sesiones.items() if visto < limite]:
+                del self._sesiones[sesion]
+            return len(self._sesiones)
+
+    def _dataset(self):
+        if self.fuente is None:
+            return None
+        almacen = self.fuente.actual()
+        fecha = almacen.metadata.get('fecha_scraping') if almacen.metadata else None
+        try:
+            edad = time.time() - datetime.strptime(fecha, FORMATO_FECHA_SCRAPING).timestamp()
+        except (TypeError, ValueError):
+            edad = None
+        return {
+            'version': almacen.version,
+            'fecha_scraping': fecha,
+            'edad_segundos': edad,
+            'cargas': self.fuente.cargas,
+            'derivados': self.fuente.derivados.estadisticas(),
+        }
+
+    def instantanea(self):
+        """Todas las métricas como diccionario serializable"""
+        def histograma(h):
+            return [
+                {'etiquetas': dict(etiquetas), **serie,
+                 'buckets': [['+Inf' if limite == float('inf') else limite, n] for limite, n in serie['buckets']]}
+                for etiquetas, serie in h.series().items()
+            ]
+
+        dataset = self._dataset()
+        with self._lock:
+            aciertos = self.load_data_aciertos
+        return {
+            'uptime_segundos': time.time() - self.inicio,
+            'rss_bytes': rss_bytes(),
+            'sesiones_activas': self.sesiones_activas(),
+            'load_data': {'aciertos': aciertos, 'fallos': dataset['cargas'] if dataset else 0},
+            'dataset': dataset,
+            'rerun_segundos': histograma(self.reruns),
+            'vista_segundos': histograma(self.vistas),
+        }
+
+    def prometheus(self):
+        """Métricas en formato de texto de Prometheus"""
+        datos = self.instantanea()
+        lineas = []
+
+        def metrica(nombre, tipo, ayuda, muestras):
+            lineas.append(f"# HELP {nombre} {ayuda}")
+            lineas.append(f"# TYPE {nombre} {tipo}")
+            for etiquetas, valor in muestras:
+                lineas.append(f"{nombre}{_etiquetas(etiquetas)} {valor}")
+
+        metrica('copa_process_resident_memory_bytes', 'gauge', "RSS del proceso", [({}, datos['rss_bytes'])])
+        metrica('copa_sesiones_activas', 'gauge', f"Sesiones con un rerun en los últimos {VENTANA_SESIONES:.0f} s",
+                [({}, datos['sesiones_activas'])])
+        metrica('copa_load_data_total', 'counter', "Llamadas a load_data: hit = almacén publicado, miss = carga del archivo",
+                [({'resultado': 'hit'}, datos['load_data']['aciertos']),
+                 ({'resultado': 'miss'}, datos['load_data']['fallos'])])
+
+        dataset = datos['dataset']
+        if dataset:
+            metrica('copa_derivados_total', 'counter', "Consultas al cache de derivados por versión",
+                    [({'resultado': 'hit'}, dataset['derivados']['aciertos']),
+                     ({'resultado': 'miss'}, dataset['derivados']['fallos'])])
+            metrica('copa_dataset_info', 'gauge', "Versión del dataset publicado",
+                    [({'version': dataset['version'], 'fecha_scraping': dataset['fecha_scraping'] or ''}, 1)])
+            if dataset['edad_segundos'] is not None:
+                metrica('copa_dataset_edad_segundos', 'gauge', "Segundos desde metadata.fecha_scraping",
+                        [({}, round(dataset['edad_segundos'], 1))])
+
+        for nombre, clave, ayuda in (
+            ('copa_rerun_segundos', 'rerun_segundos', "Duración de los reruns completos del script"),
+            ('copa_vista_segundos', 'vista_segundos', "Duración de cada vista (resumen, región o playoffs)"),
+        ):
+            lineas.append(f"# HELP {nombre} {ayuda}")
+            lineas.append(f"# TYPE {nombre} histogram")
+            for serie in datos[clave]:
+                for limite, acumulado in serie['buckets']:
+                    lineas.append(f"{nombre}_bucket{_etiquetas({**serie['etiquetas'], 'le': limite})} {acumulado}")
+                lineas.append(f"{nombre}_sum{_etiquetas(serie['etiquetas'])} {serie['suma']}")
+                lineas.append(f"{nombre}_count{_etiquetas(serie['etiquetas'])} {serie['cantidad']}")
+
+        return "\n".join(lineas) + "\n"
+
+
+def _etiquetas(etiquetas):
+    if not etiquetas:
+        return ""
+    pares = ",".join(
+        f'{clave}="{str(valor).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for clave, valor in etiquetas.items()
+    )
+    return "{" + pares + "}"
+
+
+def iniciar_servidor(metricas, puerto, host='127.0.0.1'):
+    """Sirve /metrics y /metrics.json en un hilo daemon. Devuelve el servidor o None si el puerto está ocupado"""
+    class Manejador(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == '/metrics':
+                cuerpo = metricas.prometheus().encode('utf-8')
+                tipo = 'text/plain; version=0.0.4; charset=utf-8'
+            elif self.path == '/metrics.json':
+                cuerpo = json.dumps(metricas.instantanea(), ensure_ascii=False).encode('utf-8')
+                tipo = 'application/json'
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', tipo)
+            self.send_header('Content-Length', str(len(cuerpo)))
+            self.end_headers()
+            self.wfile.write(cuerpo)
+
+        def log_message(self, *args):
+            pass
+
+    try:
+        servidor = ThreadingHTTPServer((host, puerto), Manejador)
+    except OSError as error:
+        logger.warning("No se pudo abrir el puerto de métricas %s: %s", puerto, error)
+        return None
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, name="metricas", daemon=True).start()
+    logger.info("Métricas en http://%s:%s/metrics", host, servidor.server_address[1])
+    return servidor
+
+
+def puerto_configurado(defecto=8502):
+    """Puerto de métricas desde COPA_METRICAS_PUERTO (0 lo desactiva)"""
+    try:
+        return int(os.environ.get('COPA_METRICAS_PUERTO', defecto))
+    except ValueError:
+        return defecto
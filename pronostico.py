@@ -0,0 +1,203 @@
+"""Probabilidades de clasificación con los partidos de fase de grupos que faltan jugar.
+
+Para cada grupo se infieren los partidos pendientes del todos contra todos
+(ida y vuelta) a partir de ``partidos_jugados``, se simulan en lotes con un
+modelo de marcador y se vuelve a aplicar el orden de
+la siembra: primero la posición dentro del grupo y después, en cada puesto con
+cupo limitado, la comparación entre grupos, hasta completar el cuadro.
+"""
+import numpy as np
+
+from clasificacion import regla_de
+from desempate import PUNTOS_DERROTA, PUNTOS_VICTORIA
+from reglas import REGLAS, SIN_LIMITE, claves_desempate
+
+SIMULACIONES = 20_000
+
+# Desvío estándar del tanteo de cada equipo en el modelo de marcador
+DESVIO_MARCADOR = 12.0
+
+# Veces que se enfrenta cada par de equipos en la fase de grupos (ida y vuelta)
+VUELTAS = 2
+
+
+
+def partidos_por_equipo(tamano, jugados):
+    """Partidos totales de cada equipo en la fase: ida y vuelta contra todos"""
+    return max(VUELTAS * (tamano - 1), max(jugados, default=0))
+
+
+def partidos_restantes(jugados):
+    """Infiere los cruces pendientes de un grupo a partir de los partidos jugados por equipo.
+
+    Se reparten los partidos que le faltan a cada equipo emparejando siempre a
+    los que más partidos adeudan, sin repetir un cruce más de ``VUELTAS`` veces.
+    Devuelve una lista de pares (i, j) con índices locales del grupo.
+    """
+    total = partidos_por_equipo(len(jugados), jugados)
+    pendientes = [total - j for j in jugados]
+    cruces = {}
+    partidos = []
+
+    while True:
+        candidatos = sorted((i for i in range(len(pendientes)) if pendientes[i] > 0), key=lambda i: -pendientes[i])
+        if len(candidatos) < 2:
+            break
+        local = candidatos[0]
+        visitante = next(
+            (j for j in candidatos[1:] if cruces.get((min(local, j), max(local, j)), 0) < VUELTAS),
+            None,
+        )
+        if visitante is None:
+            # Los datos no permiten más cruces válidos para este equipo
+            pendientes[local] = 0
+            continue
+        par = (min(local, visitante), max(local, visitante))
+        cruces[par] = cruces.get(par, 0) + 1
+        pendientes[local] -= 1
+        pendientes[visitante] -= 1
+        partidos.append(par)
+
+    return partidos
+
+
+def _simular_grupo(almacen, grupo, simulaciones, rng):
+    """Filas del grupo y valor final de cada criterio de desempate por simulación y equipo"""
+    filas = np.arange(almacen.grupo_inicio[grupo], almacen.grupo_fin[grupo])
+    columnas = almacen.columnas
+    jugados = columnas['partidos_jugados'][filas]
+    puntos_favor = columnas['puntos_favor'][filas].astype(np.float64)
+    puntos_contra = columnas['puntos_contra'][filas].astype(np.float64)
+
+    puntos = np.broadcast_to(columnas['puntos_totales'][filas], (simulaciones, len(filas))).astype(np.int64)
+    ganados = np.broadcast_to(columnas['partidos_ganados'][filas], (simulaciones, len(filas))).astype(np.int64)
+    favor = np.broadcast_to(puntos_favor, (simulaciones, len(filas))).copy()
+    contra = np.broadcast_to(puntos_contra, (simulaciones, len(filas))).copy()
+
+    partidos = partidos_restantes(jugados.tolist())
+    if partidos:
+        # Modelo de marcador: cada equipo anota en promedio la media entre su ataque y la defensa rival
+        con_partidos = jugados > 0
+        promedio = puntos_favor[con_partidos].sum() / max(jugados[con_partidos].sum(), 1)
+        ataque = np.where(con_partidos, puntos_favor / np.maximum(jugados, 1), promedio)
+        defensa = np.where(con_partidos, puntos_contra / np.maximum(jugados, 1), promedio)
+
+        local, visitante = np.array(partidos).T
+        media_local = (ataque[local] + defensa[visitante]) / 2
+        media_visitante = (ataque[visitante] + defensa[local]) / 2
+        tanteo_local = np.rint(rng.normal(media_local, DESVIO_MARCADOR, (simulaciones, len(partidos))))
+        tanteo_visitante = np.rint(rng.normal(media_visitante, DESVIO_MARCADOR, (simulaciones, len(partidos))))
+        # No hay empates en básquet: un empate se define por un punto para cualquiera de los dos
+        empate = tanteo_local == tanteo_visitante
+        tanteo_local += empate & (rng.random(empate.shape) < 0.5)
+        gana_local = tanteo_local > tanteo_visitante
+
+        # Matrices de incidencia partido × equipo para acumular todos los partidos a la vez
+        es_local = np.zeros((len(partidos), len(filas)))
+        es_visitante = np.zeros((len(partidos), len(filas)))
+        es_local[np.arange(len(partidos)), local] = 1
+        es_visitante[np.arange(len(partidos)), visitante] = 1
+
+        victorias = gana_local @ es_local + (~gana_local) @ es_visitante
+        derrotas = (~gana_local) @ es_local + gana_local @ es_visitante
+        puntos += (PUNTOS_VICTORIA * victorias + PUNTOS_DERROTA * derrotas).astype(np.int64)
+        ganados += victorias.astype(np.int64)
+        favor += tanteo_local @ es_local + tanteo_visitante @ es_visitante
+        contra += tanteo_visitante @ es_local + tanteo_local @ es_visitante
+
+    return filas, {
+        'puntos_totales': puntos,
+        'diferencia': favor - contra,
+        'puntos_favor': favor,
+        'puntos_contra': contra,
+        'partidos_ganados': ganados,
+    }
+
+
+def resultados_de(regla):
+    """Columnas del pronóstico de una zona: un resultado por puesto con cupo y 'Eliminado'"""
+    return tuple(
+        f"{puesto}º" if cantidad == SIN_LIMITE else f"{puesto}º clasificado"
+        for puesto, cantidad in regla.cupos if cantidad
+    ) + ("Eliminado",)
+
+
+# Columnas con el reglamento por defecto
+RESULTADOS = resultados_de(REGLAS.regla())
+
+
+def pronostico_zona(categoria, zona, simulaciones=SIMULACIONES, semilla=None):
+    """Probabilidad de cada equipo de la zona de clasificar desde cada puesto con cupo o quedar eliminado"""
+    almacen = categoria.almacen
+    grupos = categoria.grupos_de_zona(zona)
+    regla = regla_de(categoria, zona)
+    puestos = [puesto for puesto, cantidad in regla.cupos if cantidad]
+    resultados_zona = resultados_de(regla)
+    rng = np.random.default_rng(semilla)
+
+    filas_zona = []
+    conteos = []
+    ocupantes = {puesto: [] for puesto in puestos}  # por puesto: (grupo, índice del equipo, {criterio: valor}) por simulación
+
+    for i, grupo in enumerate(grupos):
+        filas, valores = _simular_grupo(almacen, grupo, simulaciones, rng)
+        # Dentro del grupo manda la tabla oficial: puntos y, ante igualdad, la posición actual
+        # (que ya refleja el desempate olímpico). Las filas vienen ordenadas por posición.
+        orden = np.argsort(-valores['puntos_totales'], axis=1, kind='stable')
+
+        indice = np.arange(simulaciones)
+        for puesto in puestos:
+            if len(filas) >= puesto:
+                equipo = orden[:, puesto - 1]
+                ocupantes[puesto].append((
+                    i,
+                    equipo,
+                    {criterio: valores[criterio][indice, equipo] for criterio in regla.desempate},
+                ))
+
+        filas_zona.append(filas)
+        conteos.append(np.zeros((len(filas), len(resultados_zona)), dtype=np.int64))
+
+    # Cada puesto aporta lo mismo que en la siembra: su cupo, recortado a lo que queda del cuadro. Si no
+    # entran todos, se comparan entre grupos con el desempate del reglamento (ante igualdad, el orden de los grupos)
+    cupos = regla.cupos_en_cuadro([len(filas) for filas in filas_zona])
+    for columna, puesto in enumerate(puestos):
+        if not ocupantes[puesto]:
+            continue
+        equipos = np.stack([equipo for _, equipo, _ in ocupantes[puesto]], axis=1)
+        if cupos[puesto] >= len(ocupantes[puesto]):
+            clasifica = np.ones(equipos.shape, dtype=bool)
+        else:
+            valores = {
+                criterio: np.stack([de_grupo[criterio] for _, _, de_grupo in ocupantes[puesto]], axis=1)
+                for criterio in regla.desempate
+            }
+            orden = np.lexsort(claves_desempate(regla.desempate, valores), axis=-1)
+            rango = np.empty_like(orden)
+            np.put_along_axis(rango, orden, np.arange(orden.shape[1])[None, :], axis=1)
+            clasifica = rango < cupos[puesto]
+
+        for k, (i, _, _) in enumerate(ocupantes[puesto]):
+            conteos[i][:, columna] = np.bincount(equipos[clasifica[:, k], k], minlength=len(filas_zona[i]))
+
+    resultados = []
+    for filas, conteo in zip(filas_zona, conteos):
+        conteo[:, -1] = simulaciones - conteo[:, :-1].sum(axis=1)
+        for fila, conteo_fila in zip(filas, conteo.tolist()):
+            resultado = almacen.fila(fila)
+            resultado['zona'] = almacen.nombre_grupo_de_fila(fila)
+            for nombre, cantidad in zip(resultados_zona, conteo_fila):
+                resultado[nombre] = cantidad / simulaciones
+            resultados.append(resultado)
+
+    return resultados
+
+
+def pronostico_completo(almacen, simulaciones=SIMULACIONES, semilla=None):
+    """Pronóstico de todas las zonas de todas las categorías: {(categoría, zona): resultados}"""
+    resultados = {}
+    for nombre in dict.fromkeys(almacen.categorias):
+        categoria = almacen.categoria(nombre)
+        for zona in categoria.zonas:
+            resultados[(nombre, zona)] = pronostico_zona(categoria, zona, simulaciones, semilla)
+    return resultados
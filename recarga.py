@@ -0,0 +1,180 @@
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+from clasificacion import AlmacenClasificacion
+
+logger = logging.getLogger(__name__)
+
+
+class CacheDerivados:
+    """Resultados derivados (clasificaciones, brackets, tablas) indexados por versión del dataset.
+
+    Solo se conservan las últimas ``versiones_max`` versiones: al publicarse un
+    dataset nuevo las entradas de versiones viejas se descartan, y los reruns que
+    todavía usan la versión anterior siguen encontrando sus resultados.
+    """
+
+    def __init__(self, versiones_max=2):
+        self.versiones_max = versiones_max
+        self.aciertos = 0
+        self.fallos = 0
+        self._por_version = OrderedDict()
+        self._en_curso = {}
+        self._lock = threading.Lock()
+
+    def consultar(self, version, clave):
+        """Resultado cacheado para (versión, clave) sin calcularlo, o None"""
+        with self._lock:
+            return self._por_version.get(version, {}).get(clave)
+
+    def heredar(self, version_anterior, version, conservar):
+        """Copia a ``version`` las entradas de ``version_anterior`` cuya clave cumple ``conservar``.
+
+        Para resultados que no dependen de lo que cambió entre las dos versiones
+        (por ejemplo, los de zonas sin partidos nuevos). Devuelve cuántas copió.
+        """
+        with self._lock:
+            anteriores = self._por_version.get(version_anterior)
+            if not anteriores:
+                return 0
+            entradas = self._por_version.get(version)
+            if entradas is None:
+                entradas = self._por_version[version] = {}
+                while len(self._por_version) > self.versiones_max:
+                    self._por_version.popitem(last=False)
+            copiadas = 0
+            for clave, valor in list(anteriores.items()):
+                if clave not in entradas and conservar(clave):
+                    entradas[clave] = valor
+                    copiadas += 1
+            return copiadas
+
+    def obtener(self, version, clave, calcular):
+        """Devuelve el resultado cacheado para (versión, clave) o lo calcula"""
+        with self._lock:
+            entradas = self._por_version.get(version)
+            if entradas is not None and clave in entradas:
+                self.aciertos += 1
+                return entradas[clave]
+            calculo = self._en_curso.setdefault((version, clave), threading.Lock())
+
+        # Un lock por clave: las sesiones que piden lo mismo esperan al primer cálculo
+        # en lugar de repetirlo, y las que piden otra cosa no se bloquean
+        with calculo:
+            with self._lock:
+                entradas = self._por_version.get(version)
+                if entradas is not None and clave in entradas:
+                    self.aciertos += 1
+                    return entradas[clave]
+                self.fallos += 1
+
+            try:
+                valor = calcular()
+            finally:
+                with self._lock:
+                    self._en_curso.pop((version, clave), None)
+
+            with self._lock:
+                entradas = self._por_version.get(version)
+                if entradas is None:
+                    entradas = self._por_version[version] = {}
+                    while len(self._por_version) > self.versiones_max:
+                        self._por_version.popitem(last=False)
+                entradas.setdefault(clave, valor)
+                return entradas[clave]
+
+    def versiones(self):
+        with self._lock:
+            return list(self._por_version)
+
+    def estadisticas(self):
+        """Aciertos, fallos y entradas cacheadas por versión"""
+        with self._lock:
+            return {
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'entradas': {version: len(entradas) for version, entradas in self._por_version.items()},
+            }
+
+
+class FuenteDatos:
+    """Dataset publicado con recarga en caliente.
+
+    Un hilo en segundo plano vigila el archivo de datos (mtime y tamaño) y,
+    cuando cambia, lo parsea fuera del camino de las requests. El almacén nuevo
+    se publica reemplazando una única referencia, así que cada sesión ve la
+    versión anterior o la nueva completa, nunca una mezcla.
+    """
+
+    def __init__(self, ruta, cargar=AlmacenClasificacion.desde_archivo, intervalo=5.0, al_publicar=None):
+        self.ruta = ruta
+        self.cargar = cargar
+        self.intervalo = intervalo
+        self.al_publicar = al_publicar
+        self.derivados = CacheDerivados()
+        self._firma = self._firma_archivo()
+        self._almacen = cargar(ruta)
+        self.anterior = None  # Versión publicada antes de la actual, para el feed de cambios
+        self.cargas = 1  # Lecturas completas del archivo (la inicial y cada recarga válida)
+        self._detener = threading.Event()
+        self._hilo = None
+
+    def actual(self):
+        """Almacén publicado actualmente"""
+        return self._almacen
+
+    def _firma_archivo(self):
+        try:
+            estado = os.stat(self.ruta)
+        except OSError:
+            return None
+        return (estado.st_mtime_ns, estado.st_size)
+
+    def recargar(self):
+        """Revisa el archivo y publica una versión nueva si cambió. Devuelve True si hubo cambio"""
+        firma = self._firma_archivo()
+        if firma is None or firma == self._firma:
+            return False
+
+        # Registrar la firma antes de parsear: un archivo inválido se reintenta cuando vuelva a cambiar
+        self._firma = firma
+        try:
+            almacen = self.cargar(self.ruta)
+        except (OSError, ValueError) as error:
+            # Archivo a medio escribir o inválido: conservar la versión actual
+            logger.warning("No se pudo recargar %s: %s", self.ruta, error)
+            return False
+        self.cargas += 1
+
+        if almacen.version == self._almacen.version:
+            return False
+
+        self.anterior = self._almacen
+        self._almacen = almacen
+        logger.info("Dataset actualizado a la versión %s", almacen.version)
+        if self.al_publicar is not None:
+            # Precalcular los derivados de la versión nueva desde este hilo, fuera de las requests
+            self.al_publicar(almacen)
+        return True
+
+    def iniciar(self):
+        """Arranca el hilo vigilante (idempotente)"""
+        if self._hilo is None or not self._hilo.is_alive():
+            self._detener.clear()
+            self._hilo = threading.Thread(target=self._vigilar, name="recarga-datos", daemon=True)
+            self._hilo.start()
+        return self
+
+    def detener(self):
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join()
+
+    def _vigilar(self):
+        while not self._detener.wait(self.intervalo):
+            try:
+                self.recargar()
+            except Exception:
+                logger.exception("Error inesperado vigilando %s", self.ruta)
@@ -0,0 +1,355 @@
+"""Reglamento de clasificación declarativo: zonas, cupos por puesto, cuadro y desempate.
+
+Un reglamento es un diccionario por competencia: cómo se asigna cada grupo a
+una zona según su nombre, cuántos equipos de cada puesto del grupo clasifican
+(todos o los N mejores entre los grupos de la zona), el tamaño del cuadro de
+playoffs, si se juega con byes cuando no se llena y el orden de los criterios
+de desempate. Las excepciones reemplazan valores para una fase, categoría o
+zona en particular.
+
+``compilar`` valida el reglamento una sola vez y devuelve un evaluador: la
+zona de cada nombre de grupo y la regla de cada (fase, categoría, zona)
+quedan memorizadas, y ``evaluar`` calcula la siembra de todas las zonas de
+todas las categorías del almacén con unas pocas operaciones vectorizadas. Así
+comparar variantes del formato sobre el dataset completo
+(``evaluar_variantes``) cuesta milisegundos por variante.
+"""
+import hashlib
+import json
+from collections import namedtuple
+
+import numpy as np
+
+# Cupo de un puesto en el que clasifican los equipos de todos los grupos
+TODOS = 'todos'
+SIN_LIMITE = np.iinfo(np.int32).max
+
+# Criterio de desempate -> True si gana el valor más alto
+CRITERIOS = {
+    'puntos_totales': True,
+    'diferencia': True,
+    'puntos_favor': True,
+    'puntos_contra': False,
+    'partidos_ganados': True,
+}
+
+# Nombre de cada criterio para mostrar el reglamento
+ETIQUETAS_CRITERIOS = {
+    'puntos_totales': 'Puntos',
+    'diferencia': 'Diferencia',
+    'puntos_favor': 'Puntos a favor',
+    'puntos_contra': 'Puntos en contra',
+    'partidos_ganados': 'Partidos ganados',
+}
+
+REGLAMENTO_FEBAMBA = {
+    'competencia': 'COPA FEBAMBA',
+    # Texto en el nombre del grupo -> zona; gana el primero de la lista que aparece
+    'zonas': (
+        ('CENTRO OESTE', 'CENTRO'),
+        ('NORTE', 'NORTE'),
+        ('CENTRO', 'CENTRO'),
+        ('OESTE', 'OESTE'),
+        ('SUR', 'SUR'),
+    ),
+    # Puesto en el grupo -> clasifican TODOS o los N mejores entre los grupos de la zona
+    'cupos': {1: TODOS, 2: TODOS, 3: 4},  # NORTE/CENTRO/OESTE: 6 zonas, 4 terceros
+    'cuadro': 16,
+    'byes': False,
+    'desempate': ('puntos_totales', 'diferencia', 'puntos_favor'),
+    # (condiciones sobre 'fase', 'categoria' y 'zona', valores que reemplazan), en orden
+    'excepciones': (
+        ({'zona': 'SUR'}, {'cupos': {1: TODOS, 2: TODOS, 3: 2}}),  # SUR: 7 zonas, 2 terceros
+    ),
+}
+
+CLAVES_REGLA = ('cupos', 'cuadro', 'byes', 'desempate')
+
+
+class ErrorReglamento(ValueError):
+    """Reglamento mal formado"""
+
+
+class Regla(namedtuple('Regla', CLAVES_REGLA)):
+    """Regla resuelta de una zona: cupos ((puesto, cantidad), ...), cuadro, byes y desempate"""
+
+    @property
+    def puestos(self):
+        return max((puesto for puesto, _ in self.cupos), default=0)
+
+    def cupo(self, puesto):
+        """Cuántos equipos del puesto clasifican (SIN_LIMITE si clasifican todos)"""
+        return dict(self.cupos).get(puesto, 0)
+
+    def cupos_en_cuadro(self, tamanos):
+        """Cuántos equipos de cada puesto entran al cuadro con grupos de esos tamaños: {puesto: cantidad}
+
+        Como en la siembra, los puestos se llenan en orden hasta completar el cuadro.
+        """
+        cupos = {}
+        libres = self.cuadro
+        for puesto in range(1, self.puestos + 1):
+            con_puesto = sum(1 for tamano in tamanos if tamano >= puesto)
+            cupos[puesto] = min(self.cupo(puesto), con_puesto, libres)
+            libres -= cupos[puesto]
+        return cupos
+
+    def descripcion(self):
+        """'Los 2 mejores de cada zona + los 4 mejores 3º = 16 clasificados'"""
+        partes = []
+        todos = 0
+        for puesto, cantidad in self.cupos:
+            if cantidad == SIN_LIMITE and puesto == todos + 1:
+                todos = puesto
+            elif cantidad == SIN_LIMITE:
+                partes.append(f"todos los {puesto}º")
+            elif cantidad:
+                partes.append(f"{'el mejor' if cantidad == 1 else f'los {cantidad} mejores'} {puesto}º")
+        if todos:
+            partes.insert(0, "El mejor de cada zona" if todos == 1 else f"Los {todos} mejores de cada zona")
+        byes = " (con byes si faltan)" if self.byes else ""
+        return f"{' + '.join(partes)} = {self.cuadro} clasificados{byes}"
+
+    def descripcion_desempate(self):
+        """'Puntos → Diferencia → Puntos a favor'"""
+        return " → ".join(ETIQUETAS_CRITERIOS[criterio] for criterio in self.desempate)
+
+
+def _validar_regla(valores, origen):
+    cupos = valores.get('cupos', {})
+    for puesto, cantidad in cupos.items():
+        if not isinstance(puesto, int) or puesto < 1:
+            raise ErrorReglamento(f"{origen}: puesto inválido {puesto!r}")
+        if cantidad != TODOS and (not isinstance(cantidad, int) or cantidad < 0):
+            raise ErrorReglamento(f"{origen}: cupo inválido para el {puesto}º: {cantidad!r}")
+    cuadro = valores.get('cuadro', 2)
+    if not isinstance(cuadro, int) or cuadro < 2 or cuadro & (cuadro - 1):
+        raise ErrorReglamento(f"{origen}: el cuadro tiene que ser una potencia de 2, no {cuadro!r}")
+    if 'desempate' in valores and not valores['desempate']:
+        raise ErrorReglamento(f"{origen}: el desempate necesita al menos un criterio")
+    for criterio in valores.get('desempate', ()):
+        if criterio not in CRITERIOS:
+            raise ErrorReglamento(f"{origen}: criterio de desempate desconocido {criterio!r}")
+    desconocidas = set(valores) - set(CLAVES_REGLA)
+    if desconocidas:
+        raise ErrorReglamento(f"{origen}: claves desconocidas {sorted(desconocidas)}")
+
+
+def _compilar_regla(valores):
+    cupos = tuple(sorted(
+        (puesto, SIN_LIMITE if cantidad == TODOS else cantidad) for puesto, cantidad in valores['cupos'].items()
+    ))
+    return Regla(cupos, valores['cuadro'], bool(valores['byes']), tuple(valores['desempate']))
+
+
+class ReglasCompiladas:
+    """Evaluador de un reglamento: zonas, reglas por zona y siembra de todo un almacén"""
+
+    def __init__(self, reglamento):
+        self.reglamento = reglamento
+        self.competencia = reglamento.get('competencia', '')
+
+        base = {clave: reglamento[clave] for clave in CLAVES_REGLA if clave in reglamento}
+        faltantes = set(CLAVES_REGLA) - set(base)
+        if faltantes:
+            raise ErrorReglamento(f"{self.competencia}: faltan {sorted(faltantes)}")
+        _validar_regla(base, self.competencia)
+        self._base = base
+
+        self._excepciones = []
+        for condiciones, valores in reglamento.get('excepciones', ()):
+            if set(condiciones) - {'fase', 'categoria', 'zona'}:
+                raise ErrorReglamento(f"{self.competencia}: condición desconocida en {condiciones!r}")
+            _validar_regla(valores, f"{self.competencia} {condiciones}")
+            self._excepciones.append((tuple(condiciones.items()), valores))
+
+        self._patrones = tuple((texto.upper(), zona) for texto, zona in reglamento.get('zonas', ()))
+        # Identifica el reglamento compilado: lo que se guarda derivado de él (snapshots) la compara
+        self.huella = hashlib.sha256(json.dumps(
+            [self._base, self._excepciones, self._patrones], sort_keys=True, ensure_ascii=False
+        ).encode('utf-8')).hexdigest()[:16]
+        self._zona_de_grupo = {}
+        self._reglas = {}
+        self._reglas_por_excepciones = {}
+
+    def zona_de_grupo(self, nombre_grupo):
+        """Zona de un grupo según su nombre; si ningún patrón aparece, la primera palabra"""
+        zona = self._zona_de_grupo.get(nombre_grupo)
+        if zona is None:
+            mayusculas = nombre_grupo.upper()
+            zona = next((zona for texto, zona in self._patrones if texto in mayusculas), None)
+            if zona is None:
+                zona = nombre_grupo.split()[0].upper() if nombre_grupo.split() else ''
+            self._zona_de_grupo[nombre_grupo] = zona
+        return zona
+
+    def regla(self, fase='', categoria='', zona=''):
+        """Regla de una zona: la base con las excepciones que le corresponden aplicadas en orden"""
+        clave = (fase, categoria, zona)
+        regla = self._reglas.get(clave)
+        if regla is None:
+            contexto = {'fase': fase, 'categoria': categoria, 'zona': zona}
+            aplicables = tuple(
+                i for i, (condiciones, _) in enumerate(self._excepciones)
+                if all(contexto[campo] == valor for campo, valor in condiciones)
+            )
+            # Muchas zonas comparten las mismas excepciones: se compila una regla por combinación
+            regla = self._reglas_por_excepciones.get(aplicables)
+            if regla is None:
+                valores = dict(self._base)
+                for i in aplicables:
+                    valores.update(self._excepciones[i][1])
+                regla = self._reglas_por_excepciones[aplicables] = _compilar_regla(valores)
+            self._reglas[clave] = regla
+        return regla
+
+    def evaluar(self, almacen):
+        """Siembra de todas las zonas de todas las categorías del almacén"""
+        return Siembra(self, almacen)
+
+
+class Siembra:
+    """Clasificados de cada (categoría, zona) en orden de siembra, según un reglamento compilado.
+
+    Para cada zona se toma, de cada grupo, el primer equipo de cada puesto con
+    cupo; dentro de cada puesto se ordenan con el desempate de la zona
+    (estable: ante igualdad, el orden de los grupos) y se quedan los que entran
+    en el cupo. La siembra es puesto por puesto hasta llenar el cuadro.
+    """
+
+    def __init__(self, reglas, almacen):
+        self.reglas = reglas
+
+        # Zonas según este reglamento: pueden no coincidir con las del almacén
+        codigos = {}
+        zona_de_grupo = {nombre: reglas.zona_de_grupo(nombre) for nombre in set(almacen.grupo_nombre)}
+        codigo_grupo = np.array(
+            [codigos.setdefault(zona_de_grupo[nombre], len(codigos)) for nombre in almacen.grupo_nombre],
+            dtype=np.int64,
+        )
+        cantidad_zonas = max(len(codigos), 1)
+        zonas = list(codigos)
+        clave_grupo = almacen.grupo_categoria.astype(np.int64) * cantidad_zonas + codigo_grupo
+
+        claves = np.unique(clave_grupo)
+        self.zonas = [(clave // cantidad_zonas, zonas[clave % cantidad_zonas]) for clave in claves.tolist()]
+        self.reglas_zona = [
+            reglas.regla(almacen.fases[categoria_id], almacen.categorias[categoria_id], zona)
+            for categoria_id, zona in self.zonas
+        ]
+        self._indice = {zona: i for i, zona in enumerate(self.zonas)}
+
+        # Tablas por regla distinta (suelen ser muy pocas) y la regla de cada zona
+        distintas = {}
+        regla_zona = np.array([distintas.setdefault(regla, len(distintas)) for regla in self.reglas_zona], dtype=np.int64)
+        puestos = max((regla.puestos for regla in distintas), default=0)
+        cupos = np.zeros((len(distintas), puestos + 1), dtype=np.int64)
+        cuadros = np.zeros(len(distintas), dtype=np.int64)
+        for i, regla in enumerate(distintas):
+            for puesto, cantidad in regla.cupos:
+                cupos[i, puesto] = cantidad
+            cuadros[i] = regla.cuadro
+
+        # Primera fila de cada puesto con cupo en cada grupo (las filas están en orden de grupo y posición)
+        posicion = almacen.posicion
+        candidatas = np.flatnonzero((posicion >= 1) & (posicion <= puestos))
+        grupo_candidata = almacen.fila_grupo[candidatas]
+        posicion_candidata = posicion[candidatas]
+        primera = np.ones(len(candidatas), dtype=bool)
+        primera[1:] = (grupo_candidata[1:] != grupo_candidata[:-1]) | (posicion_candidata[1:] != posicion_candidata[:-1])
+        filas = candidatas[primera]
+        zona = np.searchsorted(claves, clave_grupo[grupo_candidata[primera]])
+        puesto = posicion_candidata[primera].astype(np.int64)
+
+        # Orden de desempate dentro de cada (zona, puesto), estable; cada zona con su lista de criterios
+        valores = valores_de_criterios(almacen)
+        desempates = list(dict.fromkeys(regla.desempate for regla in distintas))
+        partes = []
+        for desempate in desempates:
+            if len(desempates) == 1:
+                subconjunto = np.arange(len(filas))
+            else:
+                usan = np.array([regla.desempate == desempate for regla in distintas], dtype=bool)
+                subconjunto = np.flatnonzero(usan[regla_zona[zona]])
+            claves_orden = claves_desempate(desempate, valores, filas[subconjunto])
+            claves_orden += [puesto[subconjunto], zona[subconjunto]]
+            partes.append(subconjunto[np.lexsort(claves_orden)])
+        orden = np.concatenate(partes) if partes else np.empty(0, dtype=np.int64)
+        segmento = zona[orden] * (puestos + 1) + puesto[orden]
+        if len(partes) > 1:
+            orden = orden[np.argsort(segmento, kind='stable')]
+            segmento = zona[orden] * (puestos + 1) + puesto[orden]
+
+        # Rango dentro del puesto y cupo
+        rango = _rango_en_segmento(segmento)
+        entran = rango < cupos[regla_zona[zona[orden]], puesto[orden]]
+        orden = orden[entran]
+
+        # Semilla dentro de la zona y tamaño del cuadro
+        semilla = _rango_en_segmento(zona[orden]) + 1
+        entran = semilla <= cuadros[regla_zona[zona[orden]]]
+        orden = orden[entran]
+
+        self.filas = filas[orden]
+        self.puestos = puesto[orden]
+        self._limites = np.searchsorted(zona[orden], np.arange(len(claves) + 1))
+        for arreglo in (self.filas, self.puestos, self._limites):
+            arreglo.flags.writeable = False
+
+    def __len__(self):
+        return len(self.filas)
+
+    def clasificados(self, categoria_id, zona):
+        """(filas, puestos en el grupo) de los clasificados de la zona, en orden de siembra"""
+        i = self._indice.get((categoria_id, zona))
+        if i is None:
+            return self.filas[:0], self.puestos[:0]
+        inicio, fin = self._limites[i], self._limites[i + 1]
+        return self.filas[inicio:fin], self.puestos[inicio:fin]
+
+    def regla(self, categoria_id, zona):
+        i = self._indice.get((categoria_id, zona))
+        return None if i is None else self.reglas_zona[i]
+
+    def diferencias(self, otra):
+        """Filas que clasifican con esta siembra y no con la otra, y al revés"""
+        return np.setdiff1d(self.filas, otra.filas), np.setdiff1d(otra.filas, self.filas)
+
+
+def valores_de_criterios(almacen):
+    """Columna de cada criterio de desempate, una fila por equipo del almacén"""
+    return {**almacen.columnas, 'diferencia': almacen.diferencia}
+
+
+def claves_desempate(desempate, valores, indices=slice(None)):
+    """Claves para ``np.lexsort`` (la última es la principal) que ordenan según los criterios de desempate.
+
+    ``valores`` tiene un arreglo por criterio (ver ``valores_de_criterios``);
+    con ``indices`` se toman solo esas posiciones. El mejor queda primero.
+    """
+    return [
+        -valores[criterio][indices] if CRITERIOS[criterio] else valores[criterio][indices]
+        for criterio in reversed(desempate)
+    ]
+
+
+def _rango_en_segmento(segmento):
+    """Posición de cada elemento dentro de su tramo de valores iguales consecutivos"""
+    if len(segmento) == 0:
+        return np.empty(0, dtype=np.int64)
+    inicios = np.flatnonzero(np.r_[True, segmento[1:] != segmento[:-1]])
+    largos = np.diff(np.r_[inicios, len(segmento)])
+    return np.arange(len(segmento)) - np.repeat(inicios, largos)
+
+
+def compilar(reglamento):
+    """Valida el reglamento y lo compila en un evaluador"""
+    return ReglasCompiladas(reglamento)
+
+
+def evaluar_variantes(almacen, variantes):
+    """Siembra del almacén con cada variante del reglamento: {nombre: Siembra}"""
+    return {nombre: compilar(reglamento).evaluar(almacen) for nombre, reglamento in variantes.items()}
+
+
+REGLAS = compilar(REGLAMENTO_FEBAMBA)
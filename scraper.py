@@ -0,0 +1,487 @@
+"""Actualización incremental del dataset desde el sitio de la federación.
+
+Descarga la página de la competencia (``metadata.url_base``), que enumera las
+categorías con sus grupos, y la página de clasificación de cada grupo, con
+asyncio y un pool de conexiones HTTP/1.1 persistentes: la concurrencia está
+acotada por la cantidad de conexiones y cada conexión se reutiliza entre
+páginas.
+
+Cada página se pide con ``If-None-Match``/``If-Modified-Since`` según el
+``ETag``/``Last-Modified`` de la corrida anterior, guardados junto al JSON
+(``<datos>.http.json``) con el contenido ya parseado. Si el servidor contesta
+304, o 200 con el mismo contenido, se reutiliza lo anterior; si ningún grupo
+cambió el JSON no se reescribe, así que la app no recarga nada. Cuando hay
+cambios se escribe el esquema de siempre (``metadata`` + ``datos``) de forma
+atómica; si alguna página falla no se escribe nada y queda el JSON anterior.
+La versión reemplazada se guarda como snapshot (``ruta_snapshot_anterior``)
+para que la app muestre qué cambió (ver ``cambios.py``).
+
+Las tablas se reconocen por sus encabezados: la de clasificación por ``Pos``,
+``Equipo``, ``PJ``, ``PG``, ``PP``, ``PF``, ``PC``, ``Pts`` y ``Racha``, y la
+de resultados (opcional, ver ``desempate.py``) por ``Local``, ``Visitante`` y
+sus tantos. En el índice, cada ``<h2>`` es una categoría, el ``<h3>`` que la
+sigue su fase y los enlaces con ``grupo=`` sus grupos.
+
+Uso:
+    python scraper.py basketball_complete_data.json [--url URL] [--conexiones 8] [--snapshot]
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import ssl
+import time
+import zlib
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit
+
+from clasificacion import COLUMNAS_NUMERICAS, AlmacenClasificacion
+from snapshot import guardar_snapshot, ruta_snapshot_anterior
+
+logger = logging.getLogger(__name__)
+
+AGENTE = 'copa-febamba-clasificacion/1.0'
+
+# Redirecciones que se siguen por página antes de darla por fallida
+REDIRECCIONES = 5
+ESTADOS_REDIRECCION = (301, 302, 303, 307, 308)
+
+# Encabezado de la tabla -> campo del JSON
+CAMPOS_CLASIFICACION = {
+    'pos': 'posicion',
+    'equipo': 'equipo',
+    'pj': 'partidos_jugados',
+    'pg': 'partidos_ganados',
+    'pp': 'partidos_perdidos',
+    'pf': 'puntos_favor',
+    'pc': 'puntos_contra',
+    'pts': 'puntos_totales',
+    'racha': 'racha',
+}
+CAMPOS_PARTIDOS = {
+    'local': 'local',
+    'visitante': 'visitante',
+    'tantos local': 'puntos_local',
+    'tantos visitante': 'puntos_visitante',
+}
+
+
+class ErrorScraping(Exception):
+    """Respuesta HTTP inesperada o página que no se pudo interpretar"""
+
+
+class Respuesta:
+    def __init__(self, estado, encabezados, cuerpo):
+        self.estado = estado
+        self.encabezados = encabezados
+        self.cuerpo = cuerpo
+
+    def texto(self):
+        tipo = self.encabezados.get('content-type', '')
+        charset = tipo.split('charset=')[-1].split(';')[0].strip(' "\'') if 'charset=' in tipo else 'utf-8'
+        try:
+            return self.cuerpo.decode(charset, errors='replace')
+        except LookupError:
+            # Charset desconocido para Python: mejor texto con reemplazos que perder la página
+            return self.cuerpo.decode('utf-8', errors='replace')
+
+
+class ClienteHTTP:
+    """Cliente HTTP/1.1 mínimo sobre asyncio con conexiones persistentes.
+
+    Mantiene hasta ``conexiones`` conexiones por destino; cada pedido toma una
+    libre (o abre una nueva si no hay) y la devuelve al pool al terminar, salvo
+    que el servidor la cierre. ``abiertas`` y ``pedidos`` cuentan las
+    conexiones abiertas y los pedidos hechos, para medir la reutilización.
+    """
+
+    def __init__(self, conexiones=8, timeout=20.0, reintentos=2):
+        self.timeout = timeout
+        self.reintentos = reintentos
+        self.abiertas = 0
+        self.pedidos = 0
+        self._limite = asyncio.Semaphore(conexiones)
+        self._libres = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *excepcion):
+        await self.cerrar()
+
+    async def cerrar(self):
+        for conexiones in self._libres.values():
+            for _, escritor in conexiones:
+                escritor.close()
+        self._libres.clear()
+
+    async def get(self, url, encabezados=None):
+        partes = urlsplit(url)
+        seguro = partes.scheme == 'https'
+        destino = (partes.hostname, partes.port or (443 if seguro else 80), seguro)
+        ruta = (partes.path or '/') + (f'?{partes.query}' if partes.query else '')
+        pedido = (
+            f'GET {ruta} HTTP/1.1\r\nHost: {partes.netloc}\r\nUser-Agent: {AGENTE}\r\n'
+            'Accept-Encoding: gzip\r\nConnection: keep-alive\r\n'
+            + ''.join(f'{clave}: {valor}\r\n' for clave, valor in (encabezados or {}).items())
+            + '\r\n'
+        ).encode('latin-1')
+
+        async with self._limite:
+            for intento in range(self.reintentos + 1):
+                conexion, reutilizada = await self._conexion(destino)
+                try:
+                    respuesta, mantener = await asyncio.wait_for(self._pedir(conexion, pedido), self.timeout)
+                except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError, zlib.error) as error:
+                    conexion[1].close()
+                    # Una conexión del pool puede haber sido cerrada por el servidor: reintentar con otra
+                    if intento == self.reintentos:
+                        raise ErrorScraping(f"GET {url}: {error!r}") from error
+                    if not reutilizada:
+                        await asyncio.sleep(0.2 * 2 ** intento)
+                    continue
+                self.pedidos += 1
+                if mantener:
+                    self._libres.setdefault(destino, []).append(conexion)
+                else:
+                    conexion[1].close()
+                return respuesta
+
+    async def _conexion(self, destino):
+        libres = self._libres.get(destino)
+        if libres:
+            return libres.pop(), True
+        host, puerto, seguro = destino
+        conexion = await asyncio.wait_for(
+            asyncio.open_connection(host, puerto, ssl=ssl.create_default_context() if seguro else None),
+            self.timeout,
+        )
+        self.abiertas += 1
+        return conexion, False
+
+    async def _pedir(self, conexion, pedido):
+        lector, escritor = conexion
+        escritor.write(pedido)
+        await escritor.drain()
+
+        linea = await lector.readline()
+        if not linea:
+            raise asyncio.IncompleteReadError(b'', None)
+        version, estado = linea.decode('latin-1').split(None, 2)[:2]
+        encabezados = {}
+        while True:
+            linea = await lector.readline()
+            if linea in (b'\r\n', b'\n', b''):
+                break
+            clave, _, valor = linea.decode('latin-1').partition(':')
+            encabezados[clave.strip().lower()] = valor.strip()
+
+        estado = int(estado)
+        mantener = version == 'HTTP/1.1' and encabezados.get('connection', '').lower() != 'close'
+        if estado in (204, 304) or 100 <= estado < 200:
+            cuerpo = b''
+        elif 'chunked' in encabezados.get('transfer-encoding', '').lower():
+            cuerpo = await self._leer_por_partes(lector)
+        elif 'content-length' in encabezados:
+            cuerpo = await lector.readexactly(int(encabezados['content-length']))
+        else:
+            cuerpo = await lector.read()
+            mantener = False
+
+        if encabezados.get('content-encoding', '').lower() == 'gzip':
+            cuerpo = zlib.decompress(cuerpo, 16 + zlib.MAX_WBITS)
+        return Respuesta(estado, encabezados, cuerpo), mantener
+
+    async def _leer_por_partes(self, lector):
+        partes = []
+        while True:
+            tamano = int((await lector.readline()).split(b';')[0].strip(), 16)
+            if tamano == 0:
+                # Trailers opcionales hasta la línea vacía
+                while (await lector.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                return b''.join(partes)
+            partes.append(await lector.readexactly(tamano))
+            await lector.readexactly(2)
+
+
+class _Tablas(HTMLParser):
+    """Tablas (filas de celdas de texto), encabezados h2/h3 y enlaces de una página, en orden"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.eventos = []
+        self._tabla = None
+        self._fila = None
+        self._celda = None
+        self._titulo = None
+        self._enlace = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'table':
+            self._tabla = []
+        elif tag == 'tr' and self._tabla is not None:
+            self._fila = []
+        elif tag in ('td', 'th') and self._fila is not None:
+            self._celda = []
+        elif tag in ('h2', 'h3'):
+            self._titulo = (tag, [])
+        elif tag == 'a':
+            self._enlace = (dict(attrs).get('href', ''), [])
+
+    def handle_endtag(self, tag):
+        if tag in ('td', 'th') and self._celda is not None:
+            self._fila.append(''.join(self._celda).strip())
+            self._celda = None
+        elif tag == 'tr' and self._fila is not None:
+            if self._fila:
+                self._tabla.append(self._fila)
+            self._fila = None
+        elif tag == 'table' and self._tabla is not None:
+            self.eventos.append(('table', self._tabla))
+            self._tabla = None
+        elif self._titulo is not None and tag == self._titulo[0]:
+            self.eventos.append((tag, ''.join(self._titulo[1]).strip()))
+            self._titulo = None
+        elif tag == 'a' and self._enlace is not None:
+            self.eventos.append(('a', (self._enlace[0], ''.join(self._enlace[1]).strip())))
+            self._enlace = None
+
+    def handle_data(self, data):
+        for destino in (self._celda, self._titulo and self._titulo[1], self._enlace and self._enlace[1]):
+            if destino is not None:
+                destino.append(data)
+
+
+def _eventos(html):
+    parser = _Tablas()
+    parser.feed(html)
+    parser.close()
+    return parser.eventos
+
+
+def parsear_indice(html, url):
+    """Categorías de la competencia: [{'categoria', 'fase', 'grupos': [(nombre, url)]}]"""
+    categorias = []
+    for tipo, valor in _eventos(html):
+        if tipo == 'h2':
+            categorias.append({'categoria': valor, 'fase': '', 'grupos': []})
+        elif tipo == 'h3' and categorias and not categorias[-1]['grupos']:
+            categorias[-1]['fase'] = valor
+        elif tipo == 'a' and categorias and 'grupo=' in valor[0]:
+            categorias[-1]['grupos'].append((valor[1], urljoin(url, valor[0])))
+    if not categorias:
+        raise ErrorScraping(f"{url}: la página no tiene categorías")
+    return categorias
+
+
+def _tabla(filas, campos):
+    """Filas de la primera fila de encabezados que tenga todos los campos, como dicts"""
+    encabezado = [celda.lower() for celda in filas[0]]
+    if not set(campos) <= set(encabezado):
+        return None
+    indices = {campo: encabezado.index(clave) for clave, campo in campos.items()}
+    return [{campo: fila[i] for campo, i in indices.items()} for fila in filas[1:] if len(fila) == len(encabezado)]
+
+
+def parsear_grupo(html, url):
+    """Clasificación (y partidos, si la página los tiene) de un grupo"""
+    clasificacion = partidos = None
+    for tipo, filas in _eventos(html):
+        if tipo != 'table' or not filas:
+            continue
+        if clasificacion is None:
+            clasificacion = _tabla(filas, CAMPOS_CLASIFICACION)
+        if partidos is None:
+            partidos = _tabla(filas, CAMPOS_PARTIDOS)
+    if clasificacion is None:
+        raise ErrorScraping(f"{url}: la página no tiene tabla de clasificación")
+
+    try:
+        for equipo in clasificacion:
+            for campo in ('posicion',) + COLUMNAS_NUMERICAS:
+                equipo[campo] = int(equipo[campo])
+        for partido in partidos or ():
+            partido['puntos_local'] = int(partido['puntos_local'])
+            partido['puntos_visitante'] = int(partido['puntos_visitante'])
+    except ValueError as error:
+        raise ErrorScraping(f"{url}: valor no numérico en la tabla ({error})") from error
+
+    grupo = {'clasificacion': [{campo: equipo[campo] for campo in CAMPOS_CLASIFICACION.values()} for equipo in clasificacion]}
+    if partidos:
+        grupo['partidos'] = partidos
+    return grupo
+
+
+def ruta_cache(ruta_datos):
+    """Archivo con los validadores HTTP y el contenido parseado de cada página"""
+    return ruta_datos + '.http.json'
+
+
+def _leer_json(ruta, defecto):
+    try:
+        with open(ruta, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return defecto
+
+
+def _escribir_json(ruta, contenido, indent=None):
+    """Escritura atómica: la app nunca ve un JSON a medio escribir"""
+    temporal = ruta + '.tmp'
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(contenido, f, ensure_ascii=False, indent=indent)
+    os.replace(temporal, ruta)
+
+
+class Scraper:
+    """Una corrida de actualización: descarga condicional de todas las páginas"""
+
+    def __init__(self, cliente, paginas):
+        self.cliente = cliente
+        self.paginas = paginas  # url -> {'etag', 'last_modified', 'huella', 'contenido'}
+        self.visitadas = {}
+        self.descargadas = 0
+        self.sin_cambios = 0
+
+    async def pagina(self, url, parsear):
+        """Contenido parseado de la página y si cambió respecto de la corrida anterior.
+
+        Sigue hasta ``REDIRECCIONES`` redirecciones; los validadores y el
+        contenido se guardan con la URL pedida y los enlaces relativos se
+        resuelven contra la URL final.
+        """
+        anterior = self.paginas.get(url)
+        encabezados = {}
+        if anterior:
+            if anterior.get('etag'):
+                encabezados['If-None-Match'] = anterior['etag']
+            if anterior.get('last_modified'):
+                encabezados['If-Modified-Since'] = anterior['last_modified']
+
+        final = url
+        respuesta = await self.cliente.get(final, encabezados)
+        for _ in range(REDIRECCIONES):
+            if respuesta.estado not in ESTADOS_REDIRECCION or not respuesta.encabezados.get('location'):
+                break
+            final = urljoin(final, respuesta.encabezados['location'])
+            respuesta = await self.cliente.get(final, encabezados)
+        if respuesta.estado == 304 and anterior:
+            self.sin_cambios += 1
+            self.visitadas[url] = anterior
+            return anterior['contenido'], False
+        if respuesta.estado != 200:
+            raise ErrorScraping(f"GET {final}: HTTP {respuesta.estado}")
+
+        self.descargadas += 1
+        huella = hashlib.sha256(respuesta.cuerpo).hexdigest()
+        if anterior and anterior['huella'] == huella:
+            contenido, cambio = anterior['contenido'], False
+        else:
+            contenido, cambio = parsear(respuesta.texto(), final), True
+        self.visitadas[url] = {
+            'etag': respuesta.encabezados.get('etag'),
+            'last_modified': respuesta.encabezados.get('last-modified'),
+            'huella': huella,
+            'contenido': contenido,
+        }
+        return contenido, cambio
+
+
+async def _reunir(corrutinas):
+    """Como ``asyncio.gather``, pero si una falla cancela las demás y espera a que terminen.
+
+    Así ninguna descarga sigue corriendo (ni usando una conexión) después de
+    que se cierra el cliente; se propaga el primer error.
+    """
+    tareas = [asyncio.ensure_future(corrutina) for corrutina in corrutinas]
+    try:
+        return await asyncio.gather(*tareas)
+    except BaseException:
+        for tarea in tareas:
+            tarea.cancel()
+        await asyncio.gather(*tareas, return_exceptions=True)
+        raise
+
+
+async def actualizar(ruta_datos, url_base=None, conexiones=8, timeout=20.0):
+    """Actualiza el JSON de ``ruta_datos`` descargando solo las páginas que cambiaron.
+
+    Devuelve un resumen con las páginas descargadas, las que no cambiaron, los
+    grupos que cambiaron y si se reescribió el JSON.
+    """
+    inicio = time.perf_counter()
+    anterior = _leer_json(ruta_datos, None)
+    url_base = url_base or (anterior or {}).get('metadata', {}).get('url_base')
+    if not url_base:
+        raise ErrorScraping("Falta la URL de la competencia (--url o metadata.url_base)")
+    cache = _leer_json(ruta_cache(ruta_datos), {})
+    paginas = cache.get('paginas', {}) if cache.get('url_base') == url_base else {}
+
+    async with ClienteHTTP(conexiones, timeout) as cliente:
+        scraper = Scraper(cliente, paginas)
+        indice, indice_cambio = await scraper.pagina(url_base, parsear_indice)
+        urls = [url for categoria in indice for _, url in categoria['grupos']]
+        grupos = await _reunir(scraper.pagina(url, parsear_grupo) for url in urls)
+        estadisticas = {'conexiones': cliente.abiertas, 'pedidos': cliente.pedidos}
+
+    cambiados = [url for url, (_, cambio) in zip(urls, grupos) if cambio]
+    reescrito = (anterior is None or indice_cambio or bool(cambiados)
+                 or anterior.get('metadata', {}).get('url_base') != url_base)
+    if reescrito:
+        if anterior is not None:
+            # La versión que se reemplaza queda como base del feed de cambios de la app
+            try:
+                guardar_snapshot(AlmacenClasificacion(anterior), ruta_snapshot_anterior(ruta_datos))
+            except (KeyError, ValueError) as error:
+                logger.warning("No se pudo guardar la versión anterior de %s: %r", ruta_datos, error)
+        contenido = iter(grupo for grupo, _ in grupos)
+        datos = [{
+            'categoria': categoria['categoria'],
+            'fase': categoria['fase'],
+            'grupos': [{'nombre': nombre, **next(contenido)} for nombre, _ in categoria['grupos']],
+        } for categoria in indice]
+        _escribir_json(ruta_datos, {
+            'metadata': {
+                'url_base': url_base,
+                'categorias_procesadas': [categoria['categoria'] for categoria in indice],
+                'total_grupos': len(urls),
+                'fecha_scraping': time.strftime('%Y-%m-%d %H:%M:%S'),
+            },
+            'datos': datos,
+        }, indent=2)
+        logger.info("%s actualizado: %d grupos cambiados", ruta_datos, len(cambiados))
+
+    # Solo las páginas de esta corrida: los grupos que ya no están en el índice se olvidan
+    _escribir_json(ruta_cache(ruta_datos), {'url_base': url_base, 'paginas': scraper.visitadas})
+    return {
+        'descargadas': scraper.descargadas,
+        'sin_cambios': scraper.sin_cambios,
+        'grupos_cambiados': cambiados,
+        'reescrito': reescrito,
+        'segundos': time.perf_counter() - inicio,
+        **estadisticas,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('datos')
+    parser.add_argument('--url', default=None, help="página de la competencia (por defecto metadata.url_base)")
+    parser.add_argument('--conexiones', type=int, default=8)
+    parser.add_argument('--timeout', type=float, default=20.0)
+    parser.add_argument('--snapshot', action='store_true', help="compilar el snapshot binario si hubo cambios")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    resumen = asyncio.run(actualizar(args.datos, args.url, args.conexiones, args.timeout))
+    print(f"{resumen['descargadas']} páginas descargadas, {resumen['sin_cambios']} sin cambios, "
+          f"{len(resumen['grupos_cambiados'])} grupos cambiados en {resumen['segundos']:.2f} s "
+          f"({resumen['pedidos']} pedidos en {resumen['conexiones']} conexiones)")
+    if resumen['reescrito']:
+        print(f"{args.datos} actualizado")
+        if args.snapshot:
+            from snapshot import compilar_snapshot
+            print(compilar_snapshot(args.datos))
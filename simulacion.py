@@ -0,0 +1,108 @@
+"""Simulación Monte Carlo del bracket de playoffs de una zona.
+
+La probabilidad de que un equipo le gane a otro sale de la expectativa
+pitagórica de cada uno (puntos a favor y en contra) combinada con la fórmula
+log5. Cada ronda se simula para todas las corridas a la vez con NumPy. El
+cuadro puede ser de cualquier potencia de 2; en los byes el equipo sin rival
+pasa de ronda automáticamente.
+"""
+import numpy as np
+
+from clasificacion import estructura_bracket
+
+# Exponente pitagórico habitual para básquet (Morey)
+EXPONENTE_PITAGORICO = 13.91
+
+SIMULACIONES = 1_000_000
+
+CAMPEON = "Campeón"
+
+
+def probabilidad_pitagorica(puntos_favor, puntos_contra, exponente=EXPONENTE_PITAGORICO):
+    """Porcentaje de victorias esperado según puntos a favor y en contra (0.5 sin partidos)"""
+    pf = np.asarray(puntos_favor, dtype=np.float64)
+    pc = np.asarray(puntos_contra, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        # Forma equivalente a pf^k / (pf^k + pc^k) que no desborda con exponentes altos
+        probabilidad = 1.0 / (1.0 + (pc / pf) ** exponente)
+    probabilidad = np.where((pf + pc) > 0, probabilidad, 0.5)
+    return np.nan_to_num(probabilidad, nan=0.5)
+
+
+def matriz_log5(probabilidades):
+    """Matriz P[i, j] con la probabilidad de que i le gane a j"""
+    p = np.clip(np.asarray(probabilidades, dtype=np.float64), 1e-6, 1 - 1e-6)
+    a = p[:, None]
+    b = p[None, :]
+    return (a - a * b) / (a + b - 2 * a * b)
+
+
+def rondas_de(cuadro):
+    """Nombre de cada ronda a la que se llega en un cuadro, de la primera al campeón"""
+    return tuple(ronda.nombre for ronda in estructura_bracket(cuadro).rondas) + (CAMPEON,)
+
+
+def equipos_del_bracket(enfrentamientos, cuadro):
+    """Equipos en orden de cuadro: superior e inferior de cada partido de primera ronda (None si no hay)"""
+    por_numero = {enfrentamiento['numero']: enfrentamiento for enfrentamiento in enfrentamientos}
+    equipos = []
+    for numero in estructura_bracket(cuadro).orden:
+        enfrentamiento = por_numero.get(numero)
+        equipos.append(enfrentamiento['equipo_superior'] if enfrentamiento else None)
+        equipos.append(enfrentamiento['equipo_inferior'] if enfrentamiento else None)
+    return equipos
+
+
+def simular_bracket(enfrentamientos, cuadro=None, simulaciones=SIMULACIONES, semilla=None, lote=250_000):
+    """Simula el bracket completo y devuelve la probabilidad de cada equipo de llegar a cada ronda
+
+    Sin cuadro se asume uno completo (dos equipos por partido). Los lugares sin
+    equipo de un cuadro con byes los ocupa un rival que pierde siempre.
+    """
+    if not enfrentamientos:
+        return []
+    cuadro = cuadro or 2 * len(enfrentamientos)
+    rondas = rondas_de(cuadro)
+
+    lugares = equipos_del_bracket(enfrentamientos, cuadro)
+    equipos = [equipo for equipo in lugares if equipo is not None]
+    cantidad = len(equipos)
+    # El último índice es el lugar vacío de un bye: pierde con todos
+    vacio = cantidad
+    lado = cantidad + 1
+    indices = iter(range(cantidad))
+    cuadro_inicial = np.array([vacio if equipo is None else next(indices) for equipo in lugares], dtype=np.intp)
+
+    # Matriz aplanada: victorias[i * lado + j] es la probabilidad de que i le gane a j
+    victorias = np.zeros((lado, lado), dtype=np.float32)
+    victorias[:cantidad, :cantidad] = matriz_log5(probabilidad_pitagorica(
+        [e['puntos_favor'] for e in equipos],
+        [e['puntos_contra'] for e in equipos],
+    ))
+    victorias[:cantidad, vacio] = 1.0
+    victorias = victorias.ravel()
+
+    rng = np.random.default_rng(semilla)
+    llegadas = np.zeros((cantidad, len(rondas)), dtype=np.int64)
+    llegadas[:, 0] = simulaciones
+
+    for inicio in range(0, simulaciones, lote):
+        corridas = min(lote, simulaciones - inicio)
+        # Una fila por corrida con los equipos que siguen vivos, en orden de cuadro
+        vivos = np.broadcast_to(cuadro_inicial, (corridas, len(cuadro_inicial)))
+
+        for ronda in range(1, len(rondas)):
+            local = vivos[:, 0::2]
+            visitante = vivos[:, 1::2]
+            gana_local = rng.random(local.shape, dtype=np.float32) < np.take(victorias, local * lado + visitante)
+            vivos = np.where(gana_local, local, visitante)
+            llegadas[:, ronda] += np.bincount(vivos.ravel(), minlength=lado)[:cantidad]
+
+    resultados = []
+    for i, equipo in enumerate(equipos):
+        resultado = {'nombre': equipo['nombre'], 'posicion': equipo['posicion']}
+        for ronda, llegadas_ronda in zip(rondas, llegadas[i].tolist()):
+            resultado[ronda] = llegadas_ronda / simulaciones
+        resultados.append(resultado)
+
+    return sorted(resultados, key=lambda r: r['posicion'])
@@ -0,0 +1,288 @@
+"""Situación matemática de cada equipo: clasificado asegurado, eliminado o en juego.
+
+Para cada grupo se consideran exactamente todos los resultados posibles de los
+partidos que faltan (ganar o perder; el margen no está acotado). Solo importan
+los puntos finales, así que los resultados se reducen a los vectores de puntos
+distintos, que se construyen partido a partido descartando repetidos. Los
+grupos son independientes entre sí, de modo que la comparación entre grupos
+alcanza con conocer, por grupo, qué equipos pueden ocupar cada puesto y con
+cuántos puntos. Los grupos con demasiadas combinaciones posibles se acotan con
+puntos mínimos y máximos en lugar de enumerarse.
+
+Los cupos de cada puesto son los de la siembra: los del reglamento de la zona,
+recortados a lo que queda del cuadro. En un puesto en el que entran todos no
+hace falta comparar; en uno con cupo limitado (los mejores terceros, por
+ejemplo) se compara con el equipo del mismo puesto de los demás grupos.
+
+Dentro del grupo, un empate en puntos solo está resuelto si ninguno de los dos
+equipos tiene partidos pendientes (la tabla ya refleja el desempate olímpico);
+si no, cuenta a favor del rival para asegurar la clasificación y a favor del
+equipo para darlo por eliminado.
+"""
+import numpy as np
+
+from clasificacion import regla_de
+from pronostico import PUNTOS_DERROTA, PUNTOS_VICTORIA, partidos_restantes
+from reglas import CRITERIOS, valores_de_criterios
+
+CLASIFICADO = "🔒 Clasificado"
+ELIMINADO = "⛔ Eliminado"
+EN_JUEGO = "⏳ En juego"
+
+# Máximo de vectores de puntos distintos que se enumeran por grupo
+LIMITE_VECTORES = 1 << 22
+
+
+def _vectores_de_puntos(base, partidos):
+    """Vectores de puntos finales distintos alcanzables con los partidos pendientes.
+
+    Se recorren los partidos uno por uno guardando solo las combinaciones
+    distintas de victorias por equipo, codificadas en un entero (base mixta),
+    así que el costo depende de cuántos vectores distintos existen y no de las
+    2^n combinaciones de resultados.
+    """
+    if not partidos:
+        return base[None, :]
+
+    cantidad = len(base)
+    pendientes = np.zeros(cantidad, dtype=np.int64)
+    for local, visitante in partidos:
+        pendientes[local] += 1
+        pendientes[visitante] += 1
+    # Peso de cada equipo en la codificación: victorias_t ∈ [0, pendientes_t]
+    pesos = np.concatenate([[1], np.cumprod(pendientes[:-1] + 1)])
+
+    codigos = np.zeros(1, dtype=np.int64)
+    for local, visitante in partidos:
+        codigos = np.unique(np.concatenate([codigos + pesos[local], codigos + pesos[visitante]]))
+
+    victorias = (codigos[:, None] // pesos) % (pendientes + 1)
+    # Cada partido pendiente suma al menos la derrota; las victorias suman la diferencia
+    return base + PUNTOS_DERROTA * pendientes + (PUNTOS_VICTORIA - PUNTOS_DERROTA) * victorias
+
+
+class _Grupo:
+    """Resultados posibles de un grupo, exactos o acotados"""
+
+    def __init__(self, almacen, grupo, orden, desempate, limitados):
+        self.orden = orden
+        self.limitados = limitados
+        self.filas = np.arange(almacen.grupo_inicio[grupo], almacen.grupo_fin[grupo])
+        columnas = almacen.columnas
+        jugados = columnas['partidos_jugados'][self.filas]
+        self.base = columnas['puntos_totales'][self.filas].astype(np.int64)
+        # Criterios de desempate entre grupos; solo se usan los de equipos sin partidos pendientes
+        valores = valores_de_criterios(almacen)
+        self.valores = {criterio: valores[criterio][self.filas] for criterio in desempate}
+
+        partidos = partidos_restantes(jugados.tolist())
+        pendientes = np.zeros(len(self.filas), dtype=np.int64)
+        for local, visitante in partidos:
+            pendientes[local] += 1
+            pendientes[visitante] += 1
+        # Sin partidos pendientes los criterios de desempate ya no cambian
+        self.fijo = pendientes == 0
+        self.minimo = self.base + PUNTOS_DERROTA * pendientes
+        self.maximo = self.base + PUNTOS_VICTORIA * pendientes
+
+        self.exacto = np.prod(pendientes + 1, dtype=np.float64) <= LIMITE_VECTORES
+        if self.exacto:
+            self._enumerar(_vectores_de_puntos(self.base, partidos))
+        else:
+            self._acotar()
+
+    def _empates_definidos(self):
+        """[i, j]: un empate en puntos entre i y j ya está resuelto y j queda delante de i.
+
+        Si los dos terminaron sus partidos, la posición actual ya refleja el
+        desempate olímpico; si alguno tiene partidos pendientes, el desempate
+        (enfrentamiento directo, diferencias) todavía puede ir para cualquier lado.
+        """
+        indices = np.arange(len(self.filas))
+        return (self.fijo[:, None] & self.fijo[None, :]) & (indices[None, :] < indices[:, None])
+
+    def _enumerar(self, vectores):
+        # Dentro del grupo manda la cantidad de puntos; cada empate abierto puede resolverse a favor
+        # de cualquiera: mejor puesto contando solo los empates ya perdidos, peor contando todos
+        # los que no estén ya ganados
+        orden = np.argsort(-vectores, axis=1, kind='stable')
+        ordenados = np.take_along_axis(vectores, orden, axis=1)
+        cantidad = vectores.shape[1]
+        columnas = np.arange(cantidad)
+        # Tramos de puntos iguales en cada vector ordenado: empiezan en el mejor puesto y terminan en el peor
+        empieza = np.ones(ordenados.shape, dtype=bool)
+        empieza[:, 1:] = ordenados[:, 1:] != ordenados[:, :-1]
+        termina = np.ones(ordenados.shape, dtype=bool)
+        termina[:, :-1] = empieza[:, 1:]
+        inicio = np.maximum.accumulate(np.where(empieza, columnas, 0), axis=1)
+        fin = np.minimum.accumulate(np.where(termina, columnas, cantidad - 1)[:, ::-1], axis=1)[:, ::-1]
+        mejor = np.empty_like(orden)
+        peor = np.empty_like(orden)
+        np.put_along_axis(mejor, orden, inicio + 1, axis=1)
+        np.put_along_axis(peor, orden, fin + 1, axis=1)
+
+        # Empates ya resueltos: el otro queda delante seguro, o el equipo no puede quedar detrás
+        definidos = self._empates_definidos()
+        for equipo in np.flatnonzero(definidos.any(axis=0) | definidos.any(axis=1)).tolist():
+            empate = vectores == vectores[:, equipo:equipo + 1]
+            mejor[:, equipo] += (empate & definidos[equipo]).sum(axis=1)
+            peor[:, equipo] -= (empate & definidos[:, equipo]).sum(axis=1)
+
+        # (mejor puesto, peor puesto, puntos) posibles de cada equipo, sin repetidos (codificados en un entero)
+        tope = int(vectores.max()) + 1
+        self.escenarios = []
+        for equipo in range(cantidad):
+            codigos = np.unique((mejor[:, equipo] * (cantidad + 1) + peor[:, equipo]) * tope + vectores[:, equipo])
+            puestos, puntos = np.divmod(codigos, tope)
+            self.escenarios.append(set(zip(
+                (puestos // (cantidad + 1)).tolist(), (puestos % (cantidad + 1)).tolist(), puntos.tolist()
+            )))
+        # Ocupantes posibles de cada puesto con cupo limitado: (equipo, puntos mínimos, puntos máximos)
+        self.ocupantes = {}
+        for puesto in self.limitados:
+            if len(self.filas) >= puesto:
+                vector, ocupante = np.nonzero((mejor <= puesto) & (peor >= puesto))
+                puntos = vectores[vector, ocupante]
+                self.ocupantes[puesto] = [(equipo, p, p) for equipo, p in set(zip(ocupante.tolist(), puntos.tolist()))]
+
+    def _acotar(self):
+        cantidad = len(self.filas)
+        indices = np.arange(cantidad)
+        definidos = self._empates_definidos()
+        self.escenarios = []
+        self.ocupantes = {puesto: [] for puesto in self.limitados if cantidad >= puesto}
+        for equipo in range(cantidad):
+            otros = indices != equipo
+            # Delante seguro: supera incluso con sus peores resultados; posible: con los mejores.
+            # Un empate en puntos solo cuenta como seguro si ya está resuelto a favor del otro,
+            # y como posible salvo que ya esté resuelto a favor del equipo
+            delante_seguro = (self.minimo[otros] > self.maximo[equipo]) | (
+                (self.minimo[otros] == self.maximo[equipo]) & definidos[equipo, otros])
+            delante_posible = (self.maximo[otros] > self.minimo[equipo]) | (
+                (self.maximo[otros] == self.minimo[equipo]) & ~definidos[otros, equipo])
+            mejor = 1 + int(delante_seguro.sum())
+            peor = 1 + int(delante_posible.sum())
+            self.escenarios.append({'mejor': mejor, 'peor': peor})
+            for puesto in self.ocupantes:
+                if mejor <= puesto <= peor:
+                    self.ocupantes[puesto].append((equipo, int(self.minimo[equipo]), int(self.maximo[equipo])))
+
+
+def _supera(desempate, rival, otro, puntos_otro, grupo, equipo, puntos):
+    """Si el equipo del mismo puesto de otro grupo queda delante, o None si depende de lo que falta.
+
+    Los puntos son los del escenario; los demás criterios solo están
+    definidos cuando ninguno de los dos tiene partidos pendientes. Ante
+    igualdad en todo, como en la siembra, queda delante el grupo anterior.
+    """
+    for criterio in desempate:
+        if criterio == 'puntos_totales':
+            valor_otro, valor = puntos_otro, puntos
+        elif rival.fijo[otro] and grupo.fijo[equipo]:
+            valor_otro, valor = rival.valores[criterio][otro], grupo.valores[criterio][equipo]
+        else:
+            return None  # Con márgenes abiertos el desempate puede ir para cualquier lado
+        if valor_otro != valor:
+            return bool(valor_otro > valor if CRITERIOS[criterio] else valor_otro < valor)
+    return rival.orden < grupo.orden
+
+
+def _puede_superar(desempate, rival, otro, puntos_otro, grupo, equipo, puntos):
+    """El equipo del mismo puesto de otro grupo podría quedar delante"""
+    return _supera(desempate, rival, otro, puntos_otro, grupo, equipo, puntos) is not False
+
+
+def _supera_seguro(desempate, rival, otro, puntos_otro, grupo, equipo, puntos):
+    """El equipo del mismo puesto de otro grupo queda delante en cualquier caso"""
+    return _supera(desempate, rival, otro, puntos_otro, grupo, equipo, puntos) is True
+
+
+def _rivales_que_pueden_superar(desempate, grupos, grupo, equipo, puesto, puntos):
+    return sum(
+        1 for rival in grupos if rival is not grupo and any(
+            _puede_superar(desempate, rival, otro, maximo, grupo, equipo, puntos)
+            for otro, _, maximo in rival.ocupantes.get(puesto, ())
+        )
+    )
+
+
+def _rivales_que_superan_seguro(desempate, grupos, grupo, equipo, puesto, puntos):
+    return sum(
+        1 for rival in grupos if rival is not grupo and rival.ocupantes.get(puesto) and all(
+            _supera_seguro(desempate, rival, otro, minimo, grupo, equipo, puntos)
+            for otro, minimo, _ in rival.ocupantes[puesto]
+        )
+    )
+
+
+def _situacion_equipo(grupos, grupo, equipo, regla, directos, limitados):
+    """Estado del equipo; directos: puestos en los que entran todos; limitados: {puesto: cupo} del resto con cupo"""
+    escenarios = grupo.escenarios[equipo]
+
+    if not grupo.exacto:
+        puestos = range(escenarios['mejor'], escenarios['peor'] + 1)
+        if all(puesto in directos for puesto in puestos):
+            return CLASIFICADO
+        if not any(puesto in directos or puesto in limitados for puesto in puestos):
+            return ELIMINADO
+        return EN_JUEGO
+
+    asegurado = True
+    eliminado = True
+    for mejor, peor, puntos in escenarios:
+        # Cualquier puesto entre el mejor y el peor es posible con los empates abiertos
+        for puesto in range(mejor, peor + 1):
+            if puesto in directos:
+                eliminado = False
+            elif puesto not in limitados:
+                asegurado = False
+            else:
+                # Peor caso: todos los rivales del puesto que pueden superarlo lo hacen a la vez (grupos independientes)
+                if asegurado and _rivales_que_pueden_superar(
+                        regla.desempate, grupos, grupo, equipo, puesto, puntos) >= limitados[puesto]:
+                    asegurado = False
+                # Mejor caso: solo lo superan los rivales que lo hacen en cualquier resultado
+                if eliminado and _rivales_que_superan_seguro(
+                        regla.desempate, grupos, grupo, equipo, puesto, puntos) < limitados[puesto]:
+                    eliminado = False
+
+        if not asegurado and not eliminado:
+            return EN_JUEGO
+
+    if asegurado:
+        return CLASIFICADO
+    if eliminado:
+        return ELIMINADO
+    return EN_JUEGO
+
+
+def situacion_zona(categoria, zona):
+    """Situación matemática de cada equipo de la zona: {(grupo, equipo): estado}"""
+    almacen = categoria.almacen
+    regla = regla_de(categoria, zona)
+    ids = categoria.grupos_de_zona(zona)
+
+    # Cupos como en la siembra: un puesto es directo si entran los equipos de ese puesto de todos los grupos
+    tamanos = [int(almacen.grupo_fin[grupo] - almacen.grupo_inicio[grupo]) for grupo in ids]
+    cupos = regla.cupos_en_cuadro(tamanos)
+    directos = {puesto for puesto, cupo in cupos.items() if cupo and cupo == sum(t >= puesto for t in tamanos)}
+    limitados = {puesto: cupo for puesto, cupo in cupos.items() if cupo and puesto not in directos}
+
+    grupos = [_Grupo(almacen, grupo, orden, regla.desempate, limitados) for orden, grupo in enumerate(ids)]
+
+    situacion = {}
+    for grupo in grupos:
+        for equipo, fila in enumerate(grupo.filas):
+            clave = (almacen.nombre_grupo_de_fila(fila), almacen.equipo[fila])
+            situacion[clave] = _situacion_equipo(grupos, grupo, equipo, regla, directos, limitados)
+    return situacion
+
+
+def situacion_completa(almacen):
+    """Situación de todas las zonas de todas las categorías: {(categoría, zona): situación}"""
+    resultados = {}
+    for nombre in dict.fromkeys(almacen.categorias):
+        categoria = almacen.categoria(nombre)
+        for zona in categoria.zonas:
+            resultados[(nombre, zona)] = situacion_zona(categoria, zona)
+    return resultados
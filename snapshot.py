@@ -0,0 +1,193 @@
+"""Snapshot binario del almacén de clasificaciones.
+
+Compila el JSON del scraper (``metadata`` + ``datos``) a un único archivo con
+una cabecera JSON (metadata, versión y tablas de strings) seguida de las
+columnas del almacén como arreglos crudos alineados. Al abrirlo, las columnas
+se mapean en memoria con ``mmap``: no se parsea JSON ni se copian datos, y el
+sistema operativo carga las páginas a medida que se usan.
+
+La cabecera guarda también la versión del formato y la huella del reglamento
+compilado (las zonas de cada grupo salen de él): un snapshot escrito con otro
+formato u otro reglamento no está vigente y no se abre.
+
+Uso:
+    python snapshot.py basketball_complete_data.json [basketball_complete_data.snapshot]
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+
+import numpy as np
+
+from clasificacion import ARREGLOS_BASE, AlmacenClasificacion
+from desempate import COLUMNAS_PARTIDOS
+from reglas import REGLAS
+
+MAGIC = b'FEBSNAP1'
+ALINEACION = 64
+
+# Cambiar al modificar la cabecera o las columnas: invalida los snapshots escritos antes
+FORMATO = 2
+
+
+def ruta_snapshot(ruta_json):
+    """Ruta del snapshot que corresponde a un archivo JSON"""
+    base, _ = os.path.splitext(ruta_json)
+    return base + '.snapshot'
+
+
+def ruta_snapshot_anterior(ruta_json):
+    """Snapshot de la versión previa del JSON, base del feed de cambios (lo escribe ``scraper.py``)"""
+    base, _ = os.path.splitext(ruta_json)
+    return base + '.anterior.snapshot'
+
+
+def _alinear(n):
+    return (n + ALINEACION - 1) // ALINEACION * ALINEACION
+
+
+def compilar_snapshot(ruta_json, ruta_salida=None):
+    """Convierte el JSON del scraper en un snapshot binario. Devuelve la ruta generada"""
+    ruta_salida = ruta_salida or ruta_snapshot(ruta_json)
+    almacen = AlmacenClasificacion.desde_archivo(ruta_json)
+    guardar_snapshot(almacen, ruta_salida)
+    return ruta_salida
+
+
+def guardar_snapshot(almacen, ruta):
+    """Escribe el almacén en formato snapshot (escritura atómica)"""
+    arreglos = {
+        'posicion': almacen.posicion,
+        'equipo_codigo': almacen.equipo_codigo,
+        'grupo_categoria': almacen.grupo_categoria,
+        'grupo_zona': almacen.grupo_zona,
+        'grupo_inicio': almacen.grupo_inicio,
+        'grupo_fin': almacen.grupo_fin,
+        **almacen.columnas,
+        **{columna: getattr(almacen, columna) for columna in COLUMNAS_PARTIDOS},
+    }
+
+    descriptores = {}
+    desplazamiento = 0
+    for nombre in ARREGLOS_BASE:
+        arreglo = np.ascontiguousarray(arreglos[nombre], dtype=ARREGLOS_BASE[nombre])
+        descriptores[nombre] = {
+            'dtype': arreglo.dtype.str,
+            'largo': len(arreglo),
+            'desplazamiento': desplazamiento,
+        }
+        desplazamiento = _alinear(desplazamiento + arreglo.nbytes)
+
+    cabecera = json.dumps({
+        'formato': FORMATO,
+        'reglamento': REGLAS.huella,
+        'version': almacen.version,
+        'metadata': _a_json(almacen.metadata),
+        'categorias': list(almacen.categorias),
+        'fases': list(almacen.fases),
+        'grupo_nombre': list(almacen.grupo_nombre),
+        'zonas': list(almacen.zonas),
+        'equipos': list(almacen.equipos),
+        'arreglos': descriptores,
+    }, ensure_ascii=False).encode('utf-8')
+    inicio_datos = _alinear(len(MAGIC) + 8 + len(cabecera))
+
+    temporal = ruta + '.tmp'
+    with open(temporal, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(cabecera)))
+        f.write(cabecera)
+        for nombre, descriptor in descriptores.items():
+            f.seek(inicio_datos + descriptor['desplazamiento'])
+            f.write(np.ascontiguousarray(arreglos[nombre], dtype=ARREGLOS_BASE[nombre]).tobytes())
+    os.replace(temporal, ruta)
+
+
+def _leer_cabecera(f, ruta):
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError(f"{ruta} no es un snapshot válido")
+    (largo_cabecera,) = struct.unpack('<Q', f.read(8))
+    return largo_cabecera, json.loads(f.read(largo_cabecera).decode('utf-8'))
+
+
+def _incompatibilidad(cabecera):
+    """Motivo por el que un snapshot no corresponde a este código y reglamento, o None"""
+    if cabecera.get('formato') != FORMATO:
+        return f"formato {cabecera.get('formato')} (se espera {FORMATO})"
+    if cabecera.get('reglamento') != REGLAS.huella:
+        return "escrito con otro reglamento"
+    return None
+
+
+def abrir_snapshot(ruta):
+    """Abre un snapshot y construye el almacén con las columnas mapeadas en memoria"""
+    with open(ruta, 'rb') as f:
+        largo_cabecera, cabecera = _leer_cabecera(f, ruta)
+        motivo = _incompatibilidad(cabecera)
+        if motivo:
+            raise ValueError(f"{ruta}: snapshot incompatible, {motivo}")
+        memoria = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    inicio_datos = _alinear(len(MAGIC) + 8 + largo_cabecera)
+    arreglos = {}
+    for nombre, descriptor in cabecera['arreglos'].items():
+        if descriptor['largo'] == 0:
+            arreglos[nombre] = np.empty(0, dtype=descriptor['dtype'])
+            continue
+        # np.frombuffer sobre el mmap: arreglo de solo lectura que comparte las páginas del archivo
+        arreglos[nombre] = np.frombuffer(
+            memoria,
+            dtype=descriptor['dtype'],
+            count=descriptor['largo'],
+            offset=inicio_datos + descriptor['desplazamiento'],
+        )
+
+    return AlmacenClasificacion.desde_columnas(
+        version=cabecera['version'],
+        metadata=cabecera['metadata'],
+        categorias=cabecera['categorias'],
+        fases=cabecera['fases'],
+        grupo_nombre=cabecera['grupo_nombre'],
+        zonas=cabecera['zonas'],
+        equipos=cabecera['equipos'],
+        arreglos=arreglos,
+    )
+
+
+def snapshot_vigente(ruta_json):
+    """Ruta del snapshot si existe, no es más viejo que el JSON y tiene este formato y reglamento, o None"""
+    ruta = ruta_snapshot(ruta_json)
+    try:
+        estado_snapshot = os.stat(ruta)
+    except OSError:
+        return None
+    try:
+        estado_json = os.stat(ruta_json)
+    except OSError:
+        estado_json = None
+    if estado_json is not None and estado_snapshot.st_mtime_ns < estado_json.st_mtime_ns:
+        return None
+    try:
+        with open(ruta, 'rb') as f:
+            _, cabecera = _leer_cabecera(f, ruta)
+    except (OSError, ValueError, struct.error):
+        return None
+    return None if _incompatibilidad(cabecera) else ruta
+
+
+def _a_json(valor):
+    """Convierte los valores congelados del almacén a tipos serializables"""
+    if hasattr(valor, 'items'):
+        return {clave: _a_json(v) for clave, v in valor.items()}
+    if isinstance(valor, tuple):
+        return [_a_json(v) for v in valor]
+    return valor
+
+
+if __name__ == '__main__':
+    if len(sys.argv) not in (2, 3):
+        print(__doc__)
+        sys.exit(1)
+    print(compilar_snapshot(*sys.argv[1:]))
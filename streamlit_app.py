@@ -1,8 +1,35 @@
 import streamlit as st
-import pandas as pd
-import json
-from datetime import datetime, timedelta
-import random
+import os
+import time
+import uuid
+
+# Sin pandas al importar la app: st.dataframe recibe listas de filas y lo carga
+# recién con la primera tabla, así el encabezado y la barra lateral no lo esperan
+from clasificacion import PUESTOS_CLASIFICACION, AlmacenClasificacion, estructura_bracket
+from busqueda import IndiceBusqueda
+from cambios import TIPOS as TIPOS_CAMBIO, comparar, zonas_cambiadas
+from carga_perezosa import CargadorPerezoso
+from clubes import DimensionClubes
+from cubo import construir_cubo, construir_zona
+from desempate import DESCRIPCION as DESCRIPCION_DESEMPATE
+from estilos import ARCHIVO_CSS, CSS_MINIFICADO, publicar_css
+from metricas import Metricas, iniciar_servidor, puerto_configurado
+from pronostico import SIMULACIONES as SIMULACIONES_GRUPOS, pronostico_zona, resultados_de
+from recarga import FuenteDatos
+from simulacion import CAMPEON, SIMULACIONES, simular_bracket
+from situacion import situacion_zona
+from snapshot import abrir_snapshot, ruta_snapshot_anterior, snapshot_vigente
+from tablas import tabla_equipos
+from trazas import ARCHIVO_TRAZAS, iniciar_rerun, terminar_rerun, traza
+
+# COPA_DATOS permite apuntar la app a otro archivo (por ejemplo, datos sintéticos para pruebas de carga)
+RUTA_DATOS = os.environ.get('COPA_DATOS', 'basketball_complete_data.json')
+
+# Semilla fija: todas las sesiones ven las mismas probabilidades para un mismo dataset
+SEMILLA_SIMULACION = 2025
+
+# A partir de este tamaño el JSON se carga por categoría, bajo demanda
+UMBRAL_CARGA_PEREZOSA = 8 * 1024 * 1024
 
 # Configuración de la página
 st.set_page_config(
@@ -11,483 +38,210 @@ st.set_page_config(
     layout="wide"
 )
 
-# CSS personalizado
-st.markdown("""
-<style>
-.main-header {
-    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-    padding: 2rem;
-    border-radius: 10px;
-    color: white;
-    text-align: center;
-    margin-bottom: 2rem;
-}
-
-.warning-banner {
-    background: linear-gradient(135deg, #f39c12, #e67e22);
-    color: white;
-    padding: 1rem;
-    border-radius: 10px;
-    text-align: center;
-    font-weight: bold;
-    margin-bottom: 2rem;
-}
-
-.categoria-header {
-    background: linear-gradient(135deg, #2c3e50, #3498db);
-    color: white;
-    padding: 1rem;
-    border-radius: 10px 10px 0 0;
-    text-align: center;
-    font-weight: bold;
-}
-
-.playoff-header {
-    background: linear-gradient(135deg, #e74c3c, #c0392b);
-    color: white;
-    padding: 1rem;
-    border-radius: 10px 10px 0 0;
-    text-align: center;
-    font-weight: bold;
-}
-
-.zona-playoff-header {
-    background: linear-gradient(135deg, #8e44ad, #9b59b6);
-    color: white;
-    padding: 1rem;
-    border-radius: 10px;
-    text-align: center;
-    font-weight: bold;
-    margin: 1rem 0;
-}
-
-.clasificado-directo {
-    background-color: #d4edda !important;
-}
-
-.playoff-tercero {
-    background-color: #fff3cd !important;
-}
-
-.eliminado {
-    background-color: #f8d7da !important;
-    opacity: 0.7;
-}
-
-.invicto {
-    background-color: #e8f5e8 !important;
-    border-left: 4px solid #28a745 !important;
-}
-
-.playoff-card {
-    background: white;
-    border: 2px solid #e74c3c;
-    border-radius: 10px;
-    padding: 1rem;
-    margin: 0.5rem 0;
-    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-}
-
-.team-superior {
-    background: linear-gradient(135deg, #27ae60, #2ecc71);
-    color: white;
-    padding: 0.5rem;
-    border-radius: 5px;
-    margin: 0.25rem 0;
-}
-
-.team-inferior {
-    background: linear-gradient(135deg, #e67e22, #f39c12);
-    color: white;
-    padding: 0.5rem;
-    border-radius: 5px;
-    margin: 0.25rem 0;
-}
-
-.vs-separator {
-    text-align: center;
-    font-size: 1.2rem;
-    font-weight: bold;
-    color: #e74c3c;
-    margin: 0.25rem 0;
-}
-
-.metric-card {
-    background: white;
-    padding: 1rem;
-    border-radius: 8px;
-    border-left: 4px solid #28a745;
-    margin: 0.5rem 0;
-}
-
-.zona-stats {
-    background: #f8f9fa;
-    padding: 1rem;
-    border-radius: 8px;
-    margin: 1rem 0;
-}
-
-.racha-positiva {
-    color: #28a745;
-    font-weight: bold;
-}
-
-.racha-negativa {
-    color: #dc3545;
-    font-weight: bold;
-}
-
-/* Estilos para el bracket de playoffs */
-.bracket-container {
-    background: linear-gradient(135deg, #f8f9fa, #e9ecef);
-    padding: 2rem;
-    border-radius: 15px;
-    margin: 1rem 0;
-    box-shadow: 0 8px 25px rgba(0,0,0,0.1);
-}
-
-.bracket-round {
-    display: flex;
-    flex-direction: column;
-    justify-content: space-around;
-    min-height: 600px;
-    margin: 0 1rem;
-}
-
-.bracket-game {
-    background: white;
-    border: 2px solid #e74c3c;
-    border-radius: 12px;
-    padding: 1rem;
-    margin: 0.5rem 0;
-    box-shadow: 0 6px 20px rgba(231, 76, 60, 0.15);
-    transition: all 0.3s ease;
-    position: relative;
-}
-
-.bracket-game:hover {
-    transform: translateY(-2px);
-    box-shadow: 0 8px 25px rgba(231, 76, 60, 0.25);
-}
-
-.game-header {
-    text-align: center;
-    font-weight: bold;
-    color: #e74c3c;
-    margin-bottom: 0.5rem;
-    font-size: 0.9rem;
-    text-transform: uppercase;
-    letter-spacing: 1px;
-}
-
-.bracket-team {
-    display: flex;
-    justify-content: space-between;
-    align-items: center;
-    padding: 0.75rem;
-    border-radius: 8px;
-    margin: 0.25rem 0;
-    font-weight: 500;
-    transition: all 0.2s ease;
-}
-
-.bracket-team:hover {
-    transform: scale(1.02);
-}
-
-.team-seed-1-4 {
-    background: linear-gradient(135deg, #28a745, #20c997);
-    color: white;
-    border-left: 4px solid #155724;
-}
-
-.team-seed-5-8 {
-    background: linear-gradient(135deg, #17a2b8, #6f42c1);
-    color: white;
-    border-left: 4px solid #0c5460;
-}
-
-.team-seed-9-12 {
-    background: linear-gradient(135deg, #ffc107, #fd7e14);
-    color: #212529;
-    border-left: 4px solid #856404;
-}
-
-.team-seed-13-16 {
-    background: linear-gradient(135deg, #dc3545, #e83e8c);
-    color: white;
-    border-left: 4px solid #721c24;
-}
-
-.team-info {
-    display: flex;
-    flex-direction: column;
-    flex-grow: 1;
-}
-
-.team-name {
-    font-weight: bold;
-    font-size: 1rem;
-    margin-bottom: 0.2rem;
-}
-
-.team-details {
-    font-size: 0.85rem;
-    opacity: 0.9;
-}
-
-.team-seed {
-    background: rgba(255,255,255,0.2);
-    color: white;
-    padding: 0.3rem 0.6rem;
-    border-radius: 50%;
-    font-weight: bold;
-    font-size: 0.9rem;
-    min-width: 2rem;
-    text-align: center;
-    margin-right: 0.75rem;
-    box-shadow: 0 2px 4px rgba(0,0,0,0.2);
-}
-
-.bracket-vs {
-    text-align: center;
-    font-weight: bold;
-    color: #e74c3c;
-    font-size: 1.1rem;
-    margin: 0.25rem 0;
-    text-shadow: 0 1px 2px rgba(0,0,0,0.1);
-}
-
-.round-title {
-    text-align: center;
-    background: linear-gradient(135deg, #6f42c1, #e83e8c);
-    color: white;
-    padding: 1rem;
-    border-radius: 10px;
-    margin-bottom: 1rem;
-    font-weight: bold;
-    font-size: 1.1rem;
-    text-transform: uppercase;
-    letter-spacing: 1px;
-    box-shadow: 0 4px 15px rgba(111, 66, 193, 0.3);
-}
-
-.future-round {
-    background: linear-gradient(135deg, #6c757d, #495057);
-    color: white;
-    padding: 1rem;
-    border-radius: 8px;
-    text-align: center;
-    margin: 0.5rem 0;
-    font-weight: 500;
-    opacity: 0.8;
-}
-
-.champion-spot {
-    background: linear-gradient(135deg, #ffd700, #ffed4e);
-    color: #212529;
-    padding: 2rem;
-    border-radius: 15px;
-    text-align: center;
-    font-weight: bold;
-    font-size: 1.2rem;
-    box-shadow: 0 8px 25px rgba(255, 215, 0, 0.4);
-    border: 3px solid #ffc107;
-}
-
-.playoff-button {
-    background: linear-gradient(135deg, #e74c3c, #c0392b) !important;
-    color: white !important;
-    border: none !important;
-    border-radius: 8px !important;
-    padding: 0.5rem 1rem !important;
-    font-weight: bold !important;
-    cursor: pointer !important;
-    transition: all 0.3s ease !important;
-    box-shadow: 0 4px 15px rgba(231, 76, 60, 0.3) !important;
-}
-
-.playoff-button:hover {
-    transform: translateY(-2px) !important;
-    box-shadow: 0 6px 20px rgba(231, 76, 60, 0.4) !important;
-    background: linear-gradient(135deg, #c0392b, #a93226) !important;
-}
-</style>
-""", unsafe_allow_html=True)
-
-@st.cache_data
-def load_data():
-    """Carga los datos desde el archivo JSON"""
+@st.cache_resource
+def url_estilos():
+    """URL del CSS minificado publicado como archivo estático, o None si no se puede servir"""
+    if not st.get_option("server.enableStaticServing"):
+        return None
+    try:
+        version = publicar_css()
+    except OSError:
+        return None
+    return f"app/static/{ARCHIVO_CSS}?v={version}"
+
+# CSS personalizado: el navegador descarga y cachea el archivo una sola vez;
+# en cada rerun solo viaja el <link>
+if url_estilos():
+    st.markdown(f'<link rel="stylesheet" href="{url_estilos()}">', unsafe_allow_html=True)
+else:
+    st.markdown(f"<style>{CSS_MINIFICADO}</style>", unsafe_allow_html=True)
+
+def cargar_almacen(ruta):
+    """Carga los datos en el almacén columnar, desde el snapshot binario si está al día o desde el JSON"""
+    snapshot = snapshot_vigente(ruta)
+    if snapshot:
+        return abrir_snapshot(snapshot)
     try:
-        with open('basketball_complete_data.json', 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        return data
+        # Archivos grandes: indexar categorías y decodificar solo la seleccionada
+        if os.path.getsize(ruta) > UMBRAL_CARGA_PEREZOSA:
+            return CargadorPerezoso(ruta)
+        return AlmacenClasificacion.desde_archivo(ruta)
     except FileNotFoundError:
         # Datos de ejemplo si no encuentra el archivo
-        return {
+        return AlmacenClasificacion({
             "metadata": {
                 "categorias_procesadas": ["U17 MASCULINO"],
                 "total_grupos": 25,
                 "fecha_scraping": "2025-06-09 01:01:01"
             },
             "datos": []
-        }
+        })
 
-def get_zona_from_group_name(group_name):
-    """Determina la zona correcta basándose en el nombre del grupo"""
-    group_upper = group_name.upper()
-    
-    if "CENTRO OESTE" in group_upper:
-        return "CENTRO"
-    elif "NORTE" in group_upper:
-        return "NORTE"
-    elif "CENTRO" in group_upper:
-        return "CENTRO"
-    elif "OESTE" in group_upper:
-        return "OESTE"
-    elif "SUR" in group_upper:
-        return "SUR"
+def cargar_anterior(ruta):
+    """Versión previa del dataset guardada por el scraper, o None"""
+    try:
+        return abrir_snapshot(ruta_snapshot_anterior(ruta))
+    except (OSError, ValueError):
+        return None
+
+# Derivados por zona (clave (categoría, tipo, zona, ...)) que se heredan si la zona no cambió
+DERIVADOS_DE_ZONA = ('tabla', 'situacion', 'simulacion', 'pronostico')
+
+def precalcular_derivados(derivados, almacen, anterior=None):
+    """Arma el cubo de cada categoría, el índice de búsqueda y los clubes para la versión recién publicada.
+
+    Con la versión ``anterior`` solo se recalculan las zonas cuyos datos
+    cambiaron: el resto del cubo y los derivados de esas zonas se reutilizan,
+    y queda armado el feed de cambios.
+    """
+    if isinstance(almacen, CargadorPerezoso):
+        # Carga perezosa: no forzar la decodificación de categorías que nadie pidió
+        nombres = almacen.categorias_en_memoria()
+        anterior = None
     else:
-        # Fallback: usar la primera palabra
-        return group_name.split()[0].upper()
+        nombres = dict.fromkeys(almacen.categorias)
+        derivados.obtener(almacen.version, ('busqueda',), lambda: IndiceBusqueda(almacen))
+        derivados.obtener(almacen.version, ('clubes',), lambda: DimensionClubes(almacen))
 
-def get_clasificados_por_zona(grupos, zona):
-    """Obtiene los 16 clasificados de una zona específica ordenados correctamente"""
-    # Filtrar grupos de la zona
-    grupos_zona = [g for g in grupos if get_zona_from_group_name(g['nombre']) == zona]
-    
-    if not grupos_zona:
-        return []
-    
-    primeros = []
-    segundos = []
-    terceros = []
-    
-    # Obtener equipos por posición en cada grupo
-    for grupo in grupos_zona:
-        clasificacion = sorted(grupo['clasificacion'], key=lambda x: x['posicion'])
-        
-        if len(clasificacion) >= 1:
-            equipo = clasificacion[0].copy()
-            equipo['zona_grupo'] = grupo['nombre']
-            equipo['tipo_clasificacion'] = "1º puesto"
-            primeros.append(equipo)
-        
-        if len(clasificacion) >= 2:
-            equipo = clasificacion[1].copy()
-            equipo['zona_grupo'] = grupo['nombre']
-            equipo['tipo_clasificacion'] = "2º puesto"
-            segundos.append(equipo)
-            
-        if len(clasificacion) >= 3:
-            equipo = clasificacion[2].copy()
-            equipo['zona_grupo'] = grupo['nombre']
-            equipo['tipo_clasificacion'] = "3º puesto"
-            terceros.append(equipo)
-    
-    # Función para ordenar por puntos, diferencia y puntos a favor
-    def sort_teams_by_points(teams):
-        return sorted(teams, key=lambda x: (
-            -x['puntos_totales'],                           # 1º criterio: puntos totales
-            -(x['puntos_favor'] - x['puntos_contra']),      # 2º criterio: diferencia de puntos  
-            -x['puntos_favor']                              # 3º criterio: puntos a favor
+    if isinstance(anterior, CargadorPerezoso):
+        anterior = None
+    cambiadas = ()
+    cubos_anteriores = {}
+    if anterior is not None:
+        cambiadas = zonas_cambiadas(anterior, almacen)
+        cubos_anteriores = {nombre: derivados.consultar(anterior.version, (nombre, 'cubo')) for nombre in nombres}
+        derivados.heredar(
+            anterior.version, almacen.version,
+            lambda clave: len(clave) > 2 and clave[1] in DERIVADOS_DE_ZONA and (clave[0], clave[2]) not in cambiadas
+        )
+    for nombre in nombres:
+        categoria = almacen.categoria(nombre)
+        derivados.obtener(
+            almacen.version, (nombre, 'cubo'),
+            lambda: construir_cubo(categoria, cubos_anteriores.get(nombre), cambiadas)
+        )
+    if anterior is not None:
+        derivados.obtener(almacen.version, ('cambios',), lambda: comparar(
+            anterior, almacen, cambiadas, zonas_anteriores(derivados, anterior),
+            lambda nombre, zona: derivados.consultar(almacen.version, (nombre, 'cubo'))['zonas'][zona],
         ))
-    
-    # Ordenar cada categoría por separado
-    primeros_ordenados = sort_teams_by_points(primeros)
-    segundos_ordenados = sort_teams_by_points(segundos)
-    terceros_ordenados = sort_teams_by_points(terceros)
-    
-    # Determinar cuántos terceros clasifican según la zona
-    if zona == "SUR":
-        terceros_clasifican = 2  # SUR: 7 zonas, 2 terceros
-    else:
-        terceros_clasifican = 4  # NORTE/CENTRO/OESTE: 6 zonas, 4 terceros
-    
-    # CORRECCIÓN: Mantener el orden jerárquico correcto
-    # 1º TODOS los primeros (ya ordenados por puntos)
-    # 2º TODOS los segundos (ya ordenados por puntos)  
-    # 3º Los mejores terceros (ya ordenados por puntos)
-    clasificados_finales = (
-        primeros_ordenados + 
-        segundos_ordenados + 
-        terceros_ordenados[:terceros_clasifican]
+
+def zonas_anteriores(derivados, anterior):
+    """``zona_anterior(categoría, zona)`` para el feed: del cubo cacheado de la versión anterior, o armando solo esa zona"""
+    def zona_anterior(nombre, zona):
+        cubo = derivados.consultar(anterior.version, (nombre, 'cubo'))
+        return cubo['zonas'][zona] if cubo else construir_zona(anterior.categoria(nombre), zona)
+    return zona_anterior
+
+@st.cache_resource
+def get_fuente_datos():
+    """Fuente de datos única por proceso, con recarga en caliente del JSON"""
+    fuente = FuenteDatos(RUTA_DATOS, cargar=cargar_almacen)
+    fuente.anterior = cargar_anterior(RUTA_DATOS)
+    fuente.al_publicar = lambda almacen: precalcular_derivados(fuente.derivados, almacen, fuente.anterior)
+    return fuente.iniciar()
+
+@st.cache_resource
+def get_metricas():
+    """Métricas del proceso, expuestas en /metrics por un servidor HTTP propio (COPA_METRICAS_PUERTO=0 lo desactiva)"""
+    metricas = Metricas()
+    metricas.fuente = get_fuente_datos()
+    puerto = puerto_configurado()
+    if puerto:
+        iniciar_servidor(metricas, puerto)
+    return metricas
+
+@traza
+def load_data():
+    """Devuelve el almacén publicado actualmente.
+
+    El almacén es de solo lectura y se comparte entre todas las sesiones del
+    proceso; cuando el JSON cambia, el hilo de recarga publica uno nuevo.
+    """
+    # Siempre es un acierto: las lecturas del archivo las cuenta la fuente
+    get_metricas().contar_load_data()
+    return get_fuente_datos().actual()
+
+def derivado(categoria, clave, calcular):
+    """Resultado derivado de una categoría, cacheado por versión del dataset"""
+    return get_fuente_datos().derivados.obtener(
+        categoria.almacen.version, (categoria.nombre,) + clave, calcular
     )
-    
-    # Asignar posiciones finales de playoff (1-16) manteniendo el orden jerárquico
-    for i, equipo in enumerate(clasificados_finales):
-        equipo['posicion_playoff'] = i + 1
-    
-    return clasificados_finales[:16]  # Asegurar máximo 16 equipos
 
-def generate_playoff_matchups(clasificados):
-    """Genera los enfrentamientos de playoff: 1vs16, 2vs15, etc."""
-    if len(clasificados) != 16:
-        return []
-    
-    enfrentamientos = []
+def cubo_de(categoria):
+    """Cubo precalculado de la categoría: clasificaciones, siembra, cruces y resúmenes por zona"""
+    return derivado(categoria, ('cubo',), lambda: construir_cubo(categoria))
+
+def indice_busqueda(almacen):
+    """Índice de nombres de equipos de todas las categorías, uno por versión del dataset"""
+    return get_fuente_datos().derivados.obtener(almacen.version, ('busqueda',), lambda: IndiceBusqueda(almacen))
+
+def dimension_clubes(almacen):
+    """Equipos y totales de cada club en todas las categorías, uno por versión del dataset"""
+    return get_fuente_datos().derivados.obtener(almacen.version, ('clubes',), lambda: DimensionClubes(almacen))
+
+def feed_cambios(almacen):
+    """Cambios de la versión publicada respecto de la anterior, o None si no hay con qué comparar"""
+    fuente = get_fuente_datos()
+    anterior = fuente.anterior
+    if anterior is None or fuente.actual() is not almacen:
+        return None
+    return fuente.derivados.obtener(almacen.version, ('cambios',), lambda: comparar(
+        anterior, almacen, zona_anterior=zonas_anteriores(fuente.derivados, anterior),
+        zona_nueva=lambda nombre, zona: cubo_de(almacen.categoria(nombre))['zonas'][zona],
+    ))
+
+def ir_a_zona(categoria, zona):
+    """Callback: abre la vista de clasificación de una zona en su categoría"""
+    st.session_state["seccion"] = "📊 Clasificaciones"
+    st.session_state["categoria"] = categoria
+    st.session_state["vista"] = f"📍 {zona}"
+    st.session_state[f"show_playoffs_{zona}"] = False
+
+def ir_a_equipo(aparicion):
+    """Callback de los resultados de búsqueda y de Mi Club: abre la región del equipo en su categoría"""
+    ir_a_zona(aparicion['categoria'], aparicion['zona'])
+    st.session_state["equipo_buscado"] = aparicion
+
+def show_team_search(almacen):
+    """Buscador de equipos en la barra lateral: cada resultado lleva a su grupo en cada categoría"""
+    consulta = st.sidebar.text_input("🔎 Buscar equipo", key="buscar_equipo", placeholder="Ej: Quilmes AC")
+    if not consulta.strip():
+        return
     
-    # Crear enfrentamientos: 1vs16, 2vs15, 3vs14, etc.
-    for i in range(8):
-        superior = clasificados[i]
-        inferior = clasificados[15 - i]
-        
-        enfrentamiento = {
-            'numero': i + 1,
-            'equipo_superior': {
-                'nombre': superior['equipo'],
-                'posicion': superior['posicion_playoff'],
-                'zona_grupo': superior['zona_grupo'],
-                'tipo': superior['tipo_clasificacion'],
-                'record': f"{superior['partidos_ganados']}-{superior['partidos_perdidos']}",
-                'puntos_totales': superior['puntos_totales'],
-                'diferencia': superior['puntos_favor'] - superior['puntos_contra']
-            },
-            'equipo_inferior': {
-                'nombre': inferior['equipo'],
-                'posicion': inferior['posicion_playoff'],
-                'zona_grupo': inferior['zona_grupo'],
-                'tipo': inferior['tipo_clasificacion'],
-                'record': f"{inferior['partidos_ganados']}-{inferior['partidos_perdidos']}",
-                'puntos_totales': inferior['puntos_totales'],
-                'diferencia': inferior['puntos_favor'] - inferior['puntos_contra']
-            }
-        }
-        
-        enfrentamientos.append(enfrentamiento)
+    indice = indice_busqueda(almacen)
+    encontrados = indice.buscar(consulta)
+    if not encontrados:
+        st.sidebar.caption("Sin resultados")
+        return
     
-    return enfrentamientos
-
-def get_team_seed_class(posicion):
-    """Obtiene la clase CSS según la posición del equipo"""
-    if posicion <= 4:
-        return "team-seed-1-4"
-    elif posicion <= 8:
-        return "team-seed-5-8"
-    elif posicion <= 12:
-        return "team-seed-9-12"
-    else:
-        return "team-seed-13-16"
+    for identificador in encontrados:
+        resultado = indice.resultado(identificador)
+        st.sidebar.markdown(f"**{resultado['nombre']}**")
+        for i, aparicion in enumerate(resultado['apariciones']):
+            seed = f" · seed #{aparicion['seed']}" if aparicion['seed'] else ""
+            st.sidebar.button(
+                f"{aparicion['categoria']} · {aparicion['grupo']} · {aparicion['posicion']}º{seed}",
+                key=f"buscar_{identificador}_{i}", use_container_width=True,
+                on_click=ir_a_equipo, args=(aparicion,)
+            )
+
+def _ficha_rival(inferior, icono):
+    """Ficha del equipo inferior de un cruce en el análisis del bracket; en un bye no hay rival"""
+    if inferior is None:
+        return "🟢 **LIBRE** • el superior pasa directo a la ronda siguiente"
+    return (f"{icono} **SEED #{inferior['posicion']} - {inferior['nombre']}**  \n"
+            f"📊 {inferior['record']} • {inferior['puntos_totales']} pts • {inferior['tipo']}")
 
-def show_playoff_bracket_modal(enfrentamientos, zona):
+@traza
+def show_playoff_bracket_modal(enfrentamientos, zona, regla, probabilidades=None):
     """Muestra el bracket de playoffs con diseño tipo modal"""
     
     # Header prominente tipo modal
     st.markdown(f"""
-    <div style="
-        background: linear-gradient(135deg, #e74c3c, #c0392b); 
-        color: white; 
-        padding: 2rem; 
-        border-radius: 15px; 
-        text-align: center; 
-        margin: 2rem 0;
-        box-shadow: 0 10px 30px rgba(231, 76, 60, 0.3);
-        border: 2px solid #ffffff;
-    ">
-        <h1 style="margin: 0; font-size: 2.5rem;">🏆 PLAYOFFS ZONA {zona}</h1>
-        <p style="margin: 0.5rem 0 0 0; font-size: 1.2rem; opacity: 0.9;">
-            Bracket Eliminatorio • 16 Equipos • Partido Único
-        </p>
+    <div class="bracket-modal-header">
+        <h1>🏆 PLAYOFFS ZONA {zona}</h1>
+        <p>Bracket Eliminatorio • {regla.cuadro} Equipos • Partido Único</p>
     </div>
     """, unsafe_allow_html=True)
     
@@ -495,114 +249,74 @@ def show_playoff_bracket_modal(enfrentamientos, zona):
         st.error("❌ No hay enfrentamientos disponibles")
         return
     
+    estructura = estructura_bracket(regla.cuadro)
+
     # Crear contenedor tipo modal
-    st.markdown("""
-    <div style="
-        background: linear-gradient(135deg, #f8f9fa, #e9ecef); 
-        padding: 2rem; 
-        border-radius: 15px; 
-        margin: 1rem 0;
-        border: 1px solid #dee2e6;
-        box-shadow: 0 15px 35px rgba(0,0,0,0.1);
-    ">
-    """, unsafe_allow_html=True)
+    st.markdown('<div class="bracket-modal">', unsafe_allow_html=True)
     
     # Dividir en pestañas
     tab1, tab2 = st.tabs(["🏀 Bracket Completo", "📊 Análisis"])
     
     with tab1:
-        # OCTAVOS DE FINAL
-        st.markdown("### ⚔️ OCTAVOS DE FINAL")
-        
-        col1, col2, col3, col4 = st.columns(4)
-        
-        # Dividir los 8 partidos en 4 columnas (2 partidos por columna)
-        for col_idx, col in enumerate([col1, col2, col3, col4]):
+        # Rondas, nombres y cruces salen del tamaño del cuadro de la zona
+        primera, *siguientes = estructura.rondas
+        st.markdown(f"### {primera.icono} {primera.nombre.upper()}")
+
+        # Los partidos de la primera ronda en hasta 4 columnas
+        columnas = st.columns(min(4, len(enfrentamientos)))
+        por_columna = -(-len(enfrentamientos) // len(columnas))
+        for col_idx, col in enumerate(columnas):
             with col:
-                # Dos partidos por columna
-                for partido_idx in range(2):
-                    enfrentamiento_idx = col_idx * 2 + partido_idx
-                    if enfrentamiento_idx < len(enfrentamientos):
-                        enfrentamiento = enfrentamientos[enfrentamiento_idx]
-                        superior = enfrentamiento['equipo_superior']
-                        inferior = enfrentamiento['equipo_inferior']
-                        
-                        st.info(f"""**Partido {enfrentamiento_idx + 1}**  
+                for enfrentamiento_idx in range(col_idx * por_columna, min((col_idx + 1) * por_columna, len(enfrentamientos))):
+                    enfrentamiento = enfrentamientos[enfrentamiento_idx]
+                    superior = enfrentamiento['equipo_superior']
+                    inferior = enfrentamiento['equipo_inferior']
+
+                    rival = f"#{inferior['posicion']} {inferior['nombre']}" if inferior else "Libre (pasa directo)"
+                    st.info(f"""**Partido {enfrentamiento['numero']}**  
 #{superior['posicion']} {superior['nombre']}  
 🆚  
-#{inferior['posicion']} {inferior['nombre']}""")
+{rival}""")
         
         st.markdown("---")
         
-        # CUARTOS DE FINAL
-        st.markdown("### ⚡ CUARTOS DE FINAL")
-        
-        col1, col2, col3, col4 = st.columns(4)
-        
-        cuartos = [
-            ("Ganador P1", "Ganador P8"),
-            ("Ganador P2", "Ganador P7"),
-            ("Ganador P3", "Ganador P6"),
-            ("Ganador P4", "Ganador P5")
-        ]
-        
-        for i, ((equipo1, equipo2), col) in enumerate(zip(cuartos, [col1, col2, col3, col4])):
-            with col:
-                st.warning(f"""**Cuarto {i+1}**  
+        # Rondas siguientes antes de la final
+        for ronda in siguientes[:-1]:
+            st.markdown(f"### {ronda.icono} {ronda.nombre.upper()}")
+
+            # Con menos de 4 partidos quedan centrados
+            if len(ronda.partidos) >= 4:
+                columnas, mensaje = st.columns(4), st.warning
+            else:
+                columnas, mensaje = st.columns(len(ronda.partidos) + 2)[1:-1], st.success
+            por_columna = -(-len(ronda.partidos) // len(columnas))
+            for i, (equipo1, equipo2) in enumerate(ronda.partidos):
+                with columnas[i // por_columna]:
+                    mensaje(f"""**{ronda.abreviatura}{i + 1}**  
 {equipo1}  
 🆚  
 {equipo2}""")
+
+            st.markdown("---")
         
-        st.markdown("---")
-        
-        # SEMIFINALES
-        st.markdown("### 🔥 SEMIFINALES")
-        
-        col1, col2, col3, col4 = st.columns(4)
-        
-        semis = [
-            ("Ganador C1", "Ganador C4"),
-            ("Ganador C2", "Ganador C3")
-        ]
-        
-        with col2:
-            st.success(f"""**Semifinal 1**  
-{semis[0][0]}  
-🆚  
-{semis[0][1]}""")
-        
-        with col3:
-            st.success(f"""**Semifinal 2**  
-{semis[1][0]}  
-🆚  
-{semis[1][1]}""")
-        
-        st.markdown("---")
-        
-        # FINAL
-        st.markdown("### 👑 FINAL")
+        # FINAL (con un cuadro de 2, la primera ronda ya es la final)
+        if siguientes:
+            st.markdown("### 👑 FINAL")
         
         col1, col2, col3 = st.columns([1, 2, 1])
         
         with col2:
-            st.success("""**GRAN FINAL**  
-Ganador SF1  
+            if siguientes:
+                equipo1, equipo2 = siguientes[-1].partidos[0]
+                st.success(f"""**GRAN FINAL**  
+{equipo1}  
 🆚  
-Ganador SF2""")
+{equipo2}""")
             
             st.markdown(f"""
-            <div style="
-                background: linear-gradient(135deg, #ffd700, #ffed4e); 
-                color: #212529; 
-                padding: 1.5rem; 
-                border-radius: 15px; 
-                text-align: center; 
-                margin-top: 1rem; 
-                border: 3px solid #ffc107;
-                box-shadow: 0 8px 25px rgba(255, 215, 0, 0.4);
-            ">
-                <h3 style="margin: 0;">👑 CAMPEÓN</h3>
-                <h2 style="margin: 0.5rem 0 0 0;">ZONA {zona}</h2>
+            <div class="champion-card">
+                <h3>👑 CAMPEÓN</h3>
+                <h2>ZONA {zona}</h2>
             </div>
             """, unsafe_allow_html=True)
     
@@ -610,7 +324,7 @@ Ganador SF2""")
         st.markdown("### 📊 ANÁLISIS DEL BRACKET")
         
         # Mostrar detalles completos de octavos
-        st.markdown("#### ⚔️ DETALLES DE OCTAVOS DE FINAL")
+        st.markdown(f"#### {primera.icono} DETALLES DE {primera.nombre.upper()}")
         
         for i in range(0, len(enfrentamientos), 2):
             col1, col2 = st.columns(2)
@@ -622,20 +336,18 @@ Ganador SF2""")
                     superior = enfrentamiento['equipo_superior']
                     inferior = enfrentamiento['equipo_inferior']
                     
-                    if superior['posicion'] <= 4:
+                    if superior['posicion'] <= estructura.favoritos:
                         st.success(f"""**⚡ PARTIDO {i+1}**  
 🥇 **SEED #{superior['posicion']} - {superior['nombre']}**  
 📊 {superior['record']} • {superior['puntos_totales']} pts • {superior['tipo']}  
 **🆚**  
-💥 **SEED #{inferior['posicion']} - {inferior['nombre']}**  
-📊 {inferior['record']} • {inferior['puntos_totales']} pts • {inferior['tipo']}""")
+{_ficha_rival(inferior, '💥')}""")
                     else:
                         st.info(f"""**⚡ PARTIDO {i+1}**  
 🥈 **SEED #{superior['posicion']} - {superior['nombre']}**  
 📊 {superior['record']} • {superior['puntos_totales']} pts • {superior['tipo']}  
 **🆚**  
-⚡ **SEED #{inferior['posicion']} - {inferior['nombre']}**  
-📊 {inferior['record']} • {inferior['puntos_totales']} pts • {inferior['tipo']}""")
+{_ficha_rival(inferior, '⚡')}""")
             
             # Partido derecho
             with col2:
@@ -644,20 +356,18 @@ Ganador SF2""")
                     superior = enfrentamiento['equipo_superior']
                     inferior = enfrentamiento['equipo_inferior']
                     
-                    if superior['posicion'] <= 4:
+                    if superior['posicion'] <= estructura.favoritos:
                         st.success(f"""**⚡ PARTIDO {i+2}**  
 🥇 **SEED #{superior['posicion']} - {superior['nombre']}**  
 📊 {superior['record']} • {superior['puntos_totales']} pts • {superior['tipo']}  
 **🆚**  
-💥 **SEED #{inferior['posicion']} - {inferior['nombre']}**  
-📊 {inferior['record']} • {inferior['puntos_totales']} pts • {inferior['tipo']}""")
+{_ficha_rival(inferior, '💥')}""")
                     else:
                         st.info(f"""**⚡ PARTIDO {i+2}**  
 🥈 **SEED #{superior['posicion']} - {superior['nombre']}**  
 📊 {superior['record']} • {superior['puntos_totales']} pts • {superior['tipo']}  
 **🆚**  
-⚡ **SEED #{inferior['posicion']} - {inferior['nombre']}**  
-📊 {inferior['record']} • {inferior['puntos_totales']} pts • {inferior['tipo']}""")
+{_ficha_rival(inferior, '⚡')}""")
         
         st.markdown("---")
         
@@ -665,16 +375,17 @@ Ganador SF2""")
         col1, col2 = st.columns(2)
         
         with col1:
-            st.markdown("#### 🏆 FAVORITOS (Seeds 1-4)")
-            mejores_seeds = sorted(enfrentamientos, key=lambda x: x['equipo_superior']['posicion'])[:4]
+            st.markdown(f"#### 🏆 FAVORITOS (Seeds 1-{estructura.favoritos})")
+            mejores_seeds = sorted(enfrentamientos, key=lambda x: x['equipo_superior']['posicion'])[:estructura.favoritos]
             for i, enf in enumerate(mejores_seeds):
                 superior = enf['equipo_superior']
                 st.success(f"**#{superior['posicion']} {superior['nombre']}**")
                 st.caption(f"📊 {superior['record']} • Diferencia: {superior['diferencia']:+d}")
         
         with col2:
-            st.markdown("#### 💥 DARK HORSES (Seeds 13-16)")
-            equipos_bajos = [enf['equipo_inferior'] for enf in enfrentamientos if enf['equipo_inferior']['posicion'] >= 13]
+            st.markdown(f"#### 💥 DARK HORSES (Seeds {estructura.underdogs}-{regla.cuadro})")
+            equipos_bajos = [enf['equipo_inferior'] for enf in enfrentamientos
+                             if enf['equipo_inferior'] and enf['equipo_inferior']['posicion'] >= estructura.underdogs]
             equipos_bajos.sort(key=lambda x: -x['puntos_totales'])
             for equipo in equipos_bajos:
                 st.error(f"**#{equipo['posicion']} {equipo['nombre']}**")
@@ -685,25 +396,28 @@ Ganador SF2""")
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            seeds_top = len([e for e in enfrentamientos if e['equipo_superior']['posicion'] <= 4])
+            seeds_top = len([e for e in enfrentamientos if e['equipo_superior']['posicion'] <= estructura.favoritos])
             st.metric("🥇 Top Seeds", seeds_top)
         
         with col2:
-            seeds_bajo = len([e for e in enfrentamientos if e['equipo_inferior']['posicion'] >= 13])
+            seeds_bajo = len([e for e in enfrentamientos if e['equipo_inferior'] and e['equipo_inferior']['posicion'] >= estructura.underdogs])
             st.metric("💥 Underdogs", seeds_bajo)
         
+        # Los byes no tienen rival: los promedios son sobre los cruces que se juegan
+        jugados = [e for e in enfrentamientos if e['equipo_inferior']]
+
         with col3:
-            promedio_sup = sum(e['equipo_superior']['puntos_totales'] for e in enfrentamientos) / len(enfrentamientos)
+            promedio_sup = sum(e['equipo_superior']['puntos_totales'] for e in jugados) / len(jugados) if jugados else 0
             st.metric("📊 Promedio Superior", f"{promedio_sup:.1f}")
         
         with col4:
-            promedio_inf = sum(e['equipo_inferior']['puntos_totales'] for e in enfrentamientos) / len(enfrentamientos)
+            promedio_inf = sum(e['equipo_inferior']['puntos_totales'] for e in jugados) / len(jugados) if jugados else 0
             st.metric("📊 Promedio Inferior", f"{promedio_inf:.1f}")
         
         # Partidos interesantes
         st.markdown("#### 🎯 PARTIDOS PARA VIGILAR")
         partidos_interesantes = []
-        for enf in enfrentamientos:
+        for enf in jugados:
             superior = enf['equipo_superior']
             inferior = enf['equipo_inferior']
             
@@ -720,10 +434,34 @@ Ganador SF2""")
                 st.caption(f"⚠️ {partido['razon']}")
         else:
             st.info("No hay partidos especialmente parejos detectados")
+
+        if probabilidades:
+            show_bracket_probabilities(probabilidades)
     
     st.markdown("</div>", unsafe_allow_html=True)
 
-def show_playoff_bracket(enfrentamientos, zona):
+@traza
+def show_bracket_probabilities(probabilidades):
+    """Muestra la probabilidad de cada equipo de llegar a cada ronda según la simulación"""
+    st.markdown("#### 🎲 PROBABILIDADES (SIMULACIÓN MONTE CARLO)")
+    st.caption(f"{SIMULACIONES:,} simulaciones del bracket • Expectativa pitagórica según puntos a favor y en contra")
+
+    favorito = max(probabilidades, key=lambda x: x[CAMPEON])
+    st.success(f"👑 **Favorito:** #{favorito['posicion']} {favorito['nombre']} ({favorito[CAMPEON]:.1%} de ser campeón)")
+
+    data = []
+    # Rondas a las que se puede llegar después de la primera, según el cuadro simulado
+    rondas = [clave for clave in probabilidades[0] if clave not in ('nombre', 'posicion')][1:]
+    for equipo in probabilidades:
+        fila = {'Seed': equipo['posicion'], 'Equipo': equipo['nombre']}
+        for ronda in rondas:
+            fila[ronda] = f"{equipo[ronda]:.1%}"
+        data.append(fila)
+
+    st.dataframe(data, use_container_width=True, hide_index=True)
+
+@traza
+def show_playoff_bracket(enfrentamientos, zona, regla):
     """Muestra el bracket completo de playoffs de forma visual"""
     st.markdown(f"#### 🏆 BRACKET DE PLAYOFFS - ZONA {zona}")
     
@@ -731,47 +469,21 @@ def show_playoff_bracket(enfrentamientos, zona):
         st.warning("No hay enfrentamientos disponibles")
         return
     
+    estructura = estructura_bracket(regla.cuadro)
+    primera, *siguientes = estructura.rondas
+
     # Crear el bracket visual usando columnas de Streamlit
-    st.markdown("##### 🥇 PRIMERA RONDA - OCTAVOS DE FINAL")
+    st.markdown(f"##### 🥇 PRIMERA RONDA - {primera.nombre.upper()}")
     
-    # Dividir en dos columnas para mejor visualización
+    # Dividir en dos columnas para mejor visualización: cada mitad del cuadro
     col1, col2 = st.columns(2)
+    mitad = -(-len(enfrentamientos) // 2)
     
-    # Primera mitad (enfrentamientos 1-4)
-    with col1:
-        st.markdown("**🔥 ZONA SUPERIOR**")
-        for i in range(0, 4):
-            if i < len(enfrentamientos):
-                enfrentamiento = enfrentamientos[i]
-                superior = enfrentamiento['equipo_superior']
-                inferior = enfrentamiento['equipo_inferior']
-                
-                # Crear una caja visual para cada enfrentamiento
-                with st.container():
-                    st.markdown(f"""
-                    **Partido {i+1}**
-                    """)
-                    
-                    # Equipo superior (mejor clasificado)
-                    st.success(f"🥇 **#{superior['posicion']} {superior['nombre']}**  \n"
-                              f"📊 {superior['record']} ({superior['puntos_totales']} pts)  \n"  
-                              f"📍 {superior['zona_grupo']}")
-                    
-                    st.markdown("<div style='text-align: center; font-weight: bold; color: red;'>⚔️ VS ⚔️</div>", 
-                               unsafe_allow_html=True)
-                    
-                    # Equipo inferior (peor clasificado)
-                    st.warning(f"📍 **#{inferior['posicion']} {inferior['nombre']}**  \n"
-                              f"📊 {inferior['record']} ({inferior['puntos_totales']} pts)  \n"
-                              f"📍 {inferior['zona_grupo']}")
-                    
-                    st.markdown("---")
-    
-    # Segunda mitad (enfrentamientos 5-8)
-    with col2:
-        st.markdown("**🔥 ZONA INFERIOR**")
-        for i in range(4, 8):
-            if i < len(enfrentamientos):
+    for col, titulo, desde, hasta in ((col1, "**🔥 ZONA SUPERIOR**", 0, mitad),
+                                      (col2, "**🔥 ZONA INFERIOR**", mitad, len(enfrentamientos))):
+        with col:
+            st.markdown(titulo)
+            for i in range(desde, hasta):
                 enfrentamiento = enfrentamientos[i]
                 superior = enfrentamiento['equipo_superior']
                 inferior = enfrentamiento['equipo_inferior']
@@ -779,7 +491,7 @@ def show_playoff_bracket(enfrentamientos, zona):
                 # Crear una caja visual para cada enfrentamiento
                 with st.container():
                     st.markdown(f"""
-                    **Partido {i+1}**
+                    **Partido {enfrentamiento['numero']}**
                     """)
                     
                     # Equipo superior (mejor clasificado)
@@ -787,84 +499,74 @@ def show_playoff_bracket(enfrentamientos, zona):
                               f"📊 {superior['record']} ({superior['puntos_totales']} pts)  \n"
                               f"📍 {superior['zona_grupo']}")
                     
-                    st.markdown("<div style='text-align: center; font-weight: bold; color: red;'>⚔️ VS ⚔️</div>", 
+                    st.markdown("<div class='vs-separator'>⚔️ VS ⚔️</div>",
                                unsafe_allow_html=True)
                     
-                    # Equipo inferior (peor clasificado)
-                    st.warning(f"📍 **#{inferior['posicion']} {inferior['nombre']}**  \n"
-                              f"📊 {inferior['record']} ({inferior['puntos_totales']} pts)  \n"
-                              f"📍 {inferior['zona_grupo']}")
+                    # Equipo inferior (peor clasificado); en un bye no hay rival
+                    if inferior:
+                        st.warning(f"📍 **#{inferior['posicion']} {inferior['nombre']}**  \n"
+                                  f"📊 {inferior['record']} ({inferior['puntos_totales']} pts)  \n"
+                                  f"📍 {inferior['zona_grupo']}")
+                    else:
+                        st.info("🟢 **LIBRE** • pasa directo a la ronda siguiente")
                     
                     st.markdown("---")
     
-    # Mostrar siguiente ronda (visual)
-    st.markdown("##### 🏆 PRÓXIMAS RONDAS")
-    
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.info("""
-        **⚡ CUARTOS DE FINAL**
-        - Ganador P1 vs Ganador P8
-        - Ganador P2 vs Ganador P7  
-        - Ganador P3 vs Ganador P6
-        - Ganador P4 vs Ganador P5
-        """)
-    
-    with col2:
-        st.info("""
-        **🔥 SEMIFINALES**
-        - Ganador CF1 vs Ganador CF4
-        - Ganador CF2 vs Ganador CF3
-        """)
-    
-    with col3:
-        st.info("""
-        **🏆 FINAL**
-        - Ganador SF1 vs Ganador SF2
+    # Mostrar siguientes rondas (visual)
+    if siguientes:
+        st.markdown("##### 🏆 PRÓXIMAS RONDAS")
         
-        **👑 CAMPEÓN ZONAL**
-        """)
+        for ronda, col in zip(siguientes, st.columns(len(siguientes))):
+            with col:
+                cruces = "\n".join(f"- {equipo1} vs {equipo2}" for equipo1, equipo2 in ronda.partidos)
+                campeon = "\n\n**👑 CAMPEÓN ZONAL**" if ronda is siguientes[-1] else ""
+                st.info(f"**{ronda.icono} {ronda.nombre.upper()}**\n{cruces}{campeon}")
     
     # Mostrar estadísticas del bracket
     with st.expander(f"📊 Estadísticas del Bracket - Zona {zona}", expanded=False):
         # Top seeds
-        mejores_seeds = sorted(enfrentamientos, key=lambda x: x['equipo_superior']['posicion'])[:4]
-        st.markdown("**🥇 Mejores Clasificados (Seeds 1-4):**")
+        mejores_seeds = sorted(enfrentamientos, key=lambda x: x['equipo_superior']['posicion'])[:estructura.favoritos]
+        st.markdown(f"**🥇 Mejores Clasificados (Seeds 1-{estructura.favoritos}):**")
         
         for i, enf in enumerate(mejores_seeds):
             superior = enf['equipo_superior']
             st.write(f"**#{superior['posicion']} {superior['nombre']}** - {superior['record']} ({superior['diferencia']:+d})")
         
         # Equipos peligrosos (seeds bajos pero con buen récord)
-        st.markdown("**⚡ Equipos Peligrosos (Seeds 13-16):**")
-        equipos_bajos = [enf['equipo_inferior'] for enf in enfrentamientos if enf['equipo_inferior']['posicion'] >= 13]
+        st.markdown(f"**⚡ Equipos Peligrosos (Seeds {estructura.underdogs}-{regla.cuadro}):**")
+        equipos_bajos = [enf['equipo_inferior'] for enf in enfrentamientos
+                         if enf['equipo_inferior'] and enf['equipo_inferior']['posicion'] >= estructura.underdogs]
         equipos_bajos.sort(key=lambda x: -x['puntos_totales'])
         
-        for equipo in equipos_bajos[:4]:
+        for equipo in equipos_bajos:
             st.write(f"**#{equipo['posicion']} {equipo['nombre']}** - {equipo['record']} ({equipo['diferencia']:+d})")
     
     st.markdown("---")
 
-def show_playoffs_section(categoria_data, formato_playoff):
+@traza
+def show_playoffs_section(categoria, formato_playoff):
     """Muestra la sección completa de playoffs por zona"""
+    cubo = cubo_de(categoria)
+
+    # Zonas disponibles (ya ordenadas en el almacén) y el cuadro de cada una según el reglamento
+    zonas_disponibles = categoria.zonas
+    reglas_zonas = {zona: cubo['zonas'][zona]['regla'] for zona in zonas_disponibles}
+    cruces = " • ".join(
+        ", ".join(f"{seed}vs{cuadro + 1 - seed}" for seed in range(1, cuadro // 2 + 1))
+        for cuadro in sorted({regla.cuadro for regla in reglas_zonas.values()}, reverse=True)
+    )
     st.markdown(f"""
     <div class="playoff-header">
-        <h2>🏆 PLAYOFFS - {categoria_data['categoria']}</h2>
-        <p>Enfrentamientos por zona: 1vs16, 2vs15, 3vs14, 4vs13, 5vs12, 6vs11, 7vs10, 8vs9</p>
+        <h2>🏆 PLAYOFFS - {categoria.nombre}</h2>
+        <p>Enfrentamientos por zona: {cruces}</p>
     </div>
     """, unsafe_allow_html=True)
-    
-    grupos = categoria_data['grupos']
-    
-    # Obtener todas las zonas disponibles
-    zonas_disponibles = list(set([get_zona_from_group_name(g['nombre']) for g in grupos]))
-    zonas_disponibles.sort()
-    
+
     # Mostrar información general
     st.markdown("### 📊 Información General")
-    st.info("**Sistema de Playoffs:** Cada zona clasifica 16 equipos (primeros + segundos + mejores terceros) que se enfrentan en eliminación directa a partido único.")
-    
+    st.info("**Sistema de Playoffs:** Los clasificados de cada zona se enfrentan en eliminación directa a partido único.  \n"
+            + "  \n".join(f"**{zona}:** {regla.descripcion()}" for zona, regla in reglas_zonas.items()))
+
     # Procesar cada zona
     for zona in zonas_disponibles:
         st.markdown(f"""
@@ -874,10 +576,12 @@ def show_playoffs_section(categoria_data, formato_playoff):
         """, unsafe_allow_html=True)
         
         # Obtener clasificados de la zona
-        clasificados = get_clasificados_por_zona(grupos, zona)
+        clasificados = cubo['zonas'][zona]['clasificados']
         
-        if len(clasificados) < 16:
-            st.warning(f"⚠️ Zona {zona}: Solo {len(clasificados)} equipos clasificados. Se necesitan 16 para playoffs completos.")
+        # Con byes el cuadro se juega aunque falten equipos; sin byes hace falta completo
+        regla = cubo['zonas'][zona]['regla']
+        if not cubo['zonas'][zona]['enfrentamientos']:
+            st.warning(f"⚠️ Zona {zona}: Solo {len(clasificados)} equipos clasificados. Se necesitan {regla.cuadro} para playoffs completos.")
             continue
         
         # Mostrar estadísticas de la zona
@@ -899,12 +603,11 @@ def show_playoffs_section(categoria_data, formato_playoff):
             invictos = len([e for e in clasificados if e['partidos_perdidos'] == 0])
             st.metric("Invictos", invictos)
         
-        # Generar enfrentamientos
-        enfrentamientos = generate_playoff_matchups(clasificados)
+        # Enfrentamientos ya generados en el cubo
+        enfrentamientos = cubo['zonas'][zona]['enfrentamientos']
         
-        if enfrentamientos:
-            # Mostrar bracket visual completo
-            show_playoff_bracket(enfrentamientos, zona)
+        # Mostrar bracket visual completo
+        show_playoff_bracket(enfrentamientos, zona, regla)
         
         # Mostrar tabla de clasificados
         with st.expander(f"📋 Ver tabla completa de clasificados - Zona {zona}", expanded=False):
@@ -924,157 +627,63 @@ def show_playoffs_section(categoria_data, formato_playoff):
                     'Pts': equipo['puntos_totales']
                 })
             
-            df = pd.DataFrame(data)
-            st.dataframe(df, use_container_width=True)
+            st.dataframe(data, use_container_width=True)
         
         st.markdown("---")
 
-def calculate_diff(pf, pc):
-    """Calcula la diferencia de puntos"""
-    return pf - pc
+@traza
+def show_team_table(teams, title, classification_spots=None, situacion=None, categoria=None, clave=None):
+    """Muestra tabla de equipos con formato.
 
-def format_racha(racha):
-    """Formatea la racha con colores"""
-    if racha > 0:
-        return f'<span class="racha-positiva">+{racha}</span>'
-    elif racha < 0:
-        return f'<span class="racha-negativa">{racha}</span>'
-    else:
-        return '<span>0</span>'
-
-def classify_teams_by_region(grupos, region_name):
-    """Clasifica equipos por región según el sistema FeBAMBA"""
-    region_grupos = [g for g in grupos if get_zona_from_group_name(g['nombre']) == region_name.upper()]
-    
-    primeros = []
-    segundos = []
-    terceros = []
-    
-    # Obtener equipos por posición en cada grupo
-    for grupo in region_grupos:
-        # Tomar clasificacion tal como viene del JSON (ya tiene las posiciones correctas por grupo)
-        clasificacion = grupo['clasificacion']  
-        
-        # Encontrar por posición, no por índice
-        primer_puesto = next((equipo for equipo in clasificacion if equipo['posicion'] == 1), None)
-        segundo_puesto = next((equipo for equipo in clasificacion if equipo['posicion'] == 2), None)  
-        tercer_puesto = next((equipo for equipo in clasificacion if equipo['posicion'] == 3), None)
-        
-        if primer_puesto:
-            equipo = primer_puesto.copy()
-            equipo['zona'] = grupo['nombre']
-            primeros.append(equipo)
-            
-        if segundo_puesto:
-            equipo = segundo_puesto.copy() 
-            equipo['zona'] = grupo['nombre']
-            segundos.append(equipo)
-            
-        if tercer_puesto:
-            equipo = tercer_puesto.copy()
-            equipo['zona'] = grupo['nombre'] 
-            terceros.append(equipo)
-    
-    # Función para ordenar por puntos (dentro de cada categoría)
-    def sort_teams_by_performance(teams):
-        return sorted(teams, key=lambda x: (
-            -x['puntos_totales'],                           # 1º: Puntos totales (más puntos primero)
-            -(x['puntos_favor'] - x['puntos_contra']),      # 2º: Diferencia de puntos (mejor diferencia primero)  
-            -x['puntos_favor']                              # 3º: Puntos a favor (más puntos a favor primero)
-        ))
-    
-    # Ordenar cada categoría por separado (MANTENER JERARQUÍA)
-    primeros_ordenados = sort_teams_by_performance(primeros)
-    segundos_ordenados = sort_teams_by_performance(segundos)
-    terceros_ordenados = sort_teams_by_performance(terceros)
-    
-    return primeros_ordenados, segundos_ordenados, terceros_ordenados
-
-def show_team_table(teams, title, classification_spots=None):
-    """Muestra tabla de equipos con formato"""
+    Con ``categoria`` y ``clave`` el fragmento HTML se cachea por versión del
+    dataset y se reutiliza entre reruns y sesiones.
+    """
     if not teams:
         st.info(f"No hay datos para {title}")
         return
     
-    data = []
-    for i, team in enumerate(teams):
-        diff = calculate_diff(team['puntos_favor'], team['puntos_contra'])
-        racha_formatted = format_racha(team['racha'])
-        
-        estado = "✅ CLASIFICA"
-        if classification_spots and i >= classification_spots:
-            estado = "❌ ELIMINADO"
-        
-        invicto = "🏆" if team['partidos_perdidos'] == 0 and team['partidos_jugados'] > 0 else ""
-        
-        data.append({
-            'Pos': i + 1,
-            'Equipo': f"{invicto} {team['equipo']}",
-            'Zona': team.get('zona', ''),
-            'J': team['partidos_jugados'],
-            'G': team['partidos_ganados'],
-            'P': team['partidos_perdidos'],
-            'PF': team['puntos_favor'],
-            'PC': team['puntos_contra'],
-            'Diff': f"{diff:+d}",
-            'Pts': team['puntos_totales'],
-            'Racha': racha_formatted,
-            'Estado': estado if classification_spots else ""
-        })
-    
-    df = pd.DataFrame(data)
-    
-    st.markdown(f"### {title}")
-    
-    if classification_spots:
-        def highlight_rows(row):
-            if row.name < 2:
-                return ['background-color: #d4edda'] * len(row)
-            elif classification_spots and row.name < classification_spots:
-                return ['background-color: #fff3cd'] * len(row)
-            else:
-                return ['background-color: #f8d7da; opacity: 0.7'] * len(row)
-        
-        styled_df = df.style.apply(highlight_rows, axis=1)
+    if categoria is not None:
+        tabla = derivado(categoria, ('tabla',) + clave, lambda: tabla_equipos(teams, classification_spots, situacion))
     else:
-        styled_df = df.style.apply(lambda x: ['background-color: #d4edda'] * len(x), axis=1)
+        tabla = tabla_equipos(teams, classification_spots, situacion)
     
-    st.write(styled_df.to_html(escape=False, index=False), unsafe_allow_html=True)
+    st.markdown(f"### {title}")
+    st.write(tabla, unsafe_allow_html=True)
 
-def show_general_summary(grupos, regiones):
+@traza
+def show_general_summary(categoria, regiones):
     """Muestra resumen general de todas las regiones"""
+    with get_metricas().medir_vista('resumen', categoria.nombre):
+        show_general_summary_content(categoria, regiones)
+
+def show_general_summary_content(categoria, regiones):
     st.markdown("## 📊 Resumen General por Regiones")
     
+    cubo = cubo_de(categoria)
     cols = st.columns(min(len(regiones), 4))
     
     for i, region in enumerate(regiones):
         with cols[i % 4]:
-            region_grupos = [g for g in grupos if get_zona_from_group_name(g['nombre']) == region.upper()]
-            total_equipos = sum(len(g['clasificacion']) for g in region_grupos)
-            invictos = sum(1 for g in region_grupos for equipo in g['clasificacion'] 
-                          if equipo['partidos_perdidos'] == 0 and equipo['partidos_jugados'] > 0)
+            resumen = cubo['zonas'][region]['resumen']
             
             st.metric(
                 f"🏀 {region.upper()}",
-                f"{len(region_grupos)} zonas",
-                f"{total_equipos} equipos"
+                f"{resumen['grupos']} zonas",
+                f"{resumen['equipos']} equipos"
             )
-            st.caption(f"🏆 {invictos} invictos")
+            st.caption(f"🏆 {resumen['invictos']} invictos")
     
     # Mejores equipos por categoría
     st.markdown("### 🏆 Equipos Destacados")
     
-    todos_equipos = []
-    for grupo in grupos:
-        for equipo in grupo['clasificacion']:
-            equipo_info = {**equipo, 'zona': grupo['nombre']}
-            equipo_info['diferencia'] = equipo['puntos_favor'] - equipo['puntos_contra']
-            todos_equipos.append(equipo_info)
+    destacados = cubo['destacados']
+    if destacados is None:
+        return
     
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        mejor_record = max(todos_equipos, key=lambda x: (x['puntos_totales'], x['diferencia']))
+        mejor_record = destacados['mejor_record']
         st.success(f"""
         **🥇 Mejor Récord**
         {mejor_record['equipo']}
@@ -1083,7 +692,7 @@ def show_general_summary(grupos, regiones):
         """)
     
     with col2:
-        mejor_ataque = max(todos_equipos, key=lambda x: x['puntos_favor'])
+        mejor_ataque = destacados['mejor_ataque']
         st.info(f"""
         **⚡ Mejor Ataque**
         {mejor_ataque['equipo']}
@@ -1092,7 +701,7 @@ def show_general_summary(grupos, regiones):
         """)
     
     with col3:
-        mejor_defensa = min(todos_equipos, key=lambda x: x['puntos_contra'])
+        mejor_defensa = destacados['mejor_defensa']
         st.warning(f"""
         **🛡️ Mejor Defensa**
         {mejor_defensa['equipo']}
@@ -1100,13 +709,11 @@ def show_general_summary(grupos, regiones):
         {mejor_defensa['puntos_contra']} puntos en contra
         """)
     
-    # Equipos invictos
-    invictos = [e for e in todos_equipos if e['partidos_perdidos'] == 0 and e['partidos_jugados'] > 0]
-    if invictos:
+    # Equipos invictos (ya ordenados por puntos y diferencia)
+    if destacados['invictos']:
         st.markdown("### 🏆 Equipos Invictos")
-        invictos_sorted = sorted(invictos, key=lambda x: (-x['puntos_totales'], -x['diferencia']))
         
-        for equipo in invictos_sorted[:10]:
+        for equipo in destacados['invictos']:
             col1, col2, col3, col4 = st.columns([3, 1, 1, 1])
             with col1:
                 st.write(f"**{equipo['equipo']}** ({equipo['zona']})")
@@ -1117,7 +724,8 @@ def show_general_summary(grupos, regiones):
             with col4:
                 st.write(f"{equipo['diferencia']:+d}")
 
-def show_region_details(grupos, region_name):
+@traza
+def show_region_details(categoria, region_name):
     """Muestra detalles de una región específica"""
     st.markdown(f"## 📍 REGIÓN {region_name.upper()}")
     
@@ -1125,76 +733,115 @@ def show_region_details(grupos, region_name):
     if f"show_playoffs_{region_name}" not in st.session_state:
         st.session_state[f"show_playoffs_{region_name}"] = False
     
-    primeros, segundos, terceros = classify_teams_by_region(grupos, region_name)
+    # Llegada desde el buscador: ubicar al equipo en esta región
+    buscado = st.session_state.get("equipo_buscado")
+    if buscado and buscado['categoria'] == categoria.nombre and buscado['zona'] == region_name:
+        seed = f"seed #{buscado['seed']} en playoffs" if buscado['seed'] else "fuera de los clasificados"
+        st.info(f"🔎 **{buscado['equipo']}**: {buscado['grupo']}, {buscado['posicion']}º ({buscado['record']}) · {seed}")
+
+    show_region_content(categoria, region_name)
+
+def set_region_view(region_name, show_playoffs):
+    """Callback de los botones de vista: cambia el estado antes de re-ejecutar el fragmento"""
+    st.session_state[f"show_playoffs_{region_name}"] = show_playoffs
+
+@st.fragment
+@traza
+def show_region_content(categoria, region_name):
+    """Vista de clasificación o de playoffs de la región.
+
+    Es un fragmento: los botones que alternan la vista re-ejecutan y reenvían
+    solo esta parte de la página, no el script completo. La duración se mide
+    acá para contar también los reruns del fragmento solo.
+    """
+    metricas = get_metricas()
+    if "metricas_sesion" in st.session_state:
+        metricas.sesion_activa(st.session_state["metricas_sesion"])
+    vista = 'playoffs' if st.session_state[f"show_playoffs_{region_name}"] else 'region'
+    with metricas.medir_vista(vista, categoria.nombre, region_name.upper()):
+        show_region_view(categoria, region_name)
+
+def show_region_view(categoria, region_name):
+    """Botones de vista y contenido de la región según el estado de la sesión"""
+    zona = region_name.upper()
+    cubo_zona = cubo_de(categoria)['zonas'][zona]
+    primeros, segundos, terceros = cubo_zona['primeros'], cubo_zona['segundos'], cubo_zona['terceros']
     
     # Botones para alternar entre vistas
     col1, col2, col3 = st.columns([2, 1, 1])
     
     with col2:
-        if st.button(f"🏆 Ver Playoffs", key=f"show_playoff_btn_{region_name}", 
-                    help="Ver bracket completo de playoffs para esta región",
-                    use_container_width=True):
-            st.session_state[f"show_playoffs_{region_name}"] = True
+        st.button(f"🏆 Ver Playoffs", key=f"show_playoff_btn_{region_name}",
+                  help="Ver bracket completo de playoffs para esta región",
+                  use_container_width=True, on_click=set_region_view, args=(region_name, True))
     
     with col3:
-        if st.button(f"📊 Ver Clasificación", key=f"show_classification_btn_{region_name}", 
-                    help="Volver a ver las clasificaciones",
-                    use_container_width=True):
-            st.session_state[f"show_playoffs_{region_name}"] = False
+        st.button(f"📊 Ver Clasificación", key=f"show_classification_btn_{region_name}",
+                  help="Volver a ver las clasificaciones",
+                  use_container_width=True, on_click=set_region_view, args=(region_name, False))
     
     # Mostrar contenido según el estado
     if st.session_state[f"show_playoffs_{region_name}"]:
         # Vista de Playoffs
         st.markdown("---")
         
-        # Obtener clasificados para playoffs
-        clasificados = get_clasificados_por_zona(grupos, region_name.upper())
+        # Clasificados y cruces para playoffs
+        clasificados = cubo_zona['clasificados']
         
-        if len(clasificados) >= 16:
-            enfrentamientos = generate_playoff_matchups(clasificados)
-            if enfrentamientos:
-                show_playoff_bracket_modal(enfrentamientos, region_name.upper())
+        # Con byes el cuadro se juega aunque falten equipos; sin byes hace falta completo
+        regla = cubo_zona['regla']
+        enfrentamientos = cubo_zona['enfrentamientos']
+        if enfrentamientos:
+            probabilidades = derivado(
+                categoria, ('simulacion', zona),
+                lambda: simular_bracket(enfrentamientos, regla.cuadro, semilla=SEMILLA_SIMULACION)
+            )
+            show_playoff_bracket_modal(enfrentamientos, zona, regla, probabilidades)
         else:
-            st.error(f"⚠️ No hay suficientes equipos clasificados en {region_name.upper()} para generar playoffs completos ({len(clasificados)}/16)")
+            st.error(f"⚠️ No hay suficientes equipos clasificados en {region_name.upper()} para generar playoffs completos ({len(clasificados)}/{regla.cuadro})")
             
         st.markdown("---")
         
-        # Botón para volver
-        if st.button("⬅️ Volver a Clasificaciones", key=f"back_btn_{region_name}"):
-            st.session_state[f"show_playoffs_{region_name}"] = False
-            st.rerun()
+        # Botón para volver (el callback ya cambia la vista: no hace falta otro rerun)
+        st.button("⬅️ Volver a Clasificaciones", key=f"back_btn_{region_name}",
+                  on_click=set_region_view, args=(region_name, False))
     
     else:
         # Vista de Clasificaciones (por defecto)
+        regla = cubo_zona['regla']
+        terceros_clasifican = regla.cupo(PUESTOS_CLASIFICACION)
         with st.expander("📋 Sistema de Clasificación", expanded=False):
-            if region_name.upper() == "SUR":
-                st.info("**SUR (7 zonas):** Los 2 mejores de cada zona + los 2 mejores 3eros = 16 clasificados")
-                terceros_clasifican = 2
-            else:
-                st.info("**NORTE/CENTRO/OESTE (6 zonas c/u):** Los 2 mejores de cada zona + los 4 mejores 3eros = 16 clasificados")
-                terceros_clasifican = 4
+            st.info(f"**{zona} ({cubo_zona['resumen']['grupos']} zonas):** {regla.descripcion()}")
             
-            st.markdown("**⚖️ Desempate Olímpico:** Puntos → Diferencia → Puntos a favor → Enfrentamiento directo")
+            st.markdown(f"**⚖️ Desempate Olímpico (dentro del grupo):** {DESCRIPCION_DESEMPATE}")
+            st.markdown(f"**⚖️ Entre grupos (mejores terceros):** {regla.descripcion_desempate()}")
+
+        # Situación matemática con los partidos que faltan (clasificado asegurado / eliminado)
+        situacion = derivado(
+            categoria, ('situacion', region_name.upper()),
+            lambda: situacion_zona(categoria, region_name.upper())
+        )
         
         if primeros:
-            show_team_table(primeros, "🥇 Primeros Lugares (Clasificados Directos)")
+            show_team_table(primeros, "🥇 Primeros Lugares (Clasificados Directos)", situacion=situacion,
+                           categoria=categoria, clave=(zona, 'primeros'))
         
         if segundos:
-            show_team_table(segundos, "🥈 Segundos Lugares (Clasificados Directos)")
+            show_team_table(segundos, "🥈 Segundos Lugares (Clasificados Directos)", situacion=situacion,
+                           categoria=categoria, clave=(zona, 'segundos'))
         
         if terceros:
-            show_team_table(terceros, f"🥉 Mejores Terceros ({terceros_clasifican if region_name.upper() != 'SUR' else 2} clasifican)", 
-                           terceros_clasifican if region_name.upper() != 'SUR' else 2)
+            show_team_table(terceros, f"🥉 Mejores Terceros ({terceros_clasifican} clasifican)",
+                           terceros_clasifican, situacion=situacion, categoria=categoria, clave=(zona, 'terceros'))
         
         # Estadísticas de la región
         st.markdown("### 📈 Estadísticas de la Región")
-        region_grupos = [g for g in grupos if get_zona_from_group_name(g['nombre']) == region_name.upper()]
+        resumen = cubo_zona['resumen']
         
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            total_equipos = sum(len(g['clasificacion']) for g in region_grupos)
-            st.metric("Total Equipos", total_equipos)
+            st.metric("Total Equipos", resumen['equipos'])
         
         with col2:
             invictos = len([e for e in primeros + segundos + terceros 
@@ -1202,7 +849,33 @@ def show_region_details(grupos, region_name):
             st.metric("Equipos Invictos", invictos)
         
         with col3:
-            st.metric("Zonas", len(region_grupos))
+            st.metric("Zonas", resumen['grupos'])
+
+        with st.expander("🎲 Probabilidades de Clasificación (partidos restantes)", expanded=False):
+            pronostico = derivado(
+                categoria, ('pronostico', zona),
+                lambda: pronostico_zona(categoria, zona, semilla=SEMILLA_SIMULACION)
+            )
+            show_qualification_odds(pronostico, cubo_zona['regla'])
+
+def show_qualification_odds(pronostico, regla):
+    """Muestra la probabilidad de cada equipo de clasificar desde cada puesto con cupo o quedar eliminado"""
+    st.caption(f"{SIMULACIONES_GRUPOS:,} simulaciones de los partidos que faltan jugar en cada grupo")
+
+    data = []
+    for equipo in pronostico:
+        fila = {
+            'Grupo': equipo['zona'],
+            'Pos': equipo['posicion'],
+            'Equipo': equipo['equipo'],
+            'J': equipo['partidos_jugados'],
+            'Pts': equipo['puntos_totales'],
+        }
+        for resultado in resultados_de(regla):
+            fila[resultado] = f"{equipo[resultado]:.1%}"
+        data.append(fila)
+
+    st.dataframe(data, use_container_width=True, hide_index=True)
 
 def main():
     # Header principal
@@ -1214,9 +887,9 @@ def main():
     """, unsafe_allow_html=True)
     
     # Cargar datos
-    data = load_data()
+    almacen = load_data()
     
-    if not data['datos']:
+    if not almacen.categorias:
         st.error("No se pudieron cargar los datos. Asegúrate de que el archivo JSON esté disponible.")
         return
     
@@ -1224,50 +897,58 @@ def main():
     with st.expander("📊 Información del Dataset", expanded=False):
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("Categorías Procesadas", len(data['metadata']['categorias_procesadas']))
+            st.metric("Categorías Procesadas", len(almacen.metadata['categorias_procesadas']))
         with col2:
-            st.metric("Total de Grupos", data['metadata']['total_grupos'])
+            st.metric("Total de Grupos", almacen.metadata['total_grupos'])
         with col3:
-            st.metric("Última Actualización", data['metadata']['fecha_scraping'].split()[0])
+            st.metric("Última Actualización", almacen.metadata['fecha_scraping'].split()[0])
         
         st.markdown("**Categorías disponibles:**")
-        st.write(", ".join(data['metadata']['categorias_procesadas']))
+        st.write(", ".join(almacen.metadata['categorias_procesadas']))
+
+        cache = get_fuente_datos().derivados.estadisticas()
+        st.caption(
+            f"Versión {almacen.version} · cache de derivados: {cache['aciertos']} aciertos, "
+            f"{cache['fallos']} cálculos"
+        )
     
     # Sidebar para navegación
     st.sidebar.title("🏀 Navegación")
+    show_team_search(almacen)
     
     # Selector de categoría
-    categorias_disponibles = [d['categoria'] for d in data['datos']]
+    categorias_disponibles = almacen.categorias
     categoria_seleccionada = st.sidebar.selectbox(
         "Seleccionar Categoría:",
         categorias_disponibles,
-        index=0
+        index=0,
+        key="categoria"
     )
     
     # Obtener datos de la categoría seleccionada
-    categoria_data = next(d for d in data['datos'] if d['categoria'] == categoria_seleccionada)
-    grupos = categoria_data['grupos']
+    categoria = almacen.categoria(categoria_seleccionada)
     
     # Selector de sección principal
     seccion_principal = st.sidebar.radio(
         "Sección Principal:",
-        ["📊 Clasificaciones"]
+        ["📊 Clasificaciones", "🏟️ Mi Club", "🆕 Últimos cambios"],
+        key="seccion"
     )
     
     if seccion_principal == "📊 Clasificaciones":
         # Selector de región para clasificaciones
-        regiones_disponibles = list(set([get_zona_from_group_name(g['nombre']) for g in grupos]))
-        regiones_disponibles.sort()
+        regiones_disponibles = categoria.zonas
         
         region_view = st.sidebar.selectbox(
             "Seleccionar Vista:",
-            ["📊 Resumen General"] + [f"📍 {region}" for region in regiones_disponibles]
+            ["📊 Resumen General"] + [f"📍 {region}" for region in regiones_disponibles],
+            key="vista"
         )
         
         # Mostrar información de la categoría
         st.markdown(f"""
         <div class="categoria-header">
-            <h2>{categoria_data['categoria']} - {categoria_data['fase']}</h2>
+            <h2>{categoria.nombre} - {categoria.fase}</h2>
         </div>
         """, unsafe_allow_html=True)
         
@@ -1279,10 +960,166 @@ def main():
         """, unsafe_allow_html=True)
         
         if region_view == "📊 Resumen General":
-            show_general_summary(grupos, regiones_disponibles)
+            show_general_summary(categoria, regiones_disponibles)
         else:
             region_name = region_view.replace("📍 ", "")
-            show_region_details(grupos, region_name)
+            show_region_details(categoria, region_name)
+    elif seccion_principal == "🏟️ Mi Club":
+        show_club_page(almacen)
+    elif seccion_principal == "🆕 Últimos cambios":
+        show_cambios_page(almacen)
+
+@traza
+def show_club_page(almacen):
+    """Todos los equipos de un club en todas las categorías, sin recorrer las clasificaciones"""
+    with get_metricas().medir_vista('club', 'TODAS'):
+        show_club_content(almacen)
+
+def show_club_content(almacen):
+    st.markdown("## 🏟️ Mi Club")
+
+    clubes = dimension_clubes(almacen)
+    if not len(clubes):
+        st.info("No hay equipos en el dataset")
+        return
+    if st.session_state.get("mi_club") not in clubes:
+        st.session_state.pop("mi_club", None)
+
+    nombre = st.selectbox("Club:", clubes.nombres, key="mi_club")
+    club = clubes.club(nombre)
+    totales = club['totales']
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Equipos", totales['equipos'], f"{totales['categorias']} categorías", delta_color="off")
+    with col2:
+        st.metric("Récord", f"{totales['partidos_ganados']}-{totales['partidos_perdidos']}",
+                  f"{totales['partidos_jugados']} partidos", delta_color="off")
+    with col3:
+        st.metric("Puntos a favor / en contra", f"{totales['puntos_favor']} / {totales['puntos_contra']}",
+                  f"{totales['diferencia']:+d}")
+    with col4:
+        st.metric("Clasificados a playoffs", f"{totales['clasificados']} de {totales['equipos']}")
+
+    data = [{
+        'Categoría': equipo['categoria'],
+        'Equipo': equipo['equipo'],
+        'Región': equipo['zona'],
+        'Grupo': equipo['grupo'],
+        'Pos': equipo['posicion'],
+        'Récord': equipo['record'],
+        'PF': equipo['puntos_favor'],
+        'PC': equipo['puntos_contra'],
+        'Dif': equipo['puntos_favor'] - equipo['puntos_contra'],
+        'Seed': f"#{equipo['seed']}" if equipo['seed'] else "-",
+    } for equipo in club['equipos']]
+    st.dataframe(data, use_container_width=True, hide_index=True)
+
+    faltantes = [categoria for categoria in clubes.categorias if categoria not in club['por_categoria']]
+    if faltantes:
+        st.caption(f"Sin equipos en: {', '.join(faltantes)}")
+
+    st.markdown("### 📍 Ir al grupo")
+    cols = st.columns(min(len(club['equipos']), 4))
+    for i, equipo in enumerate(club['equipos']):
+        with cols[i % 4]:
+            st.button(
+                f"{equipo['categoria']} · {equipo['grupo']}", key=f"club_{i}",
+                help=equipo['equipo'], use_container_width=True,
+                on_click=ir_a_equipo, args=(equipo,)
+            )
+
+@traza
+def show_cambios_page(almacen):
+    """Qué cambió desde la actualización anterior: resultados, posiciones, siembra y cruces"""
+    with get_metricas().medir_vista('cambios', 'TODAS'):
+        show_cambios_content(almacen)
+
+def show_cambios_content(almacen):
+    st.markdown("## 🆕 Qué cambió desde la última actualización")
+
+    feed = feed_cambios(almacen)
+    if feed is None:
+        st.info("Todavía no hay una versión anterior para comparar: los cambios aparecen después de la próxima actualización de los datos.")
+        return
+    st.caption(f"{feed.fecha_anterior} → {feed.fecha} · {len(feed.zonas)} zonas con datos nuevos")
+    if not len(feed):
+        st.success("Sin cambios en las clasificaciones")
+        return
+
+    conteo = feed.conteo()
+    cols = st.columns(len(conteo))
+    for col, (tipo, cantidad) in zip(cols, conteo.items()):
+        with col:
+            st.metric(TIPOS_CAMBIO[tipo], cantidad)
+
+    categorias = ["Todas"] + list(dict.fromkeys(evento['categoria'] for evento in feed))
+    if st.session_state.get("cambios_categoria") not in categorias:
+        st.session_state.pop("cambios_categoria", None)
+    if not set(st.session_state.get("cambios_tipos", ())) <= set(conteo):
+        st.session_state.pop("cambios_tipos", None)
+
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        filtro = st.selectbox("Categoría:", categorias, key="cambios_categoria")
+    with col2:
+        tipos = st.multiselect("Tipos:", list(conteo), default=list(conteo),
+                               format_func=TIPOS_CAMBIO.get, key="cambios_tipos")
+
+    eventos = [evento for evento in feed
+               if (filtro == "Todas" or evento['categoria'] == filtro) and evento['tipo'] in tipos]
+    data = [{
+        'Tipo': TIPOS_CAMBIO[evento['tipo']],
+        'Categoría': evento['categoria'],
+        'Región': evento['zona'],
+        'Grupo': evento['grupo'] or "-",
+        'Equipo': evento['equipo'] or "-",
+        'Detalle': evento['detalle'],
+    } for evento in eventos]
+    st.dataframe(data, use_container_width=True, hide_index=True)
+
+    # Solo las zonas que siguen existiendo en la versión actual
+    zonas = [(categoria, zona) for categoria, zona in dict.fromkeys((e['categoria'], e['zona']) for e in eventos)
+             if categoria in almacen.categorias and zona in almacen.categoria(categoria).zonas]
+    if zonas:
+        st.markdown("### 📍 Ir a la zona")
+        cols = st.columns(min(len(zonas), 4))
+        for i, (categoria, zona) in enumerate(zonas):
+            with cols[i % 4]:
+                st.button(f"{categoria} · {zona}", key=f"cambios_{i}", use_container_width=True,
+                          on_click=ir_a_zona, args=(categoria, zona))
+
+def show_debug_panel(resumen):
+    """Panel opcional en la barra lateral con las trazas del último rerun"""
+    st.sidebar.markdown("---")
+    st.sidebar.checkbox(
+        "🔍 Trazas de depuración", key="debug_trazas",
+        help=f"Tiempo y llamadas de cada función por rerun (se agregan a {ARCHIVO_TRAZAS}); "
+             "con COPA_TRAZAS_MEMORIA=1, también la memoria asignada por todo el proceso"
+    )
+    if resumen is None:
+        return
+
+    with st.sidebar.expander(f"⏱️ Rerun: {resumen['total_ms']:.1f} ms", expanded=True):
+        spans = sorted(resumen['spans'].items(), key=lambda x: -x[1]['ms'])
+        data = [{
+            'Función': nombre,
+            'Llamadas': span['llamadas'],
+            'ms': round(span['ms'], 2),
+            **({'KB (proceso)': round(span['bytes_proceso'] / 1024, 1)} if 'bytes_proceso' in span else {}),
+        } for nombre, span in spans]
+        st.dataframe(data, use_container_width=True, hide_index=True)
 
 if __name__ == "__main__":
-    main()
+    # Trazas opt-in: el checkbox del panel se lee antes de ejecutar la página
+    if st.session_state.get("debug_trazas", False):
+        iniciar_rerun()
+    metricas = get_metricas()
+    metricas.sesion_activa(st.session_state.setdefault("metricas_sesion", uuid.uuid4().hex))
+    inicio = time.perf_counter()
+    try:
+        main()
+    finally:
+        metricas.observar_rerun(time.perf_counter() - inicio)
+        resumen = terminar_rerun()
+    show_debug_panel(resumen)
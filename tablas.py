@@ -0,0 +1,72 @@
+"""Renderizado de las tablas de equipos a fragmentos HTML.
+
+Reemplaza al ``Styler`` de pandas: en lugar de armar un DataFrame y aplicar
+estilos celda por celda, cada fila se arma con una plantilla ya compilada y el
+color sale de la clase CSS de la fila (``clasificado-directo``,
+``playoff-tercero`` o ``eliminado``, definidas en ``estilos.CSS``).
+"""
+from html import escape
+
+from estilos import format_racha
+
+COLUMNAS = ('Pos', 'Equipo', 'Zona', 'J', 'G', 'P', 'PF', 'PC', 'Diff', 'Pts', 'Racha', 'Estado')
+
+_FILA = (
+    '<tr class="{}"><td>{}</td><td>{}</td><td>{}</td><td>{}</td><td>{}</td><td>{}</td>'
+    '<td>{}</td><td>{}</td><td>{:+d}</td><td>{}</td><td>{}</td><td>{}</td>{}</tr>'
+)
+
+
+def _encabezado(con_situacion):
+    columnas = COLUMNAS + ('Situación',) if con_situacion else COLUMNAS
+    return '<thead><tr>' + ''.join(f'<th>{columna}</th>' for columna in columnas) + '</tr></thead>'
+
+
+_ENCABEZADOS = {con_situacion: _encabezado(con_situacion) for con_situacion in (False, True)}
+
+
+def clase_fila(indice, cupos=None):
+    """Clase CSS de la fila: los 2 primeros y los que entran por cupo clasifican"""
+    if not cupos or indice < 2:
+        return "clasificado-directo"
+    if indice < cupos:
+        return "playoff-tercero"
+    return "eliminado"
+
+
+def tabla_equipos(equipos, cupos=None, situacion=None):
+    """Tabla HTML de equipos con las columnas de la app.
+
+    ``cupos`` es la cantidad de equipos de la lista que clasifican (agrega la
+    columna Estado y los colores de eliminado); ``situacion`` es el resultado
+    de ``situacion_zona`` y agrega la columna Situación.
+    """
+    filas = []
+    for i, equipo in enumerate(equipos):
+        estado = ("✅ CLASIFICA" if i < cupos else "❌ ELIMINADO") if cupos else ""
+        invicto = "🏆 " if equipo['partidos_perdidos'] == 0 and equipo['partidos_jugados'] > 0 else " "
+        zona = equipo.get('zona', '')
+        celda_situacion = ''
+        if situacion is not None:
+            celda_situacion = f"<td>{situacion.get((zona, equipo['equipo']), '')}</td>"
+        filas.append(_FILA.format(
+            clase_fila(i, cupos),
+            i + 1,
+            invicto + escape(equipo['equipo']),
+            escape(zona),
+            equipo['partidos_jugados'],
+            equipo['partidos_ganados'],
+            equipo['partidos_perdidos'],
+            equipo['puntos_favor'],
+            equipo['puntos_contra'],
+            equipo['puntos_favor'] - equipo['puntos_contra'],
+            equipo['puntos_totales'],
+            format_racha(equipo['racha']),
+            estado,
+            celda_situacion,
+        ))
+
+    return (
+        '<table class="tabla-equipos">' + _ENCABEZADOS[situacion is not None]
+        + '<tbody>' + ''.join(filas) + '</tbody></table>'
+    )
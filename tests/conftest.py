@@ -0,0 +1,8 @@
+import os
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Los módulos de la app están en la raíz; los datos sintéticos, en benchmarks/
+sys.path.insert(0, os.path.join(RAIZ, 'benchmarks'))
+sys.path.insert(0, RAIZ)
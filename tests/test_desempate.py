@@ -0,0 +1,144 @@
+"""Desempate olímpico dentro del grupo con grupos armados a mano."""
+from clasificacion import AlmacenClasificacion
+from datos_sinteticos import generar_datos
+from desempate import PUNTOS_DERROTA, PUNTOS_VICTORIA
+
+
+def partido(local, visitante, puntos_local, puntos_visitante):
+    return {'local': local, 'visitante': visitante,
+            'puntos_local': puntos_local, 'puntos_visitante': puntos_visitante}
+
+
+def grupo(publicado, partidos):
+    """Almacén con un grupo cuya tabla (en el orden publicado) sale de sus partidos"""
+    tabla = {nombre: dict.fromkeys(('ganados', 'perdidos', 'favor', 'contra'), 0) for nombre in publicado}
+    for p in partidos:
+        gana_local = p['puntos_local'] > p['puntos_visitante']
+        for nombre, propios, ajenos, gana in ((p['local'], p['puntos_local'], p['puntos_visitante'], gana_local),
+                                              (p['visitante'], p['puntos_visitante'], p['puntos_local'], not gana_local)):
+            tabla[nombre]['ganados' if gana else 'perdidos'] += 1
+            tabla[nombre]['favor'] += propios
+            tabla[nombre]['contra'] += ajenos
+    clasificacion = [{
+        'posicion': posicion, 'equipo': nombre,
+        'partidos_jugados': t['ganados'] + t['perdidos'], 'partidos_ganados': t['ganados'],
+        'partidos_perdidos': t['perdidos'], 'puntos_favor': t['favor'], 'puntos_contra': t['contra'],
+        'puntos_totales': PUNTOS_VICTORIA * t['ganados'] + PUNTOS_DERROTA * t['perdidos'], 'racha': 0,
+    } for posicion, (nombre, t) in enumerate(tabla.items(), 1)]
+    return AlmacenClasificacion({'metadata': {}, 'datos': [{
+        'categoria': 'U13', 'fase': 'Prueba',
+        'grupos': [{'nombre': 'ZONA PRUEBA', 'partidos': partidos, 'clasificacion': clasificacion}],
+    }]})
+
+
+def orden(almacen):
+    return [almacen.equipos[codigo] for codigo in almacen.equipo_codigo]
+
+
+def test_triple_empate_por_puntos_entre_ellos():
+    # A, B y C terminan con 6 puntos y E con 7. Entre ellos A le ganó a los dos y B a C:
+    # la mini-liga da A 4, B 3, C 2 aunque C tiene la mejor diferencia del grupo
+    almacen = grupo(['C', 'E', 'B', 'A', 'D'], [
+        partido('A', 'B', 61, 60), partido('A', 'C', 61, 60), partido('B', 'C', 61, 60),
+        partido('D', 'A', 70, 50), partido('E', 'A', 70, 50),
+        partido('B', 'D', 70, 50), partido('E', 'B', 70, 50),
+        partido('C', 'D', 90, 50), partido('C', 'E', 90, 50),
+        partido('E', 'D', 70, 60),
+    ])
+    assert orden(almacen) == ['E', 'A', 'B', 'C', 'D']
+    assert almacen.posicion.tolist() == [1, 2, 3, 4, 5]
+
+
+def test_triple_empate_por_diferencia_entre_ellos():
+    # Cada uno le gana a uno y pierde con otro (4 puntos entre ellos); todos le ganan a D.
+    # Diferencia entre los empatados: C +8, B +2, A -10. En todo el grupo A tiene la mejor.
+    almacen = grupo(['A', 'B', 'C', 'D'], [
+        partido('A', 'B', 60, 58), partido('B', 'C', 70, 66), partido('C', 'A', 80, 68),
+        partido('A', 'D', 90, 40), partido('B', 'D', 55, 50), partido('C', 'D', 52, 50),
+    ])
+    assert orden(almacen) == ['C', 'B', 'A', 'D']
+    # C (fila 0) le ganó 80-68 a A (fila 2)
+    assert almacen.resultados.enfrentamiento(0, 2) == (PUNTOS_VICTORIA, 80, 68)
+
+
+def test_empate_que_pasa_a_la_diferencia_general():
+    # A y B se ganaron uno cada uno por el mismo tanteo: la mini-liga no los separa
+    # y decide la diferencia en todo el grupo, donde B es mejor
+    almacen = grupo(['A', 'B', 'C'], [
+        partido('A', 'B', 70, 60), partido('B', 'A', 70, 60),
+        partido('A', 'C', 65, 60), partido('B', 'C', 90, 60),
+    ])
+    assert orden(almacen) == ['B', 'A', 'C']
+
+
+def test_empate_sin_nada_que_lo_separe_mantiene_el_orden_publicado():
+    almacen = grupo(['B', 'A', 'C'], [
+        partido('A', 'B', 70, 60), partido('B', 'A', 70, 60),
+        partido('A', 'C', 70, 60), partido('B', 'C', 70, 60),
+    ])
+    assert orden(almacen) == ['B', 'A', 'C']
+
+
+def orden_referencia(clasificacion, partidos):
+    """Orden olímpico de un grupo recorriendo los partidos por nombre de equipo"""
+    tabla = {e['equipo']: e for e in clasificacion}
+
+    def liga(equipos):
+        if len(equipos) < 2:
+            return equipos
+        entre = set(equipos)
+        puntos, favor, contra = dict.fromkeys(equipos, 0), dict.fromkeys(equipos, 0), dict.fromkeys(equipos, 0)
+        for p in partidos:
+            if p['local'] in entre and p['visitante'] in entre:
+                gana_local = p['puntos_local'] > p['puntos_visitante']
+                puntos[p['local']] += PUNTOS_VICTORIA if gana_local else PUNTOS_DERROTA
+                puntos[p['visitante']] += PUNTOS_DERROTA if gana_local else PUNTOS_VICTORIA
+                favor[p['local']] += p['puntos_local']
+                contra[p['local']] += p['puntos_visitante']
+                favor[p['visitante']] += p['puntos_visitante']
+                contra[p['visitante']] += p['puntos_local']
+        criterios = (
+            puntos,
+            {e: favor[e] - contra[e] for e in equipos},
+            favor,
+            {e: tabla[e]['puntos_favor'] - tabla[e]['puntos_contra'] for e in equipos},
+            {e: tabla[e]['puntos_favor'] for e in equipos},
+        )
+        for criterio in criterios:
+            if len(set(criterio[e] for e in equipos)) > 1:
+                return por_valor(equipos, criterio, liga)
+        return equipos
+
+    nombres = [e['equipo'] for e in clasificacion]
+    return por_valor(nombres, {e: tabla[e]['puntos_totales'] for e in nombres}, liga)
+
+
+def por_valor(equipos, valor, desempatar):
+    """Agrupa por valor de mayor a menor y desempata cada bloque igualado"""
+    resultado = []
+    for v in sorted(set(valor[e] for e in equipos), reverse=True):
+        resultado += desempatar([e for e in equipos if valor[e] == v])
+    return resultado
+
+
+def test_coincide_con_la_referencia_en_datos_sinteticos():
+    data = generar_datos(1, partidos=True)
+    almacen = AlmacenClasificacion(data)
+
+    grupos = [g for bloque in data['datos'] for g in bloque['grupos']]
+    for g, datos_grupo in enumerate(grupos):
+        a, b = int(almacen.grupo_inicio[g]), int(almacen.grupo_fin[g])
+        obtenido = [almacen.equipos[c] for c in almacen.equipo_codigo[a:b]]
+        assert obtenido == orden_referencia(datos_grupo['clasificacion'], datos_grupo['partidos']), datos_grupo['nombre']
+        assert almacen.posicion[a:b].tolist() == list(range(1, b - a + 1))
+
+    # Cada partido sigue apuntando a sus dos equipos después de reordenar las filas
+    esperado = [(p['local'], p['visitante'], p['puntos_local'], p['puntos_visitante'])
+                for datos_grupo in grupos for p in datos_grupo['partidos']]
+    obtenido = list(zip(
+        (almacen.equipos[c] for c in almacen.equipo_codigo[almacen.partido_local]),
+        (almacen.equipos[c] for c in almacen.equipo_codigo[almacen.partido_visitante]),
+        almacen.partido_puntos_local.tolist(),
+        almacen.partido_puntos_visitante.tolist(),
+    ))
+    assert obtenido == esperado
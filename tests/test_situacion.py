@@ -0,0 +1,136 @@
+"""Situación matemática (clasificado asegurado / eliminado / en juego) con zonas armadas a mano.
+
+Las zonas son de tres grupos de SUR, donde clasifican los dos primeros de cada
+grupo y los 2 mejores terceros. Cada equipo juega 6 partidos (ida y vuelta).
+"""
+import json
+import os
+
+import numpy as np
+import pytest
+
+import situacion as modulo_situacion
+from clasificacion import AlmacenClasificacion
+from desempate import PUNTOS_DERROTA, PUNTOS_VICTORIA
+from situacion import CLASIFICADO, ELIMINADO, EN_JUEGO, situacion_completa, situacion_zona
+
+RUTA_DATOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'basketball_complete_data.json')
+
+TERMINADO = 6
+
+
+def equipo(nombre, jugados, ganados, diferencia=0):
+    perdidos = jugados - ganados
+    return {
+        'equipo': nombre, 'partidos_jugados': jugados, 'partidos_ganados': ganados,
+        'partidos_perdidos': perdidos, 'puntos_favor': 60 * jugados + diferencia, 'puntos_contra': 60 * jugados,
+        'puntos_totales': PUNTOS_VICTORIA * ganados + PUNTOS_DERROTA * perdidos, 'racha': 0,
+    }
+
+
+def zona(*grupos):
+    """Situación de la zona SUR con un grupo por lista de equipos (en el orden de la tabla)"""
+    almacen = AlmacenClasificacion({'metadata': {}, 'datos': [{
+        'categoria': 'U17', 'fase': 'Prueba',
+        'grupos': [{
+            'nombre': f"SUR {numero}",
+            'clasificacion': [dict(fila, posicion=posicion) for posicion, fila in enumerate(equipos, 1)],
+        } for numero, equipos in enumerate(grupos, 1)],
+    }]})
+    return {equipo: estado for (_, equipo), estado in situacion_zona(almacen.categoria('U17'), 'SUR').items()}
+
+
+def grupo_terminado(prefijo, ganados_tercero):
+    return [
+        equipo(f"{prefijo}1", TERMINADO, 6), equipo(f"{prefijo}2", TERMINADO, 4),
+        equipo(f"{prefijo}3", TERMINADO, ganados_tercero), equipo(f"{prefijo}4", TERMINADO, 0),
+    ]
+
+
+def test_empate_abierto_en_el_grupo_queda_en_juego():
+    # Y (8 puntos) y X (7) juegan entre ellos el partido que les falta: si gana X
+    # terminan igualados en 9 y el desempate todavía puede ir para cualquier lado,
+    # así que ninguno tiene asegurado el tercer puesto (ni está eliminado)
+    situacion = zona(
+        [equipo('L1', TERMINADO, 6), equipo('L2', TERMINADO, 5), equipo('Y', 5, 3), equipo('X', 5, 2)],
+        grupo_terminado('B', 2),
+        grupo_terminado('C', 2),
+    )
+    assert situacion['Y'] == EN_JUEGO
+    assert situacion['X'] == EN_JUEGO
+    assert situacion['L1'] == situacion['L2'] == CLASIFICADO
+
+
+def test_empate_ya_resuelto_en_el_grupo_define():
+    # Terminaron igualados en 9 y la tabla ya refleja el desempate: Y es tercero
+    situacion = zona(
+        [equipo('L1', TERMINADO, 6), equipo('L2', TERMINADO, 5), equipo('Y', TERMINADO, 3, 5), equipo('X', TERMINADO, 3)],
+        grupo_terminado('B', 2),
+        grupo_terminado('C', 2),
+    )
+    assert situacion['Y'] == CLASIFICADO
+    assert situacion['X'] == ELIMINADO
+
+
+@pytest.mark.parametrize('ganados_c3, esperado_b3, esperado_c3', [
+    # C3 llega como mucho a 7 puntos: B3 (8) asegura el segundo cupo de terceros y C3 queda afuera
+    (0, CLASIFICADO, ELIMINADO),
+    # C3 puede llegar a 8, igualado con B3 y con el desempate abierto: los dos siguen en juego
+    (1, EN_JUEGO, EN_JUEGO),
+])
+def test_corte_de_los_mejores_terceros(ganados_c3, esperado_b3, esperado_c3):
+    # A3 termina con 9 y ocupa el primer cupo; el segundo se lo disputan B3 (8, terminado) y C3,
+    # que le queda un partido contra C4
+    situacion = zona(
+        grupo_terminado('A', 3),
+        grupo_terminado('B', 2),
+        [equipo('C1', TERMINADO, 6), equipo('C2', TERMINADO, 4), equipo('C3', 5, ganados_c3), equipo('C4', 5, 0)],
+    )
+    assert situacion['A3'] == CLASIFICADO
+    assert situacion['B3'] == esperado_b3
+    assert situacion['C3'] == esperado_c3
+    assert situacion['A4'] == situacion['B4'] == ELIMINADO
+
+
+@pytest.fixture(scope='module')
+def almacen_real():
+    with open(RUTA_DATOS, encoding='utf-8') as f:
+        return AlmacenClasificacion(json.load(f))
+
+
+def test_empate_abierto_del_dataset_real(almacen_real):
+    # RIVER PLATE puede terminar igualado en puntos con PLATENSE A con el desempate abierto
+    norte = situacion_zona(almacen_real.categoria('U17 MASCULINO'), 'NORTE')
+    assert norte[('NORTE 3', 'RIVER PLATE')] == EN_JUEGO
+    assert norte[('NORTE 3', 'PLATENSE A')] == EN_JUEGO
+    assert norte[('NORTE 6', 'PLATENSE B')] == CLASIFICADO
+
+
+def situacion_con_empates_resueltos(almacen, invertir, monkeypatch):
+    """Situación resolviendo cada empate abierto por el orden de la tabla (o al revés), como si ya estuviera definido"""
+    def empates_resueltos(grupo):
+        indices = np.arange(len(grupo.filas))
+        delante = indices[None, :] < indices[:, None]
+        fijos = grupo.fijo[:, None] & grupo.fijo[None, :]
+        return np.where(fijos | (not invertir), delante, delante.T)
+
+    with monkeypatch.context() as parche:
+        parche.setattr(modulo_situacion._Grupo, '_empates_definidos', empates_resueltos)
+        return situacion_completa(almacen)
+
+
+def test_lo_definido_no_depende_de_los_empates_abiertos(almacen_real, monkeypatch):
+    # Cada clasificado asegurado y cada eliminado lo sigue siendo se resuelvan los
+    # empates abiertos para un lado o para el otro; si el estado depende de eso, está en juego
+    situacion = situacion_completa(almacen_real)
+    por_orden = situacion_con_empates_resueltos(almacen_real, False, monkeypatch)
+    al_reves = situacion_con_empates_resueltos(almacen_real, True, monkeypatch)
+    dependen = 0
+    for clave, equipos in situacion.items():
+        for nombre, estado in equipos.items():
+            if por_orden[clave][nombre] != al_reves[clave][nombre]:
+                dependen += 1
+                assert estado == EN_JUEGO, (clave, nombre)
+            if estado != EN_JUEGO:
+                assert por_orden[clave][nombre] == al_reves[clave][nombre] == estado, (clave, nombre)
+    assert dependen > 0
@@ -0,0 +1,109 @@
+"""Trazas por rerun: tiempo, llamadas y memoria de las funciones instrumentadas.
+
+Las funciones se marcan con ``@traza``. Mientras no haya un rerun trazándose
+en el hilo actual, el decorador solo agrega una consulta a un atributo
+thread-local antes de llamar a la función. Cada sesión de Streamlit ejecuta
+su script en su propio hilo, así que una sesión puede trazar sus reruns sin
+afectar a las demás.
+
+Con la traza activa, cada span acumula llamadas y tiempo de pared. La memoria
+es opcional (``COPA_TRAZAS_MEMORIA=1``): ``tracemalloc`` es global al proceso,
+así que mientras haya un rerun trazándose frena a todas las sesiones y los
+bytes de cada span incluyen lo que asignaron los otros hilos en ese lapso
+(``bytes_proceso``). Se enciende con el primer rerun trazado y se apaga con
+el último. Al terminar el rerun el resumen se agrega como una línea al
+archivo JSONL de trazas.
+"""
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+ARCHIVO_TRAZAS = 'trazas.jsonl'
+
+# Memoria por span con tracemalloc (afecta a todo el proceso): solo si se pide explícitamente
+TRAZAR_MEMORIA = os.environ.get('COPA_TRAZAS_MEMORIA') == '1'
+
+
+class _Local(threading.local):
+    # Valor por defecto a nivel de clase: leerlo no levanta AttributeError en cada llamada
+    rerun = None
+
+
+_local = _Local()
+_lock = threading.Lock()
+_reruns_activos = 0
+
+
+class _Rerun:
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.memoria = TRAZAR_MEMORIA
+        self.spans = {}  # nombre -> [llamadas, segundos, bytes del proceso]
+
+
+def traza(funcion):
+    """Decorador: registra la función como span del rerun en curso, si lo hay"""
+    nombre = funcion.__qualname__
+
+    @functools.wraps(funcion)
+    def envoltura(*args, **kwargs):
+        rerun = _local.rerun
+        if rerun is None:
+            return funcion(*args, **kwargs)
+
+        memoria = tracemalloc.get_traced_memory()[0] if rerun.memoria else 0
+        inicio = time.perf_counter()
+        try:
+            return funcion(*args, **kwargs)
+        finally:
+            span = rerun.spans.setdefault(nombre, [0, 0.0, 0])
+            span[0] += 1
+            span[1] += time.perf_counter() - inicio
+            if rerun.memoria:
+                span[2] += tracemalloc.get_traced_memory()[0] - memoria
+
+    return envoltura
+
+
+def iniciar_rerun():
+    """Empieza a trazar el rerun del hilo actual"""
+    global _reruns_activos
+    rerun = _Rerun()
+    if rerun.memoria:
+        with _lock:
+            _reruns_activos += 1
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+    _local.rerun = rerun
+
+
+def terminar_rerun(archivo=ARCHIVO_TRAZAS):
+    """Termina la traza del hilo actual, la agrega al JSONL y devuelve el resumen (o None)"""
+    global _reruns_activos
+    rerun = _local.rerun
+    if rerun is None:
+        return None
+    _local.rerun = None
+
+    resumen = {
+        'ts': time.time(),
+        'total_ms': (time.perf_counter() - rerun.inicio) * 1000,
+        'spans': {
+            nombre: {'llamadas': llamadas, 'ms': segundos * 1000,
+                     **({'bytes_proceso': memoria} if rerun.memoria else {})}
+            for nombre, (llamadas, segundos, memoria) in rerun.spans.items()
+        },
+    }
+
+    with _lock:
+        if rerun.memoria:
+            _reruns_activos -= 1
+            if _reruns_activos == 0 and tracemalloc.is_tracing():
+                tracemalloc.stop()
+        if archivo:
+            with open(archivo, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(resumen, ensure_ascii=False) + '\n')
+    return resumen